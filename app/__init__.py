@@ -2,13 +2,23 @@
 
 # Function that produces our Flask apps and returns Flask apps
 
-from flask import Flask
+from flask import Flask, jsonify
 from .extensions import ma, limiter, cache
 from .models import db
+from .search import search
+from .jobs import job_queue
+from .utils import cache as response_cache
+from .utils.metrics import metrics
+from .utils.slow_queries import slow_queries
+from .utils.passwords import PasswordHasherBusy
+from .utils.fieldsets import InvalidFields
 from .blueprints.customers import customers_bp
 from .blueprints.mechanics import mechanics_bp
 from .blueprints.service_tickets import service_tickets_bp
 from .blueprints.inventory import inventory_bp
+from .blueprints.reports import reports_bp
+from .blueprints.changes import changes_bp
+from .cli import db_cli, reports_cli, jobs_cli, changes_cli
 import config
 from flask_swagger_ui import get_swaggerui_blueprint
 # from .routes.init_db import init_bp
@@ -31,17 +41,25 @@ def create_app(config_name='DevelopmentConfig'):
     # Initialize extensions
     ma.init_app(app)
     db.init_app(app)
+    metrics.init_app(app)   # first, so rate-limited requests are timed too
     limiter.init_app(app)
     cache.init_app(app)
+    search.init_app(app)
+    slow_queries.init_app(app)
+    job_queue.init_app(app)
     
-    # IMPORTANT — prevent ResourceWarning from SQLite
+    # Return the session's connection to the pool after every request. The pool
+    # itself is only thrown away when the config asks for it (SQLite test runs -
+    # prevents ResourceWarning), so Postgres/MySQL connections stay warm.
     @app.teardown_appcontext
     def shutdown_session(exception=None):
+        response_cache.bump_pending()
         db.session.remove()
-        try:
-            db.engine.dispose()
-        except:
-            pass
+        if app.config.get('SQLALCHEMY_DISPOSE_ON_TEARDOWN'):
+            try:
+                db.engine.dispose()
+            except:
+                pass
     
     
     # Register blueprints 
@@ -49,7 +67,31 @@ def create_app(config_name='DevelopmentConfig'):
     app.register_blueprint(mechanics_bp, url_prefix='/mechanics')
     app.register_blueprint(service_tickets_bp, url_prefix='/service_tickets')
     app.register_blueprint(inventory_bp, url_prefix='/inventory')
+    app.register_blueprint(reports_bp, url_prefix='/reports')
+    app.register_blueprint(changes_bp, url_prefix='/changes')
     app.register_blueprint(swaggerui_blueprint, url_prefix=SWAGGER_URL)
     # app.register_blueprint(init_bp)
     
+    # Every password hashing slot stayed busy - tell the client to retry
+    @app.errorhandler(PasswordHasherBusy)
+    def password_hasher_busy(e):
+        return jsonify({"error": "Server busy, try again shortly."}), 503
+    
+    # ?fields= named a field the endpoint doesn't have
+    @app.errorhandler(InvalidFields)
+    def invalid_fields(e):
+        return jsonify({"error": "Unknown fields.", "invalid_fields": e.names}), 400
+    
+    # Response cache hit/miss counters for monitoring
+    @app.route('/cache/stats', methods=['GET'])
+    def cache_stats():
+        return jsonify(response_cache.stats.as_dict()), 200
+    
+    # CLI commands (flask db upgrade, flask reports rebuild, flask jobs worker,
+    # flask changes prune)
+    app.cli.add_command(db_cli)
+    app.cli.add_command(reports_cli)
+    app.cli.add_command(jobs_cli)
+    app.cli.add_command(changes_cli)
+    
     return app
\ No newline at end of file
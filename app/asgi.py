@@ -0,0 +1,237 @@
+# /app/asgi.py
+
+# ASGI deployment mode (see /asgi.py). With WSGI every in-flight request,
+# including the time spent waiting on the database, holds a worker thread.
+# Here the read-only endpoints below run as coroutines on SQLAlchemy's async
+# engine (aiosqlite for SQLite, asyncpg for Postgres), so one process can keep
+# many slow queries in flight. Everything else - writes, the cursor/stream
+# list modes, the Swagger UI - is handed to the regular Flask app.
+#
+# The async views reuse the Flask side: they run inside a Flask request
+# context, after the app's before_request hooks (rate limits) and through its
+# error handlers and after_request hooks, with the same models, schemas and
+# helpers (fieldsets, page_params, token_required, search backends).
+#
+# ASYNC_DATABASE_URI overrides the async URL; by default it is the app's
+# database URL with the async driver swapped in. The pool settings come from
+# ASYNC_ENGINE_OPTIONS, else SQLALCHEMY_ENGINE_OPTIONS. When no async driver is
+# available every request goes to Flask.
+
+import logging
+from asgiref.wsgi import WsgiToAsgi
+from flask import request, jsonify
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from werkzeug.exceptions import HTTPException
+from app.models import db, Customer, Service_Ticket, Inventory
+from app.search import search
+from app.utils.fieldsets import fieldset
+from app.utils.pagination import page_params, is_streaming
+from app.utils.util import token_required
+from app.blueprints.customers.schemas import customer_schema, customers_schema
+from app.blueprints.service_tickets.schemas import service_tickets_schema
+from app.blueprints.inventory.schemas import inventory_schema
+
+logger = logging.getLogger(__name__)
+
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+}
+
+# Flask endpoint -> (async view, predicate deciding whether the async view
+# handles this particular request)
+ASYNC_VIEWS = {}
+
+
+def async_view(endpoint, when=None):
+    def decorator(f):
+        ASYNC_VIEWS[endpoint] = (f, when)
+        return f
+    return decorator
+
+
+def async_database_uri(app):
+    if app.config.get('ASYNC_DATABASE_URI'):
+        return app.config['ASYNC_DATABASE_URI']
+    with app.app_context():
+        url = db.engine.url
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    return url.set(drivername=driver) if driver else None
+
+
+# ----- Async views -----
+
+# Get all service tickets - page mode (cursor, stream and include=totals go to Flask)
+@async_view(
+    'service_tickets_bp.get_service_tickets',
+    when=lambda: not ('cursor' in request.args or is_streaming() or request.args.get('include'))
+)
+async def get_service_tickets(session):
+    schema, options = fieldset(service_tickets_schema, Service_Ticket)
+    page, per_page = page_params()
+    query = select(Service_Ticket).options(*options).limit(per_page).offset((page - 1) * per_page)
+    service_tickets = (await session.scalars(query)).all()
+    return schema.jsonify(service_tickets), 200
+
+
+# Get all service tickets for a specific customer
+@async_view('service_tickets_bp.get_my_tickets')
+@token_required(required_type='customer')
+async def get_my_tickets(user_id, user_type, session):
+    schema, options = fieldset(service_tickets_schema, Service_Ticket)
+    query = select(Service_Ticket).options(*options).where(Service_Ticket.customer_id == user_id)
+    service_tickets = (await session.scalars(query)).all()
+    return schema.jsonify(service_tickets), 200
+
+
+# Get a specific customer
+@async_view('customers_bp.get_customer')
+async def get_customer(session, customer_id):
+    schema, options = fieldset(customer_schema, Customer)
+    customer = await session.get(Customer, customer_id, options=options)
+    if customer:
+        return schema.jsonify(customer), 200
+    return jsonify({"error": "Customer not found."}), 404
+
+
+# The search backends are plain SQLAlchemy code - run_sync runs them on the
+# async connection without blocking the event loop
+@async_view('customers_bp.search_by_email')
+async def search_by_email(session):
+    email = request.args.get("email", "").strip()
+    if not email:
+        return jsonify([]), 200
+    schema, options = fieldset(customers_schema, Customer)
+    page, per_page = page_params()
+    customers = await session.run_sync(
+        lambda sync_session: search.query(Customer, email, page, per_page, options=options, session=sync_session)
+    )
+    return schema.jsonify(customers), 200
+
+
+@async_view('inventory_bp.search_by_part_name')
+async def search_by_part_name(session):
+    part_name = request.args.get("part_name", "").strip()
+    if not part_name:
+        return jsonify([]), 200
+    schema, options = fieldset(inventory_schema, Inventory, default=inventory_schema.load_options)
+    page, per_page = page_params()
+    inventory = await session.run_sync(
+        lambda sync_session: search.query(Inventory, part_name, page, per_page, options=options, session=sync_session)
+    )
+    return jsonify(schema.dump(inventory, many=True)), 200
+
+
+# ----- ASGI application -----
+
+def _environ(scope):
+    server = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', ''),
+        'PATH_INFO': scope['path'],
+        'QUERY_STRING': scope['query_string'].decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': (scope.get('client') or ('', 0))[0],
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': None,
+        'wsgi.errors': None,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope['headers']:
+        key = name.decode('latin-1').upper().replace('-', '_')
+        if key not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            key = 'HTTP_' + key
+        value = value.decode('latin-1')
+        environ[key] = f'{environ[key]},{value}' if key in environ else value
+    return environ
+
+
+class AsyncApp:
+    def __init__(self, flask_app, engine_options=None):
+        self.flask_app = flask_app
+        self.wsgi = WsgiToAsgi(flask_app)
+        unknown = set(ASYNC_VIEWS) - set(flask_app.view_functions)
+        if unknown:
+            raise ValueError(f'Async views for unknown endpoints: {sorted(unknown)}')
+        self.engine = None
+        url = async_database_uri(flask_app)
+        if url is not None:
+            try:
+                if engine_options is None:
+                    engine_options = flask_app.config.get('ASYNC_ENGINE_OPTIONS', flask_app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+                self.engine = create_async_engine(url, **engine_options)
+            except ImportError as e:
+                logger.warning('No async driver for %s (%s), serving every request through WSGI', url, e)
+        self.sessionmaker = async_sessionmaker(self.engine, expire_on_commit=False) if self.engine else None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self._lifespan(receive, send)
+
+        if scope['type'] == 'http' and scope['method'] == 'GET' and self.engine is not None:
+            environ = _environ(scope)
+            try:
+                endpoint, view_args = self.flask_app.url_map.bind_to_environ(environ).match()
+            except HTTPException:
+                endpoint = None
+            if endpoint in ASYNC_VIEWS:
+                response = await self._dispatch(environ, endpoint, view_args)
+                if response is not None:
+                    return await self._send(response, send)
+
+        await self.wsgi(scope, receive, send)
+
+    # Flask's full_dispatch_request, with the view awaited. None when the
+    # view's predicate passes the request on to Flask.
+    async def _dispatch(self, environ, endpoint, view_args):
+        app = self.flask_app
+        view, when = ASYNC_VIEWS[endpoint]
+        ctx = app.request_context(environ)
+        error = None
+        ctx.push()
+        try:
+            if when is not None and not when():
+                return None
+            try:
+                try:
+                    rv = app.preprocess_request()
+                    if rv is None:
+                        async with self.sessionmaker() as session:
+                            rv = await view(session, **view_args)
+                except Exception as e:
+                    rv = app.handle_user_exception(e)
+                return app.finalize_request(rv)
+            except Exception as e:
+                error = e
+                return app.handle_exception(e)
+        finally:
+            ctx.pop(error)
+
+    async def _send(self, response, send):
+        headers = [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in response.headers.to_wsgi_list()]
+        await send({'type': 'http.response.start', 'status': response.status_code, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': response.get_data()})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def dispose(self):
+        if self.engine is not None:
+            await self.engine.dispose()
+
+
+def create_asgi_app(flask_app, engine_options=None):
+    return AsyncApp(flask_app, engine_options)
@@ -0,0 +1,7 @@
+# /app/blueprints/changes/__init__.py
+
+from flask import Blueprint
+
+changes_bp = Blueprint("changes_bp", __name__)
+
+from . import routes
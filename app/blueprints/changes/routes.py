@@ -0,0 +1,173 @@
+# /app/blueprints/changes/routes.py
+
+# The change feed (app/utils/changes.py), so clients can sync incrementally
+# instead of re-reading GET /service_tickets/ or /inventory/. A client notes
+# last_seq (every answer has it), reads the tables once, then keeps asking
+# for what changed since the last seq it saw:
+#
+#   GET /changes?since=1200&entity=service_tickets,inventory
+#   {"changes": [{"seq": 1201, "entity": "inventory", "id": 7, "op": "update",
+#                 "changed_at": "...", "data": {...}}, ...],
+#    "next": 1250, "last_seq": 1310, "more": true}
+#
+# passing next as since on the following call. data is the row as its GET
+# endpoint returns it now - null once it is deleted, left out with
+# ?data=false. ?wait=25 long-polls: an empty answer is held until a change
+# commits or the wait runs out. GET /changes/stream sends the same entries as
+# server-sent events and resumes from Last-Event-ID.
+
+import time
+from collections import defaultdict
+from .schemas import changes_query_schema, change_schema
+from flask import request, jsonify, current_app, Response, stream_with_context
+from marshmallow import ValidationError
+from sqlalchemy import select
+from app.models import db, Change, Customer, Mechanic, Service_Ticket, Inventory
+from . import changes_bp
+from app.extensions import limiter
+from app.utils.changes import signal, latest_seq, oldest_seq, DELETE
+from app.blueprints.customers.schemas import customer_schema
+from app.blueprints.mechanics.schemas import mechanic_schema
+from app.blueprints.service_tickets.schemas import service_ticket_schema
+from app.blueprints.inventory.schemas import inventory_schema
+
+CHANGES_MAX_WAIT_SECONDS = 30
+CHANGES_POLL_SECONDS = 1.0   # how soon other processes' commits are noticed
+CHANGES_HEARTBEAT_SECONDS = 15
+
+# The schema of each entity's GET endpoint
+ENTITY_SCHEMAS = {
+    'customers': (Customer, customer_schema),
+    'mechanics': (Mechanic, mechanic_schema),
+    'service_tickets': (Service_Ticket, service_ticket_schema),
+    'inventory': (Inventory, inventory_schema),
+}
+
+
+def _setting(name, default):
+    return current_app.config.get(name, default)
+
+
+# ?since= / ?limit= / ?wait= / ?entity= / ?data=, or a 400 response
+def _feed_params():
+    try:
+        return changes_query_schema.load(request.args), None
+    except ValidationError as e:
+        return None, (jsonify(e.messages), 400)
+
+
+def _read(params, since):
+    query = select(Change).where(Change.seq > since).order_by(Change.seq).limit(params['limit'])
+    if 'entity' in params:
+        query = query.where(Change.entity.in_(params['entity']))
+    return db.session.execute(query).scalars().all()
+
+
+# Reads the changes after since, waiting up to wait seconds for the first one
+def _read_or_wait(params, since, wait):
+    deadline = time.monotonic() + wait
+    while True:
+        generation = signal.generation
+        entries = _read(params, since)
+        remaining = deadline - time.monotonic()
+        if entries or remaining <= 0:
+            return entries
+        db.session.commit()   # end the read and free the connection while waiting
+        signal.wait(generation, min(remaining, _setting('CHANGES_POLL_SECONDS', CHANGES_POLL_SECONDS)))
+
+
+# The entries as dicts, with the current rows as data - one query per entity
+def _dump(entries, with_data):
+    items = change_schema.dump(entries, many=True)
+    if not with_data:
+        return items
+
+    ids = defaultdict(set)
+    for entry in entries:
+        if entry.op != DELETE:
+            ids[entry.entity].add(entry.row_id)
+    rows = {}
+    for entity, row_ids in ids.items():
+        model, schema = ENTITY_SCHEMAS[entity]
+        objects = db.session.execute(
+            select(model).where(model.id.in_(row_ids)).options(*getattr(schema, 'load_options', ()))
+        ).scalars().all()
+        for obj, data in zip(objects, schema.dump(objects, many=True)):
+            rows[(entity, obj.id)] = data
+    for entry, item in zip(entries, items):
+        item['data'] = rows.get((entry.entity, entry.row_id))
+    return items
+
+
+# Entries after since were pruned - the client has to read the tables again
+def _pruned(since):
+    oldest = oldest_seq()
+    return oldest is not None and since < oldest - 1
+
+
+def _gone():
+    return jsonify({
+        "error": "Changes after this seq were pruned, read the tables again.",
+        "last_seq": latest_seq()
+    }), 410
+
+
+# Changes after ?since=, oldest first ⚡ Tested!
+@changes_bp.route("/", methods=['GET'], strict_slashes=False)   # /changes and /changes/
+# Rate limit applied
+@limiter.exempt
+def get_changes():
+    params, error = _feed_params()
+    if error:
+        return error
+    since = params['since']
+    if _pruned(since):
+        return _gone()
+
+    wait = min(params['wait'], _setting('CHANGES_MAX_WAIT_SECONDS', CHANGES_MAX_WAIT_SECONDS))
+    entries = _read_or_wait(params, since, wait)
+
+    return jsonify({
+        'changes': _dump(entries, params['data']),
+        'next': entries[-1].seq if entries else since,
+        'last_seq': latest_seq(),
+        'more': len(entries) == params['limit'],
+    }), 200
+
+# The change feed as server-sent events ⚡ Tested!
+@changes_bp.route("/stream", methods=['GET'])
+# Rate limit applied
+@limiter.exempt
+def stream_changes():
+    params, error = _feed_params()
+    if error:
+        return error
+    since = params['since']
+    last_event_id = request.headers.get('Last-Event-ID', '')
+    if last_event_id.isdigit():
+        since = int(last_event_id)
+    if _pruned(since):
+        return _gone()
+    poll = _setting('CHANGES_POLL_SECONDS', CHANGES_POLL_SECONDS)
+    heartbeat = _setting('CHANGES_HEARTBEAT_SECONDS', CHANGES_HEARTBEAT_SECONDS)
+
+    def generate():
+        position = since
+        sent = time.monotonic()
+        while True:
+            generation = signal.generation
+            entries = _read(params, position)
+            if entries:
+                for item in _dump(entries, params['data']):
+                    yield f"id: {item['seq']}\nevent: change\ndata: {current_app.json.dumps(item, separators=(',', ':'))}\n\n"
+                position = entries[-1].seq
+                sent = time.monotonic()
+                continue
+            db.session.commit()   # end the read and free the connection while waiting
+            if time.monotonic() - sent >= heartbeat:
+                yield ': keep-alive\n\n'
+                sent = time.monotonic()
+            signal.wait(generation, min(poll, heartbeat))
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
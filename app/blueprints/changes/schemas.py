@@ -0,0 +1,38 @@
+# /app/blueprints/changes/schemas.py
+
+from app.extensions import ma
+from app.models import Change
+from app.utils.changes import ENTITIES
+from marshmallow import fields, validate, post_load, ValidationError, EXCLUDE
+
+MAX_CHANGES_LIMIT = 1000
+
+# Schemas
+class ChangesQuerySchema(ma.Schema):
+    since = fields.Int(load_default=0, validate=validate.Range(min=0))   # last seq the client has
+    limit = fields.Int(load_default=100, validate=validate.Range(min=1, max=MAX_CHANGES_LIMIT))
+    wait = fields.Float(load_default=0, validate=validate.Range(min=0))   # seconds to long-poll
+    entity = fields.Str()   # comma separated table names
+    data = fields.Bool(load_default=True)
+    class Meta:
+        unknown = EXCLUDE
+    
+    @post_load
+    def split_entities(self, params, **kwargs):
+        if 'entity' in params:
+            names = [name.strip() for name in params['entity'].split(',') if name.strip()]
+            unknown = sorted(set(names) - set(ENTITIES))
+            if unknown or not names:
+                raise ValidationError(f'Unknown entities {unknown}, choose from {list(ENTITIES)}.', 'entity')
+            params['entity'] = names
+        return params
+        
+class ChangeSchema(ma.SQLAlchemyAutoSchema):
+    id = fields.Int(attribute='row_id')
+    class Meta:
+        model = Change
+        fields = ('seq', 'entity', 'id', 'op', 'changed_at')
+        
+
+changes_query_schema = ChangesQuerySchema()
+change_schema = ChangeSchema()
@@ -6,8 +6,14 @@ from marshmallow import ValidationError
 from sqlalchemy import select
 from app.models import Customer, db
 from . import customers_bp
-from app.extensions import limiter, cache
+from app.extensions import limiter
+from app.utils.cache import cached_view
+from app.utils.fieldsets import fieldset
 from app.utils.util import encode_token, token_required
+from app.utils.pagination import paginate, page_params, keyset_response, is_streaming, stream_response
+from app.search import search
+from app.utils.bulk import BulkBatch, read_rows, rows_error
+from app.utils.passwords import hash_password, hash_passwords, verify_password
 
 # Customer login (with token) ⚡ Tested!
 @customers_bp.route("/login", methods=['POST'])
@@ -22,7 +28,13 @@ def login():
     query = select(Customer).where(Customer.email == email)
     customer = db.session.execute(query).scalars().first()
     
-    if customer and customer.password == password:
+    # Hashing runs in the password pool. Legacy plaintext passwords are
+    # replaced with a hash on their first successful login.
+    matches, needs_rehash = verify_password(customer.password, password) if customer else (False, False)
+    if matches:
+        if needs_rehash:
+            customer.password = hash_password(password)
+            db.session.commit()
         token = encode_token(customer.id, user_type='customer')
         
         response = {
@@ -49,37 +61,56 @@ def create_customer():
     if existing_customer:
         return jsonify({"error": "Email already associated with an account."}), 400
     
+    customer_data['password'] = hash_password(customer_data['password'])
     new_customer = Customer(**customer_data)
     db.session.add(new_customer)
     db.session.commit()
     return customer_schema.jsonify(new_customer), 201
+
+# Create many customers (JSON array or NDJSON) in one transaction ⚡ Tested!
+@customers_bp.route("/bulk", methods=['POST'])
+# Rate limit applied
+@limiter.limit("15 per hour")
+def bulk_create_customers():
+    rows = read_rows()
+    error = rows_error(rows)
+    if error:
+        return error
+    
+    batch = BulkBatch(customers_schema, rows)
+    batch.reject_duplicates(Customer.email, "Email already associated with an account.")
+    batch.map_column('password', hash_passwords)
+    response = batch.save(Customer, Customer.email)
+    search.invalidate(Customer)
+    return response
  
 # Get all customers ⚡ Tested!
 @customers_bp.route("/", methods=['GET'])
 # Rate limit applied
 @limiter.exempt
 # Caching applied
-@cache.cached(timeout=30)
-# Pagination 
+@cached_view(timeout=30, tags=['customers'])
+# Pagination (?cursor= for keyset pagination, ?stream=true for the whole table)
+# ?fields=id,name returns only those fields
 def get_customers():
-    try: 
-        page = int(request.args.get('page', 1))
-        per_page = int(request.args.get('per_page', 10))
-        query = select(Customer)
-        customers = db.paginate(query, page=page, per_page=per_page)
-        return customers_schema.jsonify(customers), 200
-    except:
-        query = select(Customer)
-        customers = db.session.execute(query).scalars().all()
-        return customers_schema.jsonify(customers), 200
+    schema, options = fieldset(customers_schema, Customer)
+    query = select(Customer).options(*options)
+    if 'cursor' in request.args:
+        return keyset_response(query, [Customer.id], schema)
+    if is_streaming():
+        return stream_response(query.order_by(Customer.id), schema)
+    
+    customers = paginate(query)
+    return schema.jsonify(customers), 200
 
 # Get a specific customer ⚡ Tested!
 @customers_bp.route("/<int:customer_id>", methods=['GET'])
 def get_customer(customer_id):
-    customer = db.session.get(Customer, customer_id)
+    schema, options = fieldset(customer_schema, Customer)
+    customer = db.session.get(Customer, customer_id, options=options)
     
     if customer: 
-        return customer_schema.jsonify(customer), 200
+        return schema.jsonify(customer), 200
     return jsonify({"error": "Customer not found."}), 404
 
 
@@ -99,6 +130,7 @@ def update_customer(user_id, user_type):
     except ValidationError as e:
         return jsonify(e.messages), 400
     
+    customer_data['password'] = hash_password(customer_data['password'])
     for key, value in customer_data.items():
         setattr(customer, key, value)
         
@@ -121,12 +153,16 @@ def delete_customer(user_id, user_type):
     return jsonify({"message": f'Customer id: {user_id}, successfully deleted.'}), 200
 
 # Search for a customer based on email ⚡ Tested!
+# Substring match served from the search index, best matches first (paginated)
 @customers_bp.route("/search", methods=['GET'])
 def search_by_email():
-    email = request.args.get("email")
+    email = request.args.get("email", "").strip()
+    if not email:
+        return jsonify([]), 200
     
-    query = select(Customer).where(Customer.email.like(f'%{email}%'))
-    customer = db.session.execute(query).scalars().all()
+    schema, options = fieldset(customers_schema, Customer)
+    page, per_page = page_params()
+    customers = search.query(Customer, email, page, per_page, options=options)
     
-    return customers_schema.jsonify(customer)
+    return schema.jsonify(customers), 200
     
\ No newline at end of file
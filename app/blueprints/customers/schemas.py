@@ -2,11 +2,13 @@
 
 from app.extensions import ma
 from app.models import Customer
+from app.utils.fastdump import FastDumpMixin
 
 # Schemas
-class CustomerSchema(ma.SQLAlchemyAutoSchema):
+class CustomerSchema(FastDumpMixin, ma.SQLAlchemyAutoSchema):
     class Meta:
         model = Customer 
+        load_only = ('password',)   # never sent back in responses
 
 customer_schema = CustomerSchema()
 customers_schema = CustomerSchema(many=True)
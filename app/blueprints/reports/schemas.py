@@ -0,0 +1,37 @@
+# /app/blueprints/reports/schemas.py
+
+from app.extensions import ma
+from app.models import DailyRevenue
+from marshmallow import fields, EXCLUDE
+
+# Schemas
+class ReportQuerySchema(ma.Schema):
+    start = fields.Date()   # inclusive, YYYY-MM-DD
+    end = fields.Date()
+    mechanic_id = fields.Int()
+    class Meta:
+        unknown = EXCLUDE   # page / per_page are read separately
+        
+class DailyRevenueSchema(ma.SQLAlchemyAutoSchema):
+    class Meta:
+        model = DailyRevenue
+        
+class PartUsageReportSchema(ma.Schema):
+    inventory_id = fields.Int()
+    part_name = fields.Str()
+    price = fields.Float()
+    quantity = fields.Int()
+    lines = fields.Int()
+    revenue = fields.Float()
+    
+class MechanicWorkloadReportSchema(ma.Schema):
+    mechanic_id = fields.Int()
+    name = fields.Str()
+    week = fields.Date()
+    tickets = fields.Int()
+    
+
+report_query_schema = ReportQuerySchema()
+daily_revenue_schema = DailyRevenueSchema(many=True)
+part_usage_report_schema = PartUsageReportSchema(many=True)
+mechanic_workload_report_schema = MechanicWorkloadReportSchema(many=True)
@@ -1,14 +1,19 @@
 # /app/blueprints/service_tickets/routes.py
 
 from .schemas import service_ticket_schema, service_tickets_schema, edit_service_ticket_schema, return_service_ticket_schema, add_part_schema
-from flask import request, jsonify
+from flask import request, jsonify, current_app
 from marshmallow import ValidationError
-from sqlalchemy import select
-from app.models import Service_Ticket, db, Inventory
+from sqlalchemy import select, insert, update, delete, or_
+from app.models import Service_Ticket, db, Inventory, service_mechanic
 from . import service_tickets_bp
 from app.models import Mechanic, Customer, ServiceTicketInventory
 from app.utils.util import token_required
 from app.extensions import limiter
+from app.utils.pagination import paginate, keyset_response, is_streaming, stream_response
+from app.utils.bulk import BulkBatch, read_rows, rows_error, existing_values
+from app.utils.totals import ticket_totals, invoice_lines, add_to_parts_total
+from app.utils.fieldsets import fieldset
+from app.utils import rollups, changes
 
 # Create a service ticket ⚡ Tested!
 @service_tickets_bp.route("/", methods=['POST'])
@@ -55,36 +60,113 @@ def create_service_ticket():
     db.session.commit()
     
     return service_ticket_schema.jsonify(new_service_ticket), 201
+
+# Create many service tickets (JSON array or NDJSON) in one transaction ⚡ Tested!
+@service_tickets_bp.route("/bulk", methods=['POST'])
+def bulk_create_service_tickets():
+    rows = read_rows()
+    error = rows_error(rows)
+    if error:
+        return error
+    
+    batch = BulkBatch(service_tickets_schema, rows)
+    batch.reject_duplicates(Service_Ticket.VIN, "VIN already associated with a service ticket.")
+    batch.reject_missing('customer_id', Customer.id, "Customer does not exist.")
+    
+    # Validate mechanic IDs for the whole batch with one lookup
+    requested = {id for data in batch.rows.values() for id in data.get('mechanic_ids', [])}
+    found_ids = existing_values(Mechanic.id, requested)
+    for index, data in list(batch.rows.items()):
+        missing_ids = set(data.get('mechanic_ids', [])) - found_ids
+        if missing_ids:
+            batch.reject(index, {'mechanic_ids': [f'Mechanic ids do not exist: {sorted(missing_ids)}']})
+    
+    # Assign the mechanics once the tickets have ids. The Core INSERTs skip
+    # the session, so the report rollups and the change feed are told directly.
+    def assign_mechanics(batch):
+        pairs = [
+            {'ticket_id': batch.ids[index], 'mechanic_id': mechanic_id}
+            for index, data in batch.rows.items()
+            for mechanic_id in set(data.get('mechanic_ids', []))
+        ]
+        if pairs:
+            db.session.execute(insert(service_mechanic), pairs)
+            changes.record(Mechanic, sorted({pair['mechanic_id'] for pair in pairs}))
+        rollups.add_tickets(data['service_date'] for data in batch.rows.values())
+        rollups.add_assignments(
+            (mechanic_id, data['service_date'])
+            for data in batch.rows.values()
+            for mechanic_id in set(data.get('mechanic_ids', []))
+        )
+    
+    return batch.save(Service_Ticket, Service_Ticket.VIN, exclude=('mechanic_ids',), then=assign_mechanics)
         
 
 # Get all service tickets ⚡ Tested!
 @service_tickets_bp.route("/", methods=['GET'])
 # Rate limit applied
 @limiter.exempt
-# Pagination 
+# Pagination (?cursor= for keyset pagination ordered by service date,
+# ?stream=true for the whole table). ?include=totals adds each ticket's
+# parts_total to the page, ?fields=id,VIN returns only those fields.
 def get_service_tickets():
-    try: 
-        page = int(request.args.get('page'))
-        per_page = int(request.args.get('per_page'))
-        query = select(Service_Ticket)
-        service_tickets = db.paginate(query, page=page, per_page=per_page)
-        return service_tickets_schema.jsonify(service_tickets), 200
-    except:
-        query = select(Service_Ticket)
-        service_tickets = db.session.execute(query).scalars().all()
-        return service_tickets_schema.jsonify(service_tickets), 200
+    totals_included = 'totals' in request.args.get('include', '').split(',')
+    materialized = current_app.config.get('MATERIALIZED_TICKET_TOTALS', True)
+    always = [Service_Ticket.service_date]
+    if totals_included and materialized:
+        always.append(Service_Ticket.parts_total)
+    schema, options = fieldset(service_tickets_schema, Service_Ticket, always)
+    
+    query = select(Service_Ticket).options(*options)
+    if 'cursor' in request.args:
+        key_columns = [Service_Ticket.service_date, Service_Ticket.id]
+        return keyset_response(query, key_columns, schema)
+    if is_streaming():
+        return stream_response(query.order_by(Service_Ticket.id), schema)
+    
+    service_tickets = paginate(query)
+    if not totals_included:
+        return schema.jsonify(service_tickets), 200
+    
+    # Read from the maintained column, or else one GROUP BY query for the
+    # whole page
+    items = schema.dump(service_tickets)
+    if materialized:
+        totals = {ticket.id: ticket.parts_total for ticket in service_tickets}
+    else:
+        totals = ticket_totals(ticket.id for ticket in service_tickets)
+    for ticket, item in zip(service_tickets, items):
+        item['parts_total'] = totals[ticket.id]
+    return jsonify(items), 200
 
 # Get a specific ticket ⚡ Tested!
 @service_tickets_bp.route("/<int:service_ticket_id>", methods=['GET'])
 # Rate limit applied
 @limiter.exempt
 def get_service_ticket(service_ticket_id):
-    service_ticket = db.session.get(Service_Ticket, service_ticket_id)
+    schema, options = fieldset(service_ticket_schema, Service_Ticket)
+    service_ticket = db.session.get(Service_Ticket, service_ticket_id, options=options)
     
     if service_ticket:       
-        return service_ticket_schema.jsonify(service_ticket), 200
+        return schema.jsonify(service_ticket), 200
     return jsonify({'error': "Invalid service ticket ID."}), 404
 
+# Get a ticket's parts with line totals and the parts total ⚡ Tested!
+@service_tickets_bp.route("/<int:service_ticket_id>/invoice", methods=['GET'])
+# Rate limit applied
+@limiter.exempt
+def get_invoice(service_ticket_id):
+    service_ticket = db.session.get(Service_Ticket, service_ticket_id)
+    if not service_ticket:
+        return jsonify({'error': "Invalid service ticket ID."}), 404
+    
+    lines = invoice_lines(service_ticket_id)
+    return jsonify({
+        'service_ticket_id': service_ticket_id,
+        'lines': lines,
+        'parts_total': round(sum(line['line_total'] for line in lines), 2)
+    }), 200
+
 # Update a service ticket by adding or removing mechanic(s) ⚡ Tested!
 @service_tickets_bp.route("/<int:service_ticket_id>", methods=['PUT'])
 def update_mechanics_on_ticket(service_ticket_id):
@@ -98,20 +180,43 @@ def update_mechanics_on_ticket(service_ticket_id):
     if not service_ticket:
         return jsonify({"message": "Service ticket not found."}), 404
     
-    # Add mechanics
-    for mechanic_id in edits.get('add_ids', []):
-        mechanic = db.session.get(Mechanic, mechanic_id)
-        if not mechanic:
-            return jsonify({"message": f"Mechanic ID {mechanic_id} not found."}), 404
-        if mechanic in service_ticket.mechanics:
-            continue  # skip duplicates
-        service_ticket.mechanics.append(mechanic)
-
-    # Remove mechanics
-    for mechanic_id in edits.get('remove_ids', []):
-        mechanic = db.session.get(Mechanic, mechanic_id)
-        if mechanic and mechanic in service_ticket.mechanics:
-            service_ticket.mechanics.remove(mechanic)
+    add_ids = set(edits.get('add_ids', []))
+    remove_ids = set(edits.get('remove_ids', []))
+    
+    # Resolve every requested id with one query - nothing changes if any is unknown
+    requested_ids = add_ids | remove_ids
+    found_ids = set(
+        db.session.execute(select(Mechanic.id).where(Mechanic.id.in_(requested_ids))).scalars()
+    ) if requested_ids else set()
+    missing_ids = requested_ids - found_ids
+    if missing_ids:
+        return jsonify({
+            "error": "Some mechanic IDs do not exist.",
+            "invalid_mechanic_ids": sorted(missing_ids)
+        }), 400
+    
+    # Diff against the ticket's current assignments, then one INSERT and one
+    # DELETE on the association table (an id in both lists ends up removed)
+    current_ids = set(db.session.execute(
+        select(service_mechanic.c.mechanic_id).where(service_mechanic.c.ticket_id == service_ticket_id)
+    ).scalars())
+    to_add = add_ids - current_ids - remove_ids
+    to_remove = remove_ids & current_ids
+    
+    if to_add:
+        db.session.execute(insert(service_mechanic), [
+            {'ticket_id': service_ticket_id, 'mechanic_id': mechanic_id} for mechanic_id in sorted(to_add)
+        ])
+        rollups.add_assignments((mechanic_id, service_ticket.service_date) for mechanic_id in to_add)
+    if to_remove:
+        db.session.execute(delete(service_mechanic).where(
+            service_mechanic.c.ticket_id == service_ticket_id,
+            service_mechanic.c.mechanic_id.in_(to_remove)
+        ))
+        rollups.add_assignments(((mechanic_id, service_ticket.service_date) for mechanic_id in to_remove), sign=-1)
+    if to_add or to_remove:
+        changes.record(Service_Ticket, [service_ticket_id])
+        changes.record(Mechanic, sorted(to_add | to_remove))
 
     db.session.commit()
 
@@ -122,12 +227,14 @@ def update_mechanics_on_ticket(service_ticket_id):
 @service_tickets_bp.route("/my-tickets", methods=['GET'])
 @token_required (required_type='customer')
 def get_my_tickets(user_id, user_type):
-    query = select(Service_Ticket).where(Service_Ticket.customer_id == user_id)
+    schema, options = fieldset(service_tickets_schema, Service_Ticket)
+    query = select(Service_Ticket).options(*options).where(Service_Ticket.customer_id == user_id)
     service_tickets = db.session.execute(query).scalars().all()
     
-    return service_tickets_schema.jsonify(service_tickets), 200
+    return schema.jsonify(service_tickets), 200
 
-# Update a service ticket by adding a part ⚡ Tested!
+# Update a service ticket by adding a quantity of a part ⚡ Tested!
+# Adding a part that is already on the ticket raises its quantity
 @service_tickets_bp.route("/<int:service_ticket_id>/add-part", methods=['PUT'])
 def add_part(service_ticket_id):
     try: 
@@ -140,34 +247,44 @@ def add_part(service_ticket_id):
         return jsonify({"message": "Service ticket not found."}), 404
     
     part_id = service_ticket_edits['part_id']
+    quantity = service_ticket_edits['quantity']
     part = db.session.get(Inventory, part_id)
     if not part:
         return jsonify({"message": f"Part ID {part_id} not found."}), 404
     
-    # Check if part already exists in this ticket
-    existing_link = db.session.scalar(
-        select(ServiceTicketInventory).where(
+    # Take the units from stock in one conditional UPDATE - the database checks
+    # and decrements atomically, so concurrent requests can't oversell. Parts
+    # without tracked stock (NULL) always match. The row stays locked until
+    # commit, which also serializes the ticket line upsert below per part.
+    taken = db.session.execute(
+        update(Inventory)
+        .where(Inventory.id == part_id, or_(Inventory.stock.is_(None), Inventory.stock >= quantity))
+        .values(stock=Inventory.stock - quantity)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not taken:
+        db.session.rollback()
+        return jsonify({"error": f"Not enough {part.part_name} in stock."}), 409
+    
+    # Raise the quantity of the existing line, or add the line
+    raised = db.session.execute(
+        update(ServiceTicketInventory)
+        .where(
             ServiceTicketInventory.service_ticket_id == service_ticket_id,
             ServiceTicketInventory.inventory_id == part_id
         )
-    )
-    
-    
-    if existing_link:
-        return jsonify({"message": f"Part {part.part_name} already added to ticket."}), 400
-
-    # Create the association
-    new_link = ServiceTicketInventory(
-        service_ticket_id=service_ticket_id,
-        inventory_id=part_id,
-        quantity=1  # default quantity, you can extend your schema to allow custom quantity
-    )
-    db.session.add(new_link)
+        .values(quantity=ServiceTicketInventory.quantity + quantity)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not raised:
+        db.session.execute(insert(ServiceTicketInventory).values(
+            service_ticket_id=service_ticket_id, inventory_id=part_id, quantity=quantity
+        ))
+    rollups.add_part_usage(part_id, quantity, lines=0 if raised else 1)
+    changes.record(Inventory, [part_id])   # stock and lines - the ticket is recorded by add_to_parts_total
+    add_to_parts_total(service_ticket_id, part.price * quantity)
     db.session.commit()
 
     return jsonify({
-        "message": f"Added part {part.part_name} (ID {part_id}) to service ticket {service_ticket_id}."
+        "message": f"Added {quantity} x part {part.part_name} (ID {part_id}) to service ticket {service_ticket_id}."
     }), 200
- 
-
-
@@ -2,16 +2,19 @@
 
 from app.extensions import ma
 from app.models import Service_Ticket
-from marshmallow import fields
+from app.utils.fastdump import FastDumpMixin
+from marshmallow import fields, validate
 
 # Schemas
-class Service_TicketSchema(ma.SQLAlchemyAutoSchema):
+class Service_TicketSchema(FastDumpMixin, ma.SQLAlchemyAutoSchema):
     mechanic_ids = fields.List(fields.Integer(), load_only=True)
     
     class Meta:
         model = Service_Ticket 
         load_instance = False
         include_fk = True 
+        # Only sent with ?include=totals / the invoice, never loaded
+        exclude = ('parts_total',)
         
         
 class EditService_TicketSchema(ma.Schema):
@@ -22,8 +25,9 @@ class EditService_TicketSchema(ma.Schema):
         
 class AddPartSchema(ma.Schema):
     part_id = fields.Int(required=True)
+    quantity = fields.Int(load_default=1, validate=validate.Range(min=1))
     class Meta:
-        fields = ("part_id",)
+        fields = ("part_id", "quantity")
     
 
 service_ticket_schema = Service_TicketSchema()
@@ -0,0 +1,144 @@
+# /app/cli.py
+
+# Flask CLI commands, e.g. `flask --app flask_app db upgrade`,
+# `flask --app flask_app db generate --tickets 1000000`,
+# `flask --app flask_app reports rebuild`, `flask --app flask_app jobs worker`,
+# `flask --app flask_app changes prune --days 30`
+
+import time
+from datetime import timedelta
+import click
+from flask.cli import AppGroup
+from flask import current_app
+from app import migrations, datagen, jobs
+from sqlalchemy import update
+from app.models import db, Customer, Inventory, Job
+from app.search import search
+from app.utils.passwords import hash_password
+from app.utils import rollups, changes
+
+db_cli = AppGroup('db', help='Database schema commands.')
+reports_cli = AppGroup('reports', help='Report rollup commands.')
+jobs_cli = AppGroup('jobs', help='Background job commands.')
+changes_cli = AppGroup('changes', help='Change feed commands.')
+
+
+@db_cli.command('upgrade')
+@click.option('--target', type=int, default=None, help='Stop at this schema version.')
+def upgrade_command(target):
+    """Apply pending schema migrations."""
+    applied = migrations.upgrade(target=target)
+    for version, description in applied:
+        click.echo(f'Applied migration {version}: {description}')
+    click.echo(f'Database is at version {migrations.current_version()}.')
+
+
+@db_cli.command('current')
+def current_command():
+    """Show the database's schema version."""
+    latest = max(version for version, _, _ in migrations.MIGRATIONS)
+    click.echo(f'Database is at version {migrations.current_version()} (latest {latest}).')
+
+
+@db_cli.command('generate')
+@click.option('--customers', type=int, default=datagen.DEFAULT_SIZES['customers'], show_default=True)
+@click.option('--mechanics', type=int, default=datagen.DEFAULT_SIZES['mechanics'], show_default=True)
+@click.option('--parts', type=int, default=datagen.DEFAULT_SIZES['parts'], show_default=True)
+@click.option('--tickets', type=int, default=datagen.DEFAULT_SIZES['tickets'], show_default=True)
+@click.option('--max-mechanics-per-ticket', type=int, default=datagen.DEFAULT_SIZES['max_mechanics_per_ticket'], show_default=True)
+@click.option('--max-parts-per-ticket', type=int, default=datagen.DEFAULT_SIZES['max_parts_per_ticket'], show_default=True)
+@click.option('--zipf', type=float, default=1.1, show_default=True, help='Skew exponent (mechanics use zipf + 0.5).')
+@click.option('--years', type=float, default=5, show_default=True, help='Spread of service dates.')
+@click.option('--seed', type=int, default=42, show_default=True)
+@click.option('--chunk-size', type=int, default=10000, show_default=True, help='Rows per INSERT batch.')
+@click.option('--password', default='password', show_default=True, help='Login password of every generated user.')
+def generate_command(customers, mechanics, parts, tickets, max_mechanics_per_ticket, max_parts_per_ticket,
+                     zipf, years, seed, chunk_size, password):
+    """Fill the database with skewed synthetic data."""
+    if tickets and not (customers and mechanics):
+        raise click.UsageError('Tickets need at least one customer and one mechanic.')
+    sizes = {
+        'customers': customers, 'mechanics': mechanics, 'parts': parts, 'tickets': tickets,
+        'max_mechanics_per_ticket': max_mechanics_per_ticket, 'max_parts_per_ticket': max_parts_per_ticket,
+    }
+    started = time.perf_counter()
+    reported = {}
+
+    def progress(table, rows):
+        # About every 100k rows per table
+        if rows - reported.get(table, 0) >= 100000:
+            reported[table] = rows
+            click.echo(f'  {table}: {rows:,} rows ({time.perf_counter() - started:.0f} s)')
+
+    counts = datagen.generate(
+        db.engine, sizes=sizes, seed=seed, exponent=zipf, years=years, chunk_size=chunk_size,
+        password_hash=hash_password(password), progress=progress
+    )
+    # Bulk inserts bypass the session, so the in-memory search index needs a rebuild
+    search.invalidate(Customer)
+    search.invalidate(Inventory)
+    for table, rows in counts.items():
+        click.echo(f'{table}: {rows:,} rows')
+    click.echo(f'Generated {sum(counts.values()):,} rows in {time.perf_counter() - started:.1f} s.')
+
+
+@reports_cli.command('rebuild')
+def rebuild_command():
+    """Recompute the report rollup tables from the tickets."""
+    started = time.perf_counter()
+    counts = rollups.rebuild()
+    db.session.commit()
+    for table, rows in counts.items():
+        click.echo(f'{table}: {rows:,} rows')
+    click.echo(f'Rebuilt the report rollups in {time.perf_counter() - started:.1f} s.')
+
+
+@jobs_cli.command('worker')
+@click.option('--threads', type=int, default=2, show_default=True, help='Jobs run at once by this process.')
+@click.option('--poll-interval', type=float, default=1.0, show_default=True, help='Seconds between polls of an empty queue.')
+@click.option('--burst', is_flag=True, help='Run the due jobs, then exit.')
+def worker_command(threads, poll_interval, burst):
+    """Run background jobs until interrupted (start more for more processes)."""
+    if burst:
+        jobs.maintain()
+        click.echo(f'Ran {jobs.run_pending()} jobs.')
+        return
+    worker = jobs.Worker(current_app._get_current_object(), threads=threads, poll_interval=poll_interval)
+    worker.start()
+    click.echo(f'Worker {worker.name} running {threads} threads, Ctrl+C to stop.')
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        click.echo('Stopping after the running jobs...')
+        worker.stop()
+    click.echo(f'Ran {worker.processed} jobs.')
+
+
+@jobs_cli.command('stats')
+def stats_command():
+    """Show the queue depth."""
+    stats = jobs.queue_stats()
+    click.echo(', '.join(f'{status}: {stats[status]:,}' for status in jobs.STATUSES + ('due',)))
+    click.echo(f"Oldest due job waiting {stats['oldest_due_seconds']:.1f} s")
+    for name, counts in sorted(stats['tasks'].items()):
+        click.echo(f"  {name}: " + ', '.join(f'{status} {count:,}' for status, count in counts.items()))
+
+
+@jobs_cli.command('retry')
+def retry_command():
+    """Queue the failed jobs again."""
+    retried = db.session.execute(
+        update(Job).where(Job.status == jobs.FAILED).values(status=jobs.QUEUED, attempts=0, run_at=jobs.utcnow(), finished_at=None)
+    ).rowcount
+    db.session.commit()
+    click.echo(f'Requeued {retried} failed jobs.')
+
+
+@changes_cli.command('prune')
+@click.option('--days', type=int, default=30, show_default=True, help='Keep the changes of the last DAYS days.')
+def prune_command(days):
+    """Delete old change feed entries (clients further behind must resync)."""
+    deleted = changes.prune(changes.utcnow() - timedelta(days=days))
+    db.session.commit()
+    click.echo(f'Deleted {deleted:,} changes older than {days} days.')
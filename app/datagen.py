@@ -0,0 +1,181 @@
+# /app/datagen.py
+
+# Synthetic production-scale data, for reproducing scaling problems locally
+# (`flask --app flask_app db generate`). Real shops aren't uniform, so
+# neither is this:
+#  - tickets per customer follow a Zipf distribution - a few fleet customers
+#    own thousands of tickets, most customers have one or two
+#  - mechanics are drawn from a steeper Zipf, so a handful of "popular"
+#    mechanics are on most tickets in service_mechanic
+#  - parts usage in service_ticket_inventory is long-tailed: common parts on
+#    many tickets, most parts rarely used
+#  - service dates and MechanicServiceTicket start dates spread over --years
+#
+# Rows are generated and inserted in chunks with Core executemany INSERTs,
+# each chunk committed on its own, so memory stays flat whatever the size.
+# The same seed and sizes always produce the same rows. New rows get ids
+# after the current maximum, so it can also add to an existing database.
+
+import itertools
+import random
+from datetime import date, datetime, timedelta
+from sqlalchemy import select, func, text
+from app.models import Customer, Mechanic, Service_Ticket, Inventory, MechanicServiceTicket, ServiceTicketInventory, service_mechanic
+from app.utils.totals import recompute_parts_totals
+from app.utils import rollups
+
+END_DATE = date(2025, 12, 31)   # fixed, so a seed gives the same dates any day
+
+PARTS = ['Brake Pad', 'Brake Rotor', 'Oil Filter', 'Air Filter', 'Cabin Filter', 'Spark Plug', 'Wiper Blade',
+         'Timing Belt', 'Serpentine Belt', 'Headlight Bulb', 'Battery', 'Alternator', 'Starter', 'Radiator Hose',
+         'Water Pump', 'Fuel Pump', 'Shock Absorber', 'Strut', 'Tie Rod End', 'Wheel Bearing']
+SERVICES = ['Oil Change', 'Brake Service', 'Tire Rotation', 'Inspection', 'Battery Replacement', 'Engine Diagnostics',
+            'Transmission Service', 'Coolant Flush', 'Alignment', 'Suspension Repair']
+
+TABLES = [Customer.__table__, Mechanic.__table__, Inventory.__table__, Service_Ticket.__table__, service_mechanic,
+          MechanicServiceTicket.__table__, ServiceTicketInventory.__table__]
+
+DEFAULT_SIZES = {
+    'customers': 10000,
+    'mechanics': 50,
+    'parts': 2000,
+    'tickets': 100000,
+    'max_mechanics_per_ticket': 3,
+    'max_parts_per_ticket': 4,
+}
+
+
+# Draws ids with P(rank k) proportional to 1 / k**exponent. Ranks are
+# shuffled over the ids, so the heavy hitters aren't simply the lowest ids.
+class Zipf:
+    def __init__(self, rng, ids, exponent):
+        self.rng = rng
+        self.ids = list(ids)
+        rng.shuffle(self.ids)
+        self.cum_weights = list(itertools.accumulate(1 / rank ** exponent for rank in range(1, len(self.ids) + 1)))
+
+    def sample(self, k=1):
+        return self.rng.choices(self.ids, cum_weights=self.cum_weights, k=k)
+
+    # k different ids
+    def distinct(self, k):
+        k = min(k, len(self.ids))
+        chosen = []
+        while len(chosen) < k:
+            for id in self.sample(k - len(chosen)):
+                if id not in chosen:
+                    chosen.append(id)
+        return chosen
+
+
+def _next_id(conn, model):
+    return (conn.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+
+def _chunks(rows, size):
+    rows = iter(rows)
+    while chunk := list(itertools.islice(rows, size)):
+        yield chunk
+
+
+class Generator:
+    def __init__(self, conn, sizes=None, seed=42, exponent=1.1, years=5, chunk_size=10000, password_hash='x', progress=None):
+        self.conn = conn
+        self.sizes = dict(DEFAULT_SIZES, **(sizes or {}))
+        self.rng = random.Random(seed)
+        self.exponent = exponent
+        self.days = int(years * 365)
+        self.chunk_size = chunk_size
+        self.password_hash = password_hash
+        self.progress = progress or (lambda table, rows: None)
+        self.counts = {table.name: 0 for table in TABLES}
+
+    def insert(self, table, rows):
+        for chunk in _chunks(rows, self.chunk_size):
+            self.conn.execute(table.insert(), chunk)
+            self.conn.commit()
+            self.counts[table.name] += len(chunk)
+            self.progress(table.name, self.counts[table.name])
+
+    def customers(self, first):
+        rng = self.rng
+        for id in range(first, first + self.sizes['customers']):
+            yield {'id': id, 'name': f'Customer {id}', 'email': f'customer{id}@example.com',
+                   'phone': f'555-{rng.randrange(10000):04d}', 'password': self.password_hash}
+
+    def mechanics(self, first):
+        rng = self.rng
+        for id in range(first, first + self.sizes['mechanics']):
+            yield {'id': id, 'name': f'Mechanic {id}', 'email': f'mechanic{id}@example.com',
+                   'phone': f'555-{rng.randrange(10000):04d}', 'salary': str(rng.randrange(35000, 95000, 500)),
+                   'password': self.password_hash}
+
+    def parts(self, first):
+        rng = self.rng
+        for id in range(first, first + self.sizes['parts']):
+            yield {'id': id, 'part_name': f'{rng.choice(PARTS)} {id}', 'price': round(rng.lognormvariate(3.5, 1.0), 2),
+                   'stock': rng.choice([None, rng.randrange(0, 200)])}
+
+    # Tickets with their mechanics and parts, one chunk of tickets at a time -
+    # each chunk's association rows are inserted right after its tickets
+    def tickets(self, first, customers, mechanics, parts):
+        rng = self.rng
+        sizes = self.sizes
+        for start in range(first, first + sizes['tickets'], self.chunk_size):
+            stop = min(start + self.chunk_size, first + sizes['tickets'])
+            owners = customers.sample(stop - start)
+            tickets, assignments, starts, lines = [], [], [], []
+            for id, customer_id in zip(range(start, stop), owners):
+                service_date = END_DATE - timedelta(days=rng.randrange(self.days))
+                tickets.append({'id': id, 'VIN': f'SYN{id:014d}', 'service_date': service_date,
+                                'service_desc': rng.choice(SERVICES), 'customer_id': customer_id})
+                for mechanic_id in mechanics.distinct(rng.randint(1, sizes['max_mechanics_per_ticket'])):
+                    assignments.append({'ticket_id': id, 'mechanic_id': mechanic_id})
+                    started = datetime.combine(service_date, datetime.min.time()) + timedelta(minutes=rng.randrange(7 * 60, 18 * 60))
+                    starts.append({'mechanic_id': mechanic_id, 'service_id': id, 'start_date': started})
+                for part_id in parts.distinct(rng.randint(0, sizes['max_parts_per_ticket'])):
+                    lines.append({'service_ticket_id': id, 'inventory_id': part_id, 'quantity': rng.choice((1, 1, 1, 2, 2, 4))})
+            self.insert(Service_Ticket.__table__, tickets)
+            self.insert(service_mechanic, assignments)
+            self.insert(MechanicServiceTicket.__table__, starts)
+            self.insert(ServiceTicketInventory.__table__, lines)
+
+    def run(self):
+        conn = self.conn
+        first = {model: _next_id(conn, model) for model in (Customer, Mechanic, Inventory, Service_Ticket)}
+        conn.commit()
+
+        self.insert(Customer.__table__, self.customers(first[Customer]))
+        self.insert(Mechanic.__table__, self.mechanics(first[Mechanic]))
+        self.insert(Inventory.__table__, self.parts(first[Inventory]))
+
+        customers = Zipf(self.rng, range(first[Customer], first[Customer] + self.sizes['customers']), self.exponent)
+        mechanics = Zipf(self.rng, range(first[Mechanic], first[Mechanic] + self.sizes['mechanics']), self.exponent + 0.5)
+        parts = Zipf(self.rng, range(first[Inventory], first[Inventory] + self.sizes['parts']), self.exponent)
+        if self.sizes['tickets']:
+            self.tickets(first[Service_Ticket], customers, mechanics, parts)
+
+        recompute_parts_totals(conn)
+        rollups.rebuild(conn)
+        if conn.dialect.name == 'postgresql':
+            # Explicit ids don't advance the serial sequences
+            quote = conn.dialect.identifier_preparer.format_table
+            for table in TABLES:
+                if 'id' in table.c:
+                    conn.execute(text(f"SELECT setval(pg_get_serial_sequence('{quote(table)}', 'id'), COALESCE(MAX(id), 1)) FROM {quote(table)}"))
+        conn.commit()
+        return self.counts
+
+
+def generate(engine, **options):
+    with engine.connect() as conn:
+        synchronous = None
+        if conn.dialect.name == 'sqlite':
+            # Throwaway data - skip the fsync after every chunk
+            synchronous = conn.exec_driver_sql('PRAGMA synchronous').scalar()
+            conn.exec_driver_sql('PRAGMA synchronous = OFF')
+        try:
+            return Generator(conn, **options).run()
+        finally:
+            if synchronous is not None:
+                conn.exec_driver_sql(f'PRAGMA synchronous = {int(synchronous)}')
@@ -4,6 +4,7 @@ from flask_marshmallow import Marshmallow
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flask_caching import Cache
+from app.utils import sqlite_storage  # registers the sqlite:// rate limit storage
 
 # Instantiate the Marshmallow library
 ma = Marshmallow()
@@ -0,0 +1,272 @@
+# /app/jobs.py
+
+# Background jobs, for side effects that don't have to finish before the
+# response (report rollups today; notifications, invoices later).
+#
+# A job is a row in the jobs table. enqueue() adds it to the request's
+# session, so it commits together with the write that needs it - a job is
+# never lost after a commit, and never runs for a write that rolled back.
+# No broker: the database is the queue.
+#
+# `flask --app flask_app jobs worker --threads 4` runs them. Each thread
+# claims the oldest due job with a conditional UPDATE (queued -> running), so
+# any number of threads and worker processes, on SQLite or Postgres, never
+# claim the same job twice. The task's own writes commit in the same
+# transaction that marks the job done, and that UPDATE only matches while the
+# job is still running under the worker's id - a run that outlasted
+# JOB_TIMEOUT_SECONDS and was requeued (and maybe claimed again) rolls back
+# instead of applying its writes a second time. Worker ids must be unique
+# among the running workers.
+#
+# A task that raises is retried after JOB_BACKOFF_SECONDS * 2**(attempts - 1)
+# (capped at JOB_MAX_BACKOFF_SECONDS) and marked failed after its
+# max_attempts. Jobs left running by a worker that died are requeued after
+# JOB_TIMEOUT_SECONDS; finished jobs are deleted after JOB_RETENTION_SECONDS.
+#
+# Queue depth: GET /jobs/stats or `flask jobs stats`. Tests call
+# run_pending(), which runs every due job in the calling thread.
+
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta, timezone
+from flask import current_app, jsonify
+from sqlalchemy import select, update, delete, func
+from app.extensions import limiter
+from app.models import db, Job
+
+logger = logging.getLogger(__name__)
+
+QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+STATUSES = (QUEUED, RUNNING, DONE, FAILED)
+
+JOB_BACKOFF_SECONDS = 2
+JOB_MAX_BACKOFF_SECONDS = 600
+JOB_TIMEOUT_SECONDS = 300
+JOB_RETENTION_SECONDS = 24 * 60 * 60
+CLAIM_CANDIDATES = 10   # due jobs tried per claim, so busy workers don't all race for the same one
+
+TASKS = {}
+
+
+# Registers fn(payload) as a task
+def task(name, max_attempts=5):
+    def decorator(fn):
+        TASKS[name] = (fn, max_attempts)
+        return fn
+    return decorator
+
+
+def utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _setting(name, default):
+    return current_app.config.get(name, default)
+
+
+# Adds a job to the session - it is queued when the session commits
+def enqueue(name, payload=None, delay=0, session=None):
+    _, max_attempts = TASKS[name]
+    now = utcnow()
+    job = Job(task=name, payload=payload or {}, max_attempts=max_attempts, run_at=now + timedelta(seconds=delay), created_at=now)
+    (session or db.session).add(job)
+    return job
+
+
+def backoff(attempts):
+    delay = _setting('JOB_BACKOFF_SECONDS', JOB_BACKOFF_SECONDS) * 2 ** (attempts - 1)
+    return min(delay, _setting('JOB_MAX_BACKOFF_SECONDS', JOB_MAX_BACKOFF_SECONDS))
+
+
+# ----- Running jobs -----
+
+# Marks the oldest due job as running by worker_id and returns its id, or
+# None when nothing is due
+def claim(worker_id, now=None):
+    now = now or utcnow()
+    candidates = db.session.execute(
+        select(Job.id)
+        .where(Job.status == QUEUED, Job.run_at <= now)
+        .order_by(Job.run_at, Job.id)
+        .limit(CLAIM_CANDIDATES)
+    ).scalars().all()
+    for job_id in candidates:
+        claimed = db.session.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == QUEUED)
+            .values(status=RUNNING, locked_by=worker_id, locked_at=now, attempts=Job.attempts + 1)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        if claimed:
+            return job_id
+    db.session.commit()
+    return None
+
+
+# Sets values on a job still running under worker_id. Returns False when
+# it was requeued (or finished by another worker) in the meantime.
+def _release(job_id, worker_id, **values):
+    return db.session.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status == RUNNING, Job.locked_by == worker_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    ).rowcount == 1
+
+
+def _lost(job):
+    logger.warning('Job %s (%s) was requeued while running, discarding this run', job.id, job.task)
+
+
+# Runs a job claimed by worker_id. Returns True when its task succeeded and
+# its writes committed.
+def run_job(job_id, worker_id, now=None):
+    job = db.session.get(Job, job_id)
+    fn, _ = TASKS.get(job.task, (None, None))
+    try:
+        if fn is None:
+            raise LookupError(f'Unknown task {job.task!r}')
+        fn(job.payload)
+        if not _release(job_id, worker_id, status=DONE, finished_at=utcnow(), last_error=None):
+            db.session.rollback()
+            _lost(job)
+            return False
+        db.session.commit()
+        return True
+    except Exception as e:
+        db.session.rollback()
+        _failed(job_id, worker_id, e, now or utcnow())
+        return False
+
+
+def _failed(job_id, worker_id, error, now):
+    job = db.session.get(Job, job_id)
+    values = {'last_error': ''.join(traceback.format_exception(error))[-4000:], 'locked_by': None, 'locked_at': None}
+    if job.attempts >= job.max_attempts:
+        values.update(status=FAILED, finished_at=now)
+    else:
+        values.update(status=QUEUED, run_at=now + timedelta(seconds=backoff(job.attempts)))
+    released = _release(job_id, worker_id, **values)
+    db.session.commit()
+    if not released:
+        _lost(job)
+    elif values['status'] == FAILED:
+        logger.error('Job %s (%s) failed after %s attempts: %r', job.id, job.task, job.attempts, error)
+    else:
+        logger.warning('Job %s (%s) attempt %s failed, retrying at %s: %r', job.id, job.task, job.attempts, values['run_at'], error)
+
+
+# Requeues jobs whose worker stopped answering and deletes old finished jobs.
+# Returns (requeued, deleted).
+def maintain(now=None):
+    now = now or utcnow()
+    timeout = timedelta(seconds=_setting('JOB_TIMEOUT_SECONDS', JOB_TIMEOUT_SECONDS))
+    retention = timedelta(seconds=_setting('JOB_RETENTION_SECONDS', JOB_RETENTION_SECONDS))
+    requeued = db.session.execute(
+        update(Job)
+        .where(Job.status == RUNNING, Job.locked_at < now - timeout)
+        .values(status=QUEUED, run_at=now, locked_by=None, locked_at=None)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    deleted = db.session.execute(
+        delete(Job)
+        .where(Job.status == DONE, Job.finished_at < now - retention)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.session.commit()
+    return requeued, deleted
+
+
+# Runs due jobs in the calling thread until none is left (retries that
+# aren't due yet wait). Returns the number of jobs run.
+def run_pending(worker_id='inline', now=None, limit=None):
+    count = 0
+    while limit is None or count < limit:
+        job_id = claim(worker_id, now)
+        if job_id is None:
+            break
+        run_job(job_id, worker_id, now)
+        count += 1
+    return count
+
+
+# Jobs per status (and per task), plus how long the oldest due job has waited
+def queue_stats(now=None):
+    now = now or utcnow()
+    rows = db.session.execute(select(Job.task, Job.status, func.count()).group_by(Job.task, Job.status)).all()
+    due, oldest_due = db.session.execute(
+        select(func.count(), func.min(Job.run_at)).where(Job.status == QUEUED, Job.run_at <= now)
+    ).one()
+    stats = dict.fromkeys(STATUSES, 0)
+    tasks = {}
+    for name, status, count in rows:
+        stats[status] = stats.get(status, 0) + count
+        tasks.setdefault(name, dict.fromkeys(STATUSES, 0))[status] = count
+    stats['due'] = due
+    stats['oldest_due_seconds'] = round((now - oldest_due).total_seconds(), 3) if oldest_due else 0.0
+    stats['tasks'] = tasks
+    return stats
+
+
+# ----- Worker pool -----
+
+class Worker:
+    def __init__(self, app, threads=1, poll_interval=1.0, maintain_interval=60.0, name=None):
+        self.app = app
+        self.threads = threads
+        self.poll_interval = poll_interval
+        self.maintain_interval = maintain_interval
+        self.name = name or f'{socket.gethostname()}:{os.getpid()}'
+        self.stopping = threading.Event()
+        self.pool = []
+        self.processed = 0
+        self.lock = threading.Lock()
+
+    def start(self):
+        for index in range(self.threads):
+            thread = threading.Thread(target=self._run, args=(f'{self.name}:{index}',), name=f'job-worker-{index}', daemon=True)
+            thread.start()
+            self.pool.append(thread)
+
+    def stop(self, wait=True):
+        self.stopping.set()
+        if wait:
+            for thread in self.pool:
+                thread.join()
+
+    def _run(self, worker_id):
+        maintained = 0.0
+        while not self.stopping.is_set():
+            with self.app.app_context():
+                try:
+                    if worker_id.endswith(':0') and time.monotonic() - maintained >= self.maintain_interval:
+                        maintain()
+                        maintained = time.monotonic()
+                    job_id = claim(worker_id)
+                    if job_id is not None:
+                        run_job(job_id, worker_id)
+                        with self.lock:
+                            self.processed += 1
+                        continue
+                except Exception:
+                    logger.exception('Job worker %s failed', worker_id)
+                    db.session.rollback()
+            self.stopping.wait(self.poll_interval)
+
+
+class JobQueue:
+    def init_app(self, app):
+        # Queue depth for monitoring
+        @limiter.exempt
+        def job_stats_view():
+            return jsonify(queue_stats()), 200
+
+        app.add_url_rule('/jobs/stats', 'job_stats', job_stats_view, methods=['GET'])
+
+
+job_queue = JobQueue()
@@ -0,0 +1,172 @@
+# /app/migrations.py
+
+# Versioned schema migrations. db.create_all() only creates missing tables,
+# it never adds indexes or columns to tables that already exist, so
+# production databases are upgraded with `flask db upgrade` instead.
+#
+# Each migration runs once, in its own transaction, and is recorded in the
+# schema_version table. Migrations are written to be safe on a database that
+# already has the change (e.g. one created by db.create_all()).
+
+from datetime import datetime, timezone
+from sqlalchemy import MetaData, Table, Column, Integer, String, DateTime, inspect, select, insert, delete, func
+from sqlalchemy.schema import CreateColumn
+from app.models import db, Base
+
+# Kept out of the models' metadata - it belongs to the migration runner,
+# not to the application schema
+version_metadata = MetaData()
+schema_version = Table(
+    'schema_version',
+    version_metadata,
+    Column('version', Integer, primary_key=True),
+    Column('description', String(255), nullable=False),
+    Column('applied_at', DateTime, nullable=False)
+)
+
+MIGRATIONS = []
+
+
+def migration(version, description):
+    def decorator(fn):
+        MIGRATIONS.append((version, description, fn))
+        return fn
+    return decorator
+
+
+# ----- Helpers for writing migrations -----
+
+def _table(name):
+    return Base.metadata.tables[name]
+
+
+def create_index(conn, table_name, index_name):
+    index = next(i for i in _table(table_name).indexes if i.name == index_name)
+    index.create(conn, checkfirst=True)
+
+
+def add_column(conn, table_name, column_name):
+    existing = {c['name'] for c in inspect(conn).get_columns(table_name)}
+    if column_name in existing:
+        return
+    column = _table(table_name).c[column_name]
+    ddl = CreateColumn(column).compile(dialect=conn.dialect)
+    conn.exec_driver_sql(f'ALTER TABLE {conn.dialect.identifier_preparer.quote(table_name)} ADD COLUMN {ddl}')
+
+
+def create_tables(conn, *table_names):
+    Base.metadata.create_all(conn, tables=[_table(name) for name in table_names])
+
+
+# ----- Migrations (append new ones at the end, never edit applied ones) -----
+
+@migration(1, 'baseline schema')
+def baseline(conn):
+    create_tables(
+        conn,
+        'customers', 'service_tickets', 'mechanics', 'service_mechanic',
+        'MechanicServiceTicket', 'inventory', 'service_ticket_inventory'
+    )
+
+
+@migration(2, 'indexes on lookup and foreign-key columns')
+def lookup_indexes(conn):
+    # Unique indexes can't be created over existing duplicates - collapse them
+    # first (service_ticket_inventory keeps the oldest row for each pair)
+    sti = _table('service_ticket_inventory')
+    keep = (
+        select(func.min(sti.c.id))
+        .group_by(sti.c.service_ticket_id, sti.c.inventory_id)
+        .subquery()
+    )
+    conn.execute(delete(sti).where(sti.c.id.not_in(select(keep.c[0]))))
+    
+    # service_mechanic has no primary key, so duplicates are rebuilt from DISTINCT
+    sm = _table('service_mechanic')
+    duplicates = conn.execute(
+        select(sm.c.ticket_id, sm.c.mechanic_id)
+        .group_by(sm.c.ticket_id, sm.c.mechanic_id)
+        .having(func.count() > 1)
+    ).all()
+    if duplicates:
+        rows = conn.execute(select(sm.c.ticket_id, sm.c.mechanic_id).distinct()).mappings().all()
+        conn.execute(delete(sm))
+        conn.execute(insert(sm), [dict(row) for row in rows])
+    
+    create_index(conn, 'service_tickets', 'ix_service_tickets_customer_id')
+    create_index(conn, 'service_tickets', 'ix_service_tickets_service_date_id')
+    create_index(conn, 'service_mechanic', 'uq_service_mechanic_ticket_mechanic')
+    create_index(conn, 'service_mechanic', 'ix_service_mechanic_mechanic_id')
+    create_index(conn, 'MechanicServiceTicket', 'ix_MechanicServiceTicket_mechanic_id')
+    create_index(conn, 'MechanicServiceTicket', 'ix_MechanicServiceTicket_service_id')
+    create_index(conn, 'inventory', 'ix_inventory_part_name')
+    create_index(conn, 'service_ticket_inventory', 'uq_service_ticket_inventory_ticket_part')
+    create_index(conn, 'service_ticket_inventory', 'ix_service_ticket_inventory_inventory_id')
+
+
+@migration(3, 'full-text search tables and indexes')
+def search_objects(conn):
+    from app.search import SEARCHABLE, create_search_objects
+    for model in SEARCHABLE:
+        create_search_objects(conn, model)
+
+
+@migration(4, 'materialized service_tickets.parts_total')
+def parts_total(conn):
+    from app.utils.totals import recompute_parts_totals
+    add_column(conn, 'service_tickets', 'parts_total')
+    recompute_parts_totals(conn)
+
+
+@migration(5, 'inventory.stock')
+def inventory_stock(conn):
+    add_column(conn, 'inventory', 'stock')
+
+
+@migration(6, 'report rollup tables')
+def report_rollups(conn):
+    from app.utils.rollups import rebuild
+    create_tables(conn, 'report_daily_revenue', 'report_part_usage', 'report_mechanic_workload')
+    # rebuild() clears the queued rollups.apply jobs, so the jobs table
+    # (migration 7) has to exist by now
+    create_tables(conn, 'jobs')
+    rebuild(conn)
+
+
+@migration(7, 'background jobs table')
+def jobs_table(conn):
+    create_tables(conn, 'jobs')   # already there unless migration 6 ran before it did
+
+
+@migration(8, 'change log table')
+def change_log_table(conn):
+    create_tables(conn, 'change_log')
+
+
+# ----- Runner -----
+
+def current_version(engine=None):
+    engine = engine or db.engine
+    version_metadata.create_all(engine)
+    with engine.connect() as conn:
+        return conn.execute(select(func.max(schema_version.c.version))).scalar() or 0
+
+
+# Applies every migration newer than the database's version, in order.
+# Returns the list of (version, description) that were applied.
+def upgrade(engine=None, target=None):
+    engine = engine or db.engine
+    current = current_version(engine)
+    applied = []
+    for version, description, fn in sorted(MIGRATIONS, key=lambda m: m[0]):
+        if version <= current or (target is not None and version > target):
+            continue
+        with engine.begin() as conn:
+            fn(conn)
+            conn.execute(insert(schema_version).values(
+                version=version,
+                description=description,
+                applied_at=datetime.now(timezone.utc)
+            ))
+        applied.append((version, description))
+    return applied
@@ -3,7 +3,7 @@
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 from datetime import date, datetime
-from typing import List 
+from typing import List, Optional 
 
 # Create a base class for the models
 class Base(DeclarativeBase):
@@ -18,7 +18,10 @@ service_mechanic = db.Table(
     'service_mechanic',
     Base.metadata,
     db.Column('ticket_id', db.ForeignKey('service_tickets.id')),
-    db.Column('mechanic_id', db.ForeignKey('mechanics.id'))
+    db.Column('mechanic_id', db.ForeignKey('mechanics.id')),
+    # A mechanic is assigned to a ticket at most once - also serves lookups by ticket
+    db.Index('uq_service_mechanic_ticket_mechanic', 'ticket_id', 'mechanic_id', unique=True),
+    db.Index('ix_service_mechanic_mechanic_id', 'mechanic_id')
 )
 
 # Creating the Customer Model
@@ -43,7 +46,13 @@ class Service_Ticket(Base):
     VIN: Mapped[str] = mapped_column(db.String(360), nullable=False, unique=True)
     service_date: Mapped[date] = mapped_column(db.Date, nullable=False)
     service_desc: Mapped[str] = mapped_column(db.String(360), nullable=False)
-    customer_id: Mapped[int] = mapped_column(db.ForeignKey('customers.id'), nullable=False) 
+    customer_id: Mapped[int] = mapped_column(db.ForeignKey('customers.id'), nullable=False, index=True)
+    # SUM(quantity * price) of the ticket's parts, kept up to date by add_part
+    # and inventory price changes (see app/utils/totals.py)
+    parts_total: Mapped[float] = mapped_column(db.Float(), nullable=False, default=0, server_default='0')
+    
+    # Keyset pagination walks tickets in (service_date, id) order
+    __table_args__ = (db.Index('ix_service_tickets_service_date_id', 'service_date', 'id'),)
     
     # Relationship attribute
     customer: Mapped['Customer'] = db.relationship(back_populates="service_tickets")  
@@ -70,8 +79,8 @@ class MechanicServiceTicket(Base):
     __tablename__ = "MechanicServiceTicket"
     
     id: Mapped[int] = mapped_column(primary_key=True)
-    mechanic_id: Mapped[int] = mapped_column(db.ForeignKey("mechanics.id"), nullable=False)
-    service_id: Mapped[int] = mapped_column(db.ForeignKey("service_tickets.id"), nullable=False)
+    mechanic_id: Mapped[int] = mapped_column(db.ForeignKey("mechanics.id"), nullable=False, index=True)
+    service_id: Mapped[int] = mapped_column(db.ForeignKey("service_tickets.id"), nullable=False, index=True)
     start_date = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     
     mechanic: Mapped['Mechanic'] = db.relationship(back_populates='mechanic_tickets')
@@ -84,8 +93,11 @@ class Inventory(Base):
     __tablename__ = 'inventory'
     
     id: Mapped[int] = mapped_column(primary_key=True)
-    part_name: Mapped[str] = mapped_column(db.String(255), nullable=False)
+    part_name: Mapped[str] = mapped_column(db.String(255), nullable=False, index=True)
     price: Mapped[float] = mapped_column(db.Float(), nullable=False)
+    # Units on hand - NULL means stock isn't tracked for the part. Only ever
+    # decremented with a conditional UPDATE (see add_part), never read-modify-write
+    stock: Mapped[Optional[int]] = mapped_column(nullable=True)
     
     service_ticket_inventory: Mapped[List["ServiceTicketInventory"]] = db.relationship(back_populates='inventory')
     
@@ -94,9 +106,86 @@ class ServiceTicketInventory(Base):
     __tablename__ = "service_ticket_inventory"
     
     id: Mapped[int] = mapped_column(primary_key=True)
-    inventory_id: Mapped[int] = mapped_column(db.ForeignKey('inventory.id'), nullable=False)
+    inventory_id: Mapped[int] = mapped_column(db.ForeignKey('inventory.id'), nullable=False, index=True)
     service_ticket_id: Mapped[int] = mapped_column(db.ForeignKey('service_tickets.id'), nullable=False)
     quantity: Mapped[int] = mapped_column(nullable=False)
     
+    # One row per part per ticket - also serves lookups by ticket
+    __table_args__ = (
+        db.Index('uq_service_ticket_inventory_ticket_part', 'service_ticket_id', 'inventory_id', unique=True),
+    )
+    
     inventory: Mapped['Inventory'] = db.relationship(back_populates='service_ticket_inventory')
-    service_ticket: Mapped['Service_Ticket'] = db.relationship(back_populates='service_ticket_inventory')
\ No newline at end of file
+    service_ticket: Mapped['Service_Ticket'] = db.relationship(back_populates='service_ticket_inventory')
+
+# ----- Report rollups -----
+# Pre-aggregated copies of the report queries, so /reports reads one row per
+# day / part / mechanic-week instead of scanning the tickets. Kept up to date
+# in the same transaction as the writes (app/utils/rollups.py) and rebuilt from
+# scratch with `flask reports rebuild`.
+
+# Tickets and SUM(parts_total) per service date
+class DailyRevenue(Base):
+    __tablename__ = 'report_daily_revenue'
+    
+    day: Mapped[date] = mapped_column(db.Date, primary_key=True)
+    tickets: Mapped[int] = mapped_column(nullable=False, default=0, server_default='0')
+    revenue: Mapped[float] = mapped_column(db.Float(), nullable=False, default=0, server_default='0')
+
+# Units and ticket lines per part (service_ticket_inventory)
+class PartUsage(Base):
+    __tablename__ = 'report_part_usage'
+    
+    inventory_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    quantity: Mapped[int] = mapped_column(nullable=False, default=0, server_default='0')
+    lines: Mapped[int] = mapped_column(nullable=False, default=0, server_default='0')
+
+# Tickets per mechanic per week (service_mechanic), weeks start on Monday
+class MechanicWorkload(Base):
+    __tablename__ = 'report_mechanic_workload'
+    
+    mechanic_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    week: Mapped[date] = mapped_column(db.Date, primary_key=True)
+    tickets: Mapped[int] = mapped_column(nullable=False, default=0, server_default='0')
+
+
+# Background job (app/jobs.py) - added to the session of the write that needs
+# it, so it commits or rolls back with that write. Run by `flask jobs worker`.
+class Job(Base):
+    __tablename__ = 'jobs'
+    
+    id: Mapped[int] = mapped_column(primary_key=True)
+    task: Mapped[str] = mapped_column(db.String(100), nullable=False)
+    payload: Mapped[dict] = mapped_column(db.JSON, nullable=False, default=dict)
+    status: Mapped[str] = mapped_column(db.String(10), nullable=False, default='queued')   # queued / running / done / failed
+    attempts: Mapped[int] = mapped_column(nullable=False, default=0)
+    max_attempts: Mapped[int] = mapped_column(nullable=False, default=5)
+    run_at: Mapped[datetime] = mapped_column(db.DateTime, nullable=False, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(db.DateTime, nullable=False, default=datetime.utcnow)
+    locked_by: Mapped[Optional[str]] = mapped_column(db.String(100))
+    locked_at: Mapped[Optional[datetime]] = mapped_column(db.DateTime)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(db.DateTime)
+    last_error: Mapped[Optional[str]] = mapped_column(db.Text)
+    
+    # Workers look for the oldest due job of a status
+    __table_args__ = (db.Index('ix_jobs_status_run_at', 'status', 'run_at'),)
+
+
+# Change feed (app/utils/changes.py) - one row per insert / update / delete of a
+# customer, mechanic, service ticket or inventory item, written in the same
+# transaction as the change. Clients read it in seq order from GET /changes.
+class Change(Base):
+    __tablename__ = 'change_log'
+    
+    seq: Mapped[int] = mapped_column(primary_key=True)
+    entity: Mapped[str] = mapped_column(db.String(30), nullable=False)   # table name
+    row_id: Mapped[int] = mapped_column(nullable=False)
+    op: Mapped[str] = mapped_column(db.String(6), nullable=False)   # insert / update / delete
+    changed_at: Mapped[datetime] = mapped_column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    # ?entity= reads one table's changes in seq order. AUTOINCREMENT keeps
+    # SQLite from reusing the seq of pruned rows.
+    __table_args__ = (
+        db.Index('ix_change_log_entity_seq', 'entity', 'seq'),
+        {'sqlite_autoincrement': True},
+    )
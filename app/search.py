@@ -0,0 +1,345 @@
+# /app/search.py
+
+# Pluggable full-text search for customer emails and inventory part names.
+# LIKE '%term%' can never use an index, so each backend answers the same
+# case-insensitive substring query from an index instead:
+#
+#  - fts5:    SQLite FTS5 tables (trigram tokenizer), kept in sync by triggers
+#  - trigram: Postgres pg_trgm GIN indexes, ranked by similarity()
+#  - ngram:   in-process trigram inverted index, kept in sync from SQLAlchemy
+#             session events - the fallback when neither of the above exists
+#  - like:    plain LIKE scan. Also answers terms shorter than 3 characters,
+#             which no trigram index can.
+#
+# SEARCH_BACKEND picks one; the default 'auto' chooses from the database URI.
+
+import logging
+import sqlite3
+import threading
+from collections import defaultdict
+from flask import current_app, has_app_context
+from sqlalchemy import event, select, text, table, column, case, func
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from app.models import db, Customer, Inventory
+
+logger = logging.getLogger(__name__)
+
+# Searchable model -> column holding the searched text
+SEARCHABLE = {
+    Customer: 'email',
+    Inventory: 'part_name',
+}
+
+NGRAM = 3
+
+
+def _escape_like(term):
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def _ngrams(value):
+    value = value.lower()
+    return {value[i:i + NGRAM] for i in range(len(value) - NGRAM + 1)}
+
+
+# ----- Backends -----
+
+class LikeBackend:
+    name = 'like'
+
+    # Exact matches first, then prefixes, then shortest values
+    def query(self, model, term, page, per_page, options=(), session=None):
+        attr = getattr(model, SEARCHABLE[model])
+        query = (
+            select(model)
+            .options(*options)
+            .where(attr.ilike(f'%{_escape_like(term)}%', escape='\\'))
+            .order_by(
+                case((func.lower(attr) == term.lower(), 0), (attr.ilike(f'{_escape_like(term)}%', escape='\\'), 1), else_=2),
+                func.length(attr),
+                model.id
+            )
+            .limit(per_page)
+            .offset((page - 1) * per_page)
+        )
+        return (session or db.session).execute(query).scalars().all()
+
+
+class FTS5Backend:
+    name = 'fts5'
+
+    def __init__(self):
+        self.like = LikeBackend()
+        self.warned = False
+
+    # Ranked by FTS5's bm25 (the rank column)
+    def query(self, model, term, page, per_page, options=(), session=None):
+        session = session or db.session
+        if len(term) < NGRAM:
+            return self.like.query(model, term, page, per_page, options, session)
+
+        fts = table(fts_table_name(model), column('rowid'), column('rank'))
+        query = (
+            select(model)
+            .options(*options)
+            .join(fts, fts.c.rowid == model.id)
+            .where(text(f'{fts.name} MATCH :match').bindparams(match='"' + term.replace('"', '""') + '"'))
+            .order_by(fts.c.rank, model.id)
+            .limit(per_page)
+            .offset((page - 1) * per_page)
+        )
+        try:
+            return session.execute(query).scalars().all()
+        except OperationalError:
+            # Database created before the search tables existed - run `flask db upgrade`
+            session.rollback()
+            if not self.warned:
+                logger.warning('FTS5 search table %s is missing, falling back to LIKE', fts.name)
+                self.warned = True
+            return self.like.query(model, term, page, per_page, options, session)
+
+
+class TrigramBackend:
+    name = 'trigram'
+
+    def __init__(self):
+        self.like = LikeBackend()
+
+    # The ILIKE is answered by the pg_trgm GIN index, ranked by similarity()
+    def query(self, model, term, page, per_page, options=(), session=None):
+        if len(term) < NGRAM:
+            return self.like.query(model, term, page, per_page, options, session)
+
+        attr = getattr(model, SEARCHABLE[model])
+        query = (
+            select(model)
+            .options(*options)
+            .where(attr.ilike(f'%{_escape_like(term)}%', escape='\\'))
+            .order_by(func.similarity(attr, term).desc(), model.id)
+            .limit(per_page)
+            .offset((page - 1) * per_page)
+        )
+        return (session or db.session).execute(query).scalars().all()
+
+
+# In-memory trigram -> ids postings for one model. Built from the database on
+# first use, then updated from committed sessions (see _after_commit).
+# Writes made by other processes aren't seen until the index is rebuilt, which
+# is why this is only the fallback.
+class NgramIndex:
+    def __init__(self, model):
+        self.model = model
+        self.lock = threading.Lock()
+        self.postings = defaultdict(set)
+        self.texts = {}
+        self.stale = True
+
+    def _add(self, id, value):
+        self.texts[id] = value
+        for gram in _ngrams(value):
+            self.postings[gram].add(id)
+
+    def _remove(self, id):
+        value = self.texts.pop(id, None)
+        if value is None:
+            return
+        for gram in _ngrams(value):
+            self.postings[gram].discard(id)
+
+    def rebuild(self, session=None):
+        attr = getattr(self.model, SEARCHABLE[self.model])
+        rows = (session or db.session).execute(select(self.model.id, attr)).all()
+        with self.lock:
+            self.postings.clear()
+            self.texts.clear()
+            for id, value in rows:
+                self._add(id, value)
+            self.stale = False
+
+    def apply(self, changes):
+        with self.lock:
+            for id, value in changes:
+                self._remove(id)
+                if value is not None:
+                    self._add(id, value)
+
+    # Ranked ids: exact match, then earliest match position, then shortest value
+    def search(self, term, session=None):
+        if self.stale:
+            self.rebuild(session)
+        needle = term.lower()
+        with self.lock:
+            grams = _ngrams(needle)
+            postings = sorted((self.postings.get(gram, set()) for gram in grams), key=len)
+            candidates = set.intersection(*postings) if postings else set()
+            matches = []
+            for id in candidates:
+                value = self.texts[id].lower()
+                position = value.find(needle)
+                if position != -1:
+                    matches.append((value != needle, position, len(value), id))
+        return [id for *_, id in sorted(matches)]
+
+
+class NgramBackend:
+    name = 'ngram'
+
+    def __init__(self):
+        self.like = LikeBackend()
+        self.indexes = {model: NgramIndex(model) for model in SEARCHABLE}
+
+    def query(self, model, term, page, per_page, options=(), session=None):
+        session = session or db.session
+        if len(term) < NGRAM:
+            return self.like.query(model, term, page, per_page, options, session)
+
+        ids = self.indexes[model].search(term, session)[(page - 1) * per_page:page * per_page]
+        if not ids:
+            return []
+        rows = session.execute(select(model).options(*options).where(model.id.in_(ids))).scalars().all()
+        by_id = {row.id: row for row in rows}
+        return [by_id[id] for id in ids if id in by_id]
+
+
+BACKENDS = {
+    'like': LikeBackend,
+    'fts5': FTS5Backend,
+    'trigram': TrigramBackend,
+    'ngram': NgramBackend,
+}
+
+
+def fts5_available():
+    if sqlite3.sqlite_version_info < (3, 34):  # trigram tokenizer
+        return False
+    conn = sqlite3.connect(':memory:')
+    try:
+        options = {row[0] for row in conn.execute('PRAGMA compile_options')}
+    finally:
+        conn.close()
+    return 'ENABLE_FTS5' in options
+
+
+def _auto_backend(database_uri):
+    backend = make_url(database_uri).get_backend_name()
+    if backend == 'sqlite' and fts5_available():
+        return 'fts5'
+    if backend == 'postgresql':
+        return 'trigram'
+    return 'ngram'
+
+
+class Search:
+    def init_app(self, app):
+        name = app.config.get('SEARCH_BACKEND', 'auto')
+        if name == 'auto':
+            name = _auto_backend(app.config['SQLALCHEMY_DATABASE_URI'])
+        app.extensions['search'] = BACKENDS[name]()
+
+    @property
+    def backend(self):
+        return current_app.extensions['search']
+
+    # One page of model rows matching term, best match first. session
+    # defaults to db.session (the async routes pass their own, see app/asgi.py)
+    def query(self, model, term, page=1, per_page=10, options=(), session=None):
+        return self.backend.query(model, term, page, per_page, options, session)
+
+    # Bulk INSERT/UPDATE/DELETE statements bypass the flush, so code issuing
+    # them on a searchable model calls this to have the ngram index rebuilt
+    # on its next search. (The fts5/trigram indexes are kept by the database.)
+    def invalidate(self, model):
+        if isinstance(self.backend, NgramBackend):
+            self.backend.indexes[model].stale = True
+
+
+search = Search()
+
+
+# ----- Database objects behind the fts5 / trigram backends -----
+
+def fts_table_name(model):
+    return f'{model.__tablename__}_search'
+
+
+def create_search_objects(conn, model):
+    tablename = model.__tablename__
+    name = SEARCHABLE[model]
+
+    if conn.dialect.name == 'sqlite' and fts5_available():
+        fts = fts_table_name(model)
+        conn.exec_driver_sql(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+            f"{name}, content='{tablename}', content_rowid='id', tokenize='trigram')"
+        )
+        conn.exec_driver_sql(
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {tablename} BEGIN "
+            f"INSERT INTO {fts}(rowid, {name}) VALUES (new.id, new.{name}); END"
+        )
+        conn.exec_driver_sql(
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {tablename} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {name}) VALUES ('delete', old.id, old.{name}); END"
+        )
+        conn.exec_driver_sql(
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {name} ON {tablename} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {name}) VALUES ('delete', old.id, old.{name}); "
+            f"INSERT INTO {fts}(rowid, {name}) VALUES (new.id, new.{name}); END"
+        )
+        conn.exec_driver_sql(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+    elif conn.dialect.name == 'postgresql':
+        conn.exec_driver_sql('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        conn.exec_driver_sql(
+            f'CREATE INDEX IF NOT EXISTS ix_{tablename}_{name}_trgm '
+            f'ON {tablename} USING gin ({name} gin_trgm_ops)'
+        )
+
+
+def drop_search_objects(conn, model):
+    if conn.dialect.name == 'sqlite':
+        conn.exec_driver_sql(f'DROP TABLE IF EXISTS {fts_table_name(model)}')
+
+
+# db.create_all() / db.drop_all() manage the search objects with their tables
+for _model in SEARCHABLE:
+    event.listen(_model.__table__, 'after_create', lambda target, conn, model=_model, **kw: create_search_objects(conn, model))
+    event.listen(_model.__table__, 'before_drop', lambda target, conn, model=_model, **kw: drop_search_objects(conn, model))
+
+
+# ----- Keeping the ngram index in sync -----
+
+def _ngram_backend():
+    if not has_app_context():
+        return None
+    backend = current_app.extensions.get('search')
+    return backend if isinstance(backend, NgramBackend) else None
+
+
+@event.listens_for(Session, 'after_flush')
+def _after_flush(session, flush_context):
+    if _ngram_backend() is None:
+        return
+    pending = session.info.setdefault('search_changes', defaultdict(list))
+    for obj in session.new | session.dirty:
+        if type(obj) in SEARCHABLE:
+            pending[type(obj)].append((obj.id, getattr(obj, SEARCHABLE[type(obj)])))
+    for obj in session.deleted:
+        if type(obj) in SEARCHABLE:
+            pending[type(obj)].append((obj.id, None))
+
+
+@event.listens_for(Session, 'after_commit')
+def _after_commit(session):
+    pending = session.info.pop('search_changes', None)
+    backend = _ngram_backend()
+    if backend is None or not pending:
+        return
+    for model, changes in pending.items():
+        backend.indexes[model].apply(changes)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _after_rollback(session):
+    session.info.pop('search_changes', None)
@@ -0,0 +1,198 @@
+# app/utils/bulk.py
+
+# Helpers for the /bulk create endpoints. A batch is validated in one
+# many=True schema load, duplicates are found with one IN query per chunk of
+# values (not one SELECT per row), and the valid rows go in with a single
+# executemany INSERT - all in one transaction. Every input row gets a result:
+#
+#   {"index": 0, "status": "created", "id": 17}
+#   {"index": 1, "status": "error", "errors": {"email": ["..."]}}
+
+import json
+from flask import request, jsonify, current_app
+from marshmallow import ValidationError
+from sqlalchemy import select, insert
+from sqlalchemy.exc import IntegrityError
+from app.models import db
+from app.utils import changes
+
+MAX_BULK_ROWS = 100000
+IN_CHUNK_SIZE = 500   # values per IN (...) - stays under every driver's parameter limit
+INSERT_CHUNK_SIZE = 5000
+
+
+def _chunks(values, size):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+# The request body as a list of raw rows: a JSON array (application/json), or
+# NDJSON (one object per line, any other content type). None when it's
+# neither. An NDJSON line that isn't valid JSON is kept as None, so it is
+# reported as an error for that row.
+def read_rows():
+    if request.is_json:
+        rows = request.get_json(silent=True)
+        return rows if isinstance(rows, list) else None
+
+    body = request.get_data(as_text=True)
+
+    rows = []
+    for line in body.splitlines():
+        if not line.strip():
+            continue
+        try:
+            rows.append(json.loads(line))
+        except ValueError:
+            rows.append(None)
+    return rows or None
+
+
+# Error response for a body that can't be processed, else None
+def rows_error(rows):
+    if not rows:
+        return jsonify({"error": "Expected a JSON array or NDJSON body."}), 400
+    limit = current_app.config.get('MAX_BULK_ROWS', MAX_BULK_ROWS)
+    if len(rows) > limit:
+        return jsonify({"error": f"At most {limit} rows per request."}), 413
+    return None
+
+
+# Values of column that already exist in the table
+def existing_values(column, values):
+    found = set()
+    for chunk in _chunks(list(set(values)), IN_CHUNK_SIZE):
+        found.update(db.session.execute(select(column).where(column.in_(chunk))).scalars())
+    return found
+
+
+# {unique value: new id} of the inserted rows
+def _insert_returning(model, unique_column, params):
+    ids = {}
+    for param_chunk in _chunks(params, INSERT_CHUNK_SIZE):
+        ids.update((value, id) for id, value in db.session.execute(
+            insert(model).returning(model.id, unique_column), param_chunk
+        ))
+    return ids
+
+
+def _insert_then_select(model, unique_column, params):
+    for param_chunk in _chunks(params, INSERT_CHUNK_SIZE):
+        db.session.execute(insert(model), param_chunk)
+    ids = {}
+    for value_chunk in _chunks([p[unique_column.key] for p in params], IN_CHUNK_SIZE):
+        ids.update(db.session.execute(
+            select(unique_column, model.id).where(unique_column.in_(value_chunk))
+        ).all())
+    return ids
+
+
+class BulkBatch:
+    def __init__(self, schema, rows):
+        self.size = len(rows)
+        self.errors = {}
+        self.ids = {}
+
+        try:
+            loaded = schema.load(rows, many=True)
+        except ValidationError as e:
+            loaded = e.valid_data
+            self.errors.update(e.messages)
+
+        self.rows = {
+            index: data for index, data in enumerate(loaded)
+            if index not in self.errors
+        }
+
+    def reject(self, index, errors):
+        self.rows.pop(index, None)
+        self.errors[index] = errors
+
+    # Rows whose value for column is already in the table, or repeats an
+    # earlier row in the same batch
+    def reject_duplicates(self, column, message):
+        key = column.key
+        existing = existing_values(column, [data[key] for data in self.rows.values()])
+        seen = set()
+        for index, data in list(self.rows.items()):
+            value = data[key]
+            if value in existing or value in seen:
+                self.reject(index, {key: [message]})
+            seen.add(value)
+
+    # Rows referencing a parent id that doesn't exist
+    def reject_missing(self, key, column, message):
+        found = existing_values(column, [data[key] for data in self.rows.values()])
+        for index, data in list(self.rows.items()):
+            if data[key] not in found:
+                self.reject(index, {key: [message]})
+
+    # Replaces key in every remaining row with fn(list of values) - one call
+    # for the batch (e.g. hashing passwords in the worker pool)
+    def map_column(self, key, fn):
+        rows = list(self.rows.values())
+        for data, value in zip(rows, fn([data[key] for data in rows])):
+            data[key] = value
+
+    # executemany INSERT ... RETURNING of the remaining rows, batched into
+    # multi-row INSERTs. RETURNING hands back only the rows this statement
+    # inserted, matched to their input rows by unique_column (the batch holds
+    # no repeated values - see reject_duplicates), so a row another request
+    # inserts meanwhile with the same value is never mistaken for ours.
+    # RETURNING in parameter order (sort_by_parameter_order) would do the
+    # same, but SQLite can only guarantee it by inserting row by row.
+    # Dialects without executemany RETURNING (MySQL) insert, then read the
+    # ids back by unique_column in the same transaction - on InnoDB's default
+    # REPEATABLE READ its snapshot, taken by reject_duplicates' SELECT, hides
+    # rows other requests commit meanwhile. The new ids go to the change feed.
+    def insert(self, model, unique_column, exclude=()):
+        key = unique_column.key
+        indexes = list(self.rows)
+        params = [
+            {name: value for name, value in self.rows[index].items() if name not in exclude}
+            for index in indexes
+        ]
+        if db.session.get_bind().dialect.insert_executemany_returning:
+            ids = _insert_returning(model, unique_column, params)
+        else:
+            ids = _insert_then_select(model, unique_column, params)
+        self.ids = {index: ids[p[key]] for index, p in zip(indexes, params)}
+        changes.record(model, self.ids.values(), changes.INSERT)
+        return self.ids
+
+    # Inserts the remaining rows, runs then(batch) for dependent rows, commits
+    # and returns the per-row results. A value another request inserts
+    # concurrently fails the whole transaction where the column is unique
+    # (emails, VINs); part names aren't, so such a part is simply added too.
+    def save(self, model, unique_column, exclude=(), then=None):
+        try:
+            if self.rows:
+                self.insert(model, unique_column, exclude)
+                if then is not None:
+                    then(self)
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return jsonify({"error": "Batch conflicts with a concurrent change, nothing was created."}), 409
+        return self.response()
+
+    # 201 when every row was created, 207 when only some were, 400 when none
+    def response(self):
+        results = []
+        for index in range(self.size):
+            if index in self.ids:
+                results.append({'index': index, 'status': 'created', 'id': self.ids[index]})
+            else:
+                results.append({'index': index, 'status': 'error', 'errors': self.errors.get(index, {})})
+
+        if not self.ids:
+            status = 400
+        elif self.errors:
+            status = 207
+        else:
+            status = 201
+        return jsonify({
+            'created': len(self.ids),
+            'failed': self.size - len(self.ids),
+            'results': results,
+        }), status
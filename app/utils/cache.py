@@ -0,0 +1,147 @@
+# app/utils/cache.py
+
+# Response cache for the list endpoints.
+#
+# Entries are keyed on the path, the normalized query string and the current
+# generation of every table the view reads from (its tags). Committing a write
+# to a table bumps that table's generation counter, so every cached response
+# built from the old data stops matching at once - invalidation is one
+# counter increment, however many entries exist. Old entries simply age out.
+#
+# Writes are detected at the engine level (every INSERT/UPDATE/DELETE sent to
+# the database, whether from an ORM flush or a bulk/Core statement) and the
+# bump happens once the session commits; a rollback discards them.
+
+import threading
+import time
+from functools import wraps
+from urllib.parse import urlencode
+from flask import request, current_app, has_app_context, make_response, g
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.extensions import cache
+
+
+class CacheStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def record(self, name):
+        with self.lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def as_dict(self):
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'hit_ratio': round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+stats = CacheStats()
+
+
+def _generation_key(tag):
+    return f'generation:{tag}'
+
+
+# Current generation of each tag. A missing counter (never written, or
+# evicted) starts from the clock, so it can't repeat an older generation.
+def generations(tags):
+    keys = [_generation_key(tag) for tag in tags]
+    values = cache.get_many(*keys)
+    if any(value is None for value in values):
+        for key, value in zip(keys, values):
+            if value is None:
+                cache.add(key, time.time_ns(), timeout=0)
+        values = cache.get_many(*keys)
+    return values
+
+
+# Flask-Caching doesn't wrap inc(), so this goes to the cachelib backend
+def bump_generations(tags):
+    for tag in tags:
+        cache.cache.inc(_generation_key(tag))
+        stats.record('invalidations')
+
+
+def cache_key(tags):
+    query = urlencode(sorted(request.args.items(multi=True)))
+    versions = ','.join(f'{tag}:{generation}' for tag, generation in zip(tags, generations(tags)))
+    return f'view:{request.path}?{query}#{versions}'
+
+
+# Caches successful, non-streamed responses of a view for `timeout` seconds.
+# tags are the table names the response is built from.
+def cached_view(timeout, tags):
+    tags = tuple(tags)
+
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            key = cache_key(tags)
+            cached = cache.get(key)
+            if cached is not None:
+                stats.record('hits')
+                body, status, mimetype = cached
+                response = current_app.response_class(body, status=status, mimetype=mimetype)
+                response.headers['X-Cache'] = 'HIT'
+                return response
+
+            stats.record('misses')
+            response = make_response(f(*args, **kwargs))
+            if response.status_code == 200 and not response.is_streamed:
+                cache.set(key, (response.get_data(), response.status_code, response.mimetype), timeout=timeout)
+            response.headers['X-Cache'] = 'MISS'
+            return response
+        return decorated
+    return decorator
+
+
+# ----- Write tracking -----
+# Tables written on a connection are collected in conn.info. When that
+# connection commits they move to the app context, and the generations are
+# bumped right after the session's commit has completed - bumping before the
+# data is visible would let a concurrent reader cache old rows under the new
+# generation. Writes committed outside a session (engine.begin()) are bumped
+# when the app context ends.
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is None or not (context.isinsert or context.isupdate or context.isdelete):
+        return
+    table = getattr(getattr(context.compiled, 'statement', None), 'table', None)
+    if table is not None:
+        conn.info.setdefault('cache_touched', set()).add(table.name)
+
+
+@event.listens_for(Engine, 'commit')
+def _commit(conn):
+    touched = conn.info.pop('cache_touched', None)
+    if touched and has_app_context():
+        g.setdefault('cache_pending', set()).update(touched)
+
+
+@event.listens_for(Engine, 'rollback')
+def _rollback(conn):
+    conn.info.pop('cache_touched', None)
+
+
+def bump_pending():
+    if not has_app_context():
+        return
+    pending = g.pop('cache_pending', None)
+    if pending:
+        bump_generations(sorted(pending))
+
+
+@event.listens_for(Session, 'after_commit')
+def _after_session_commit(session):
+    bump_pending()
@@ -0,0 +1,180 @@
+# app/utils/changes.py
+
+# The change feed. Every insert, update and delete of a customer, mechanic,
+# service ticket or inventory item appends a row to change_log (see
+# app/models.py) in the same transaction as the write, so a committed change
+# always has its entry and a rolled back one never does. GET /changes?since=
+# (app/blueprints/changes) hands them out in seq order, so clients sync what
+# changed instead of re-reading whole tables.
+#
+# A row counts as updated when one of its columns changes or when something
+# its representation includes does: a mechanic assigned to or removed from a
+# ticket updates both, a ticket part line updates the ticket and the part.
+# Each row gets one entry per transaction and operation - an update in the
+# transaction that inserted or deleted the row is left out.
+#
+# The entries come from
+#  - ORM flushes - the after_flush listener at the bottom
+#  - Core statements, which the session never sees: the bulk inserts
+#    (app/utils/bulk.py), mechanics assigned with Core, add-part and the
+#    parts_total updates in app/utils/totals.py call record() directly
+#
+# Rows loaded with plain SQL (flask db generate) are not logged; clients
+# resync after such a load. Readers rely on seq order being commit order, or
+# one that passed over a seq committing a moment later would never see it.
+# SQLite runs write transactions one at a time anyway; on Postgres a
+# transaction takes a transaction-level advisory lock before its first entry
+# and holds it to commit - concurrent writes still overlap up to that point.
+
+import threading
+from collections import defaultdict
+from datetime import datetime, timezone
+from itertools import chain
+from sqlalchemy import select, insert, delete, func, event, inspect
+from sqlalchemy.orm import Session
+from app.models import (db, Customer, Mechanic, Service_Ticket, Inventory, ServiceTicketInventory,
+                        MechanicServiceTicket, Change)
+
+INSERT, UPDATE, DELETE = 'insert', 'update', 'delete'
+
+TRACKED = {model: model.__tablename__ for model in (Customer, Mechanic, Service_Ticket, Inventory)}
+ENTITIES = tuple(TRACKED.values())
+
+CHANGE_LOG_LOCK = 0x6368616e67   # pg_advisory_xact_lock key, any constant no other lock uses
+
+
+def utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+# ----- Writing entries -----
+
+# Appends an entry per id to the transaction of session (default db.session)
+def record(model, ids, op=UPDATE, session=None):
+    session = session or db.session()
+    entity = TRACKED[model]
+    seen = session.info.setdefault('changes_seen', {})
+    now = utcnow()
+    rows = []
+    for row_id in ids:
+        previous = seen.get((entity, row_id))
+        if previous == op or (op == UPDATE and previous is not None):
+            continue
+        seen[(entity, row_id)] = op
+        rows.append({'entity': entity, 'row_id': row_id, 'op': op, 'changed_at': now})
+    if rows:
+        _serialize(session)
+        session.execute(insert(Change), rows)
+        session.info['changes_written'] = True
+
+
+# Makes the transactions writing entries commit one at a time, in seq order
+def _serialize(session):
+    if session.info.get('changes_locked'):
+        return
+    if session.get_bind().dialect.name == 'postgresql':
+        session.execute(select(func.pg_advisory_xact_lock(CHANGE_LOG_LOCK)))
+    session.info['changes_locked'] = True
+
+
+# Deletes the entries older than cutoff. Returns the number deleted. The
+# newest entry is always kept: it marks how far the log got, so latest_seq()
+# never goes backwards and a client behind the pruned entries gets a 410
+# even when everything older than cutoff was deleted.
+def prune(cutoff):
+    return db.session.execute(delete(Change).where(Change.changed_at < cutoff, Change.seq < latest_seq())).rowcount
+
+
+# ----- Reading -----
+
+def latest_seq():
+    return db.session.execute(select(func.max(Change.seq))).scalar() or 0
+
+
+def oldest_seq():
+    return db.session.execute(select(func.min(Change.seq))).scalar()
+
+
+# Wakes the requests waiting for changes in this process after a commit that
+# wrote some. A waiter passes the generation it last saw, so a commit landing
+# between its query and its wait isn't missed.
+class ChangeSignal:
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.generation = 0
+
+    def notify(self):
+        with self.condition:
+            self.generation += 1
+            self.condition.notify_all()
+
+    # Returns the current generation once it moves past seen, or after timeout
+    def wait(self, seen, timeout):
+        with self.condition:
+            self.condition.wait_for(lambda: self.generation != seen, timeout)
+            return self.generation
+
+
+signal = ChangeSignal()
+
+
+# ----- ORM writes -----
+
+# (added, removed) items of a relationship in this flush - everything still
+# in the collection when the owner is deleted
+def _collection_changes(obj, name, deleted):
+    history = inspect(obj).attrs[name].history
+    if deleted:
+        return (), history.non_added()
+    return history.added, history.deleted
+
+
+@event.listens_for(Session, 'after_flush')
+def _after_flush(session, flush_context):
+    # op -> model -> ids. Deletes come before updates, so a row deleted in
+    # this transaction gets no update entry.
+    entries = {op: defaultdict(list) for op in (INSERT, DELETE, UPDATE)}
+
+    for obj in chain(session.new, session.dirty, session.deleted):
+        model = type(obj)
+        deleted = obj in session.deleted
+        changed = deleted or obj in session.new or session.is_modified(obj)
+        if model in TRACKED:
+            if obj in session.new:
+                entries[INSERT][model].append(obj.id)
+            elif deleted:
+                entries[DELETE][model].append(obj.id)
+            elif changed:
+                entries[UPDATE][model].append(obj.id)
+
+        if model is ServiceTicketInventory and changed:
+            entries[UPDATE][Service_Ticket].append(obj.service_ticket_id)
+            entries[UPDATE][Inventory].append(obj.inventory_id)
+        elif model is MechanicServiceTicket and changed:
+            entries[UPDATE][Service_Ticket].append(obj.service_id)
+            entries[UPDATE][Mechanic].append(obj.mechanic_id)
+        elif model is Service_Ticket:
+            added, removed = _collection_changes(obj, 'mechanics', deleted)
+            entries[UPDATE][Mechanic].extend(mechanic.id for mechanic in chain(added, removed))
+        elif model is Mechanic:
+            added, removed = _collection_changes(obj, 'service_tickets', deleted)
+            entries[UPDATE][Service_Ticket].extend(ticket.id for ticket in chain(added, removed))
+
+    for op, models in entries.items():
+        for model, ids in models.items():
+            record(model, [row_id for row_id in ids if row_id is not None], op, session)
+
+
+@event.listens_for(Session, 'after_commit')
+def _after_commit(session):
+    session.info.pop('changes_seen', None)
+    session.info.pop('changes_locked', None)
+    if session.info.pop('changes_written', False):
+        signal.notify()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _after_rollback(session):
+    session.info.pop('changes_seen', None)
+    session.info.pop('changes_locked', None)
+    session.info.pop('changes_written', None)
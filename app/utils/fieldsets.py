@@ -0,0 +1,67 @@
+# app/utils/fieldsets.py
+
+# Sparse fieldsets for the GET endpoints: ?fields=id,name returns only those
+# fields. Both ends get narrower:
+#  - the SELECT loads only the requested columns (load_only, plus the primary
+#    key and whatever the route needs for itself, e.g. cursor keys), and
+#    relationships are only loaded when asked for
+#  - the response is dumped with a schema restricted to the fields (only=),
+#    built once per distinct field set and reused
+#
+# Unknown field names raise InvalidFields, answered with a 400 by the handler
+# registered in create_app.
+
+from functools import lru_cache
+from flask import request
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only, selectinload
+
+
+class InvalidFields(ValueError):
+    def __init__(self, names):
+        super().__init__(names)
+        self.names = sorted(names)
+
+
+# Field names from ?fields=, or None when the parameter is absent or empty
+def requested_fields(schema):
+    raw = request.args.get('fields', '')
+    names = {name.strip() for name in raw.split(',') if name.strip()}
+    if not names:
+        return None
+    unknown = names - set(schema.dump_fields)
+    if unknown:
+        raise InvalidFields(unknown)
+    return frozenset(names)
+
+
+# One restricted copy of the schema per field set - the number of distinct
+# sets is bounded by the schema's fields, and each copy keeps its compiled
+# dump function (see app/utils/fastdump.py)
+@lru_cache(maxsize=512)
+def _narrowed(schema, names):
+    return type(schema)(only=names, exclude=schema.exclude, many=schema.many)
+
+
+def _loader_options(model, schema, names, always):
+    mapper = inspect(model)
+    columns = [mapper.get_property_by_column(column).class_attribute for column in mapper.primary_key]
+    columns += list(always)
+    options = []
+    for name in sorted(names):
+        attribute = schema.fields[name].attribute or name
+        if attribute in mapper.relationships:
+            options.append(selectinload(mapper.relationships[attribute].class_attribute))
+        elif attribute in mapper.column_attrs:
+            columns.append(mapper.column_attrs[attribute].class_attribute)
+    return (load_only(*columns),) + tuple(options)
+
+
+# (schema, loader options) for the request. Without ?fields= that's the
+# schema itself and the route's usual options (default). always lists model
+# attributes the route reads besides the dumped fields.
+def fieldset(schema, model, always=(), default=()):
+    names = requested_fields(schema)
+    if names is None:
+        return schema, tuple(default)
+    return _narrowed(schema, names), _loader_options(model, schema, names, always)
@@ -0,0 +1,225 @@
+# app/utils/metrics.py
+
+# Opt-in request instrumentation (METRICS_ENABLED). For every request it
+# records
+#  - wall time, from before_request to after_request
+#  - SQL statement count and time spent in the database (cursor events)
+#  - serialization time: schema dumps (FastDumpMixin) and JSON encoding
+#  - response cache hit/miss (the X-Cache header set by cached_view)
+#
+# and sends them back as a Server-Timing header (visible in the browser's
+# network tab), e.g.
+#
+#   Server-Timing: app;dur=12.4, db;dur=8.1;desc="3 queries", serialize;dur=2.0, cache;desc="MISS"
+#
+# They're also aggregated per blueprint into histograms served by GET /metrics
+# in the Prometheus text format. The numbers are per process - with several
+# gunicorn workers each scrape sees one worker.
+#
+# Disabled (the default) nothing is registered: no hooks, no engine events, no
+# route. Streamed responses are measured up to the first byte.
+
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from flask import g, has_app_context, request, current_app
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from flask.json.provider import DefaultJSONProvider
+from app.extensions import limiter
+from app.utils import cache as response_cache
+
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class RequestTimings:
+    __slots__ = ('start', 'db_time', 'db_count', 'serialize_time', 'serializing')
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.db_time = 0.0
+        self.db_count = 0
+        self.serialize_time = 0.0
+        self.serializing = False
+
+    # Nested dumps (and the JSON encoding of a dump) are counted once
+    @contextmanager
+    def serialize(self):
+        if self.serializing:
+            yield
+            return
+        self.serializing = True
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.serialize_time += time.perf_counter() - start
+            self.serializing = False
+
+
+# The current request's timings, or None when metrics are off
+def request_timings():
+    if not has_app_context():
+        return None
+    return g.get('request_timings')
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)   # last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = defaultdict(int)   # (blueprint, method, status) -> count
+        self.cache = defaultdict(int)      # (blueprint, result) -> count
+        self.histograms = {
+            'http_request_duration_seconds': ('Request wall time', DURATION_BUCKETS, {}),
+            'http_request_db_seconds': ('Time spent executing SQL per request', DURATION_BUCKETS, {}),
+            'http_request_db_queries': ('SQL statements per request', QUERY_BUCKETS, {}),
+            'http_request_serialize_seconds': ('Time spent serializing the response', DURATION_BUCKETS, {}),
+        }
+
+    def record(self, blueprint, method, status, cache_result, timings, duration):
+        values = {
+            'http_request_duration_seconds': duration,
+            'http_request_db_seconds': timings.db_time,
+            'http_request_db_queries': timings.db_count,
+            'http_request_serialize_seconds': timings.serialize_time,
+        }
+        with self.lock:
+            self.requests[(blueprint, method, status)] += 1
+            if cache_result:
+                self.cache[(blueprint, cache_result)] += 1
+            for name, value in values.items():
+                _, buckets, series = self.histograms[name]
+                if blueprint not in series:
+                    series[blueprint] = Histogram(buckets)
+                series[blueprint].observe(value)
+
+    def render(self):
+        lines = []
+        with self.lock:
+            lines += ['# HELP http_requests_total Requests handled', '# TYPE http_requests_total counter']
+            for (blueprint, method, status), count in sorted(self.requests.items()):
+                lines.append(f'http_requests_total{{blueprint="{blueprint}",method="{method}",status="{status}"}} {count}')
+
+            for name, (help, buckets, series) in self.histograms.items():
+                lines += [f'# HELP {name} {help}', f'# TYPE {name} histogram']
+                for blueprint, histogram in sorted(series.items()):
+                    cumulative = 0
+                    for bound, count in zip(buckets + ('+Inf',), histogram.counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{{blueprint="{blueprint}",le="{bound}"}} {cumulative}')
+                    lines.append(f'{name}_sum{{blueprint="{blueprint}"}} {histogram.sum:.6f}')
+                    lines.append(f'{name}_count{{blueprint="{blueprint}"}} {histogram.count}')
+
+            lines += ['# HELP http_request_cache_total Cached endpoint responses by result', '# TYPE http_request_cache_total counter']
+            for (blueprint, result), count in sorted(self.cache.items()):
+                lines.append(f'http_request_cache_total{{blueprint="{blueprint}",result="{result}"}} {count}')
+
+        # Process-wide response cache counters (same as GET /cache/stats)
+        cache_stats = response_cache.stats.as_dict()
+        for name in ('hits', 'misses', 'invalidations'):
+            lines += [
+                f'# HELP response_cache_{name}_total Response cache {name}',
+                f'# TYPE response_cache_{name}_total counter',
+                f'response_cache_{name}_total {cache_stats[name]}',
+            ]
+        lines += [
+            '# HELP response_cache_hit_ratio Response cache hits / lookups',
+            '# TYPE response_cache_hit_ratio gauge',
+            f"response_cache_hit_ratio {cache_stats['hit_ratio']}",
+        ]
+        return '\n'.join(lines) + '\n'
+
+
+# ----- SQL timing -----
+# Engine-wide listeners, added the first time an app enables metrics. Outside
+# an instrumented request they return straight away.
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if request_timings() is not None:
+        conn.info['metrics_started'] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timings = request_timings()
+    started = conn.info.pop('metrics_started', None)
+    if timings is not None and started is not None:
+        timings.db_time += time.perf_counter() - started
+        timings.db_count += 1
+
+
+def _listen_to_engines():
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+# JSON encoding counts as serialization
+class TimedJSONProvider(DefaultJSONProvider):
+    def dumps(self, obj, **kwargs):
+        timings = request_timings()
+        if timings is None:
+            return super().dumps(obj, **kwargs)
+        with timings.serialize():
+            return super().dumps(obj, **kwargs)
+
+
+def _server_timing(timings, duration, cache_result):
+    parts = [
+        f'app;dur={duration * 1000:.1f}',
+        f'db;dur={timings.db_time * 1000:.1f};desc="{timings.db_count} queries"',
+        f'serialize;dur={timings.serialize_time * 1000:.1f}',
+    ]
+    if cache_result:
+        parts.append(f'cache;desc="{cache_result}"')
+    return ', '.join(parts)
+
+
+class Metrics:
+    def init_app(self, app):
+        if not app.config.get('METRICS_ENABLED'):
+            return
+
+        registry = app.extensions['metrics'] = Registry()
+        _listen_to_engines()
+        app.json = TimedJSONProvider(app)
+
+        @app.before_request
+        def start_request_timings():
+            g.request_timings = RequestTimings()
+
+        @app.after_request
+        def record_request_timings(response):
+            timings = g.pop('request_timings', None)
+            if timings is None:
+                return response
+            duration = time.perf_counter() - timings.start
+            cache_result = response.headers.get('X-Cache')
+            registry.record(request.blueprint or 'app', request.method, response.status_code, cache_result, timings, duration)
+            response.headers['Server-Timing'] = _server_timing(timings, duration, cache_result)
+            return response
+
+        # Prometheus scrape endpoint
+        @limiter.exempt
+        def metrics_view():
+            return current_app.response_class(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+        app.add_url_rule('/metrics', 'metrics', metrics_view, methods=['GET'])
+
+
+metrics = Metrics()
@@ -0,0 +1,140 @@
+# app/utils/pagination.py
+
+# Helpers shared by the list endpoints:
+#  - paginate: offset pagination with a hard server-side page size cap
+#  - keyset pagination - pages are found with "WHERE key > last key seen"
+#    instead of OFFSET, so page 10,000 costs the same as page 1 and no
+#    COUNT(*) query is needed
+#  - streaming - the whole table as a JSON array, produced in chunks so
+#    memory stays flat regardless of table size
+
+import base64
+import json
+from datetime import date, datetime
+from flask import request, jsonify, current_app, Response, stream_with_context
+from sqlalchemy import and_, or_
+from app.models import db
+
+DEFAULT_PER_PAGE = 10
+MAX_PER_PAGE = 100
+STREAM_CHUNK_SIZE = 1000
+
+
+def _per_page():
+    default = current_app.config.get('DEFAULT_PER_PAGE', DEFAULT_PER_PAGE)
+    maximum = current_app.config.get('MAX_PER_PAGE', MAX_PER_PAGE)
+    return min(max(request.args.get('per_page', default, type=int), 1), maximum)
+
+
+# (page, per_page) from the query string. Missing or invalid values fall back
+# to the first page of DEFAULT_PER_PAGE items and per_page is capped at
+# MAX_PER_PAGE, so a request can never pull the whole table into memory.
+def page_params():
+    return max(request.args.get('page', 1, type=int), 1), _per_page()
+
+
+# Offset pagination from ?page=&per_page=
+def paginate(query):
+    page, per_page = page_params()
+    return db.paginate(query, page=page, per_page=per_page, error_out=False)
+
+
+# True when the client asked for the streaming mode (?stream=true)
+def is_streaming():
+    return request.args.get('stream', '').lower() in ('1', 'true', 'yes')
+
+
+# Streams every row of the query as one JSON array. Rows are fetched
+# STREAM_CHUNK_SIZE at a time (yield_per) and each chunk is serialized and
+# sent before the next one is loaded.
+def stream_response(query, schema):
+    chunk_size = current_app.config.get('STREAM_CHUNK_SIZE', STREAM_CHUNK_SIZE)
+    
+    def generate():
+        yield '['
+        separator = ''
+        result = db.session.execute(query.execution_options(yield_per=chunk_size))
+        for rows in result.scalars().partitions():
+            chunk = current_app.json.dumps(schema.dump(rows, many=True), separators=(',', ':'))[1:-1]
+            if chunk:
+                yield separator + chunk
+                separator = ','
+        yield ']'
+    
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+# The cursor is the key of the last row on the page, opaque to clients
+def encode_cursor(values):
+    values = [v.isoformat() if isinstance(v, (date, datetime)) else v for v in values]
+    raw = json.dumps(values, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode()
+
+
+def decode_cursor(cursor, key_columns):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        raise InvalidCursor(cursor)
+    if not isinstance(values, list) or len(values) != len(key_columns):
+        raise InvalidCursor(cursor)
+    
+    decoded = []
+    for column, value in zip(key_columns, values):
+        try:
+            python_type = column.type.python_type
+            if python_type in (date, datetime):
+                value = python_type.fromisoformat(value)
+            elif not isinstance(value, python_type):
+                raise TypeError(value)
+        except (ValueError, TypeError):
+            raise InvalidCursor(cursor)
+        decoded.append(value)
+    return decoded
+
+
+# (a, b) > (x, y)  ->  a >= x AND (a > x OR b > y), written out so it works
+# on every backend (row-value comparison isn't portable). The leading a >= x
+# lets the database seek into the index instead of filtering from the start.
+def _after(key_columns, values):
+    column, value = key_columns[0], values[0]
+    if len(key_columns) == 1:
+        return column > value
+    return and_(column >= value, or_(column > value, _after(key_columns[1:], values[1:])))
+
+
+# Returns one page of rows ordered by key_columns plus the cursor for the next
+# page (None on the last page). Fetches per_page + 1 rows to detect the end.
+def keyset_page(query, key_columns, cursor, per_page):
+    if cursor:
+        query = query.where(_after(key_columns, decode_cursor(cursor, key_columns)))
+    
+    query = query.order_by(*key_columns).limit(per_page + 1)
+    rows = db.session.execute(query).scalars().all()
+    
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        next_cursor = encode_cursor([getattr(rows[-1], column.key) for column in key_columns])
+    return rows, next_cursor
+
+
+# Response for the opt-in ?cursor= mode of the list endpoints. An empty
+# cursor (?cursor=) starts from the first page.
+def keyset_response(query, key_columns, schema):
+    try:
+        rows, next_cursor = keyset_page(
+            query,
+            key_columns,
+            request.args.get('cursor'),
+            _per_page()
+        )
+    except InvalidCursor:
+        return jsonify({"error": "Invalid cursor."}), 400
+    
+    return jsonify({'items': schema.dump(rows, many=True), 'next_cursor': next_cursor}), 200
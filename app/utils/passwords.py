@@ -0,0 +1,178 @@
+# app/utils/passwords.py
+
+# Password hashing with scrypt (hashlib, no extra dependency).
+#
+# A hash costs tens of milliseconds of CPU by design. Doing that on the request
+# thread means a login burst ties up every worker thread in hashing, so the
+# work goes to a small process pool instead: PASSWORD_HASH_WORKERS processes
+# (default: CPU count), with at most PASSWORD_HASH_QUEUE calls waiting for
+# one. When the queue stays full, or a hash isn't done, for
+# PASSWORD_HASH_TIMEOUT seconds the caller gets PasswordHasherBusy (the
+# routes answer 503) rather than piling up.
+# PASSWORD_HASH_WORKERS = 0 hashes inline (tests).
+#
+# Stored format:  scrypt$<n>$<r>$<p>$<salt b64>$<hash b64>
+# Anything else is a legacy plaintext password; verify_password still accepts
+# it and reports that it needs rehashing, which the login routes do.
+
+import base64
+import hashlib
+import hmac
+import os
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from flask import current_app
+
+SCHEME = 'scrypt'
+SCRYPT_N = 2 ** 14   # CPU/memory cost - PASSWORD_SCRYPT_N
+SCRYPT_R = 8
+SCRYPT_P = 1
+SALT_BYTES = 16
+KEY_BYTES = 32
+HASH_TIMEOUT = 10
+MAP_CHUNK_SIZE = 64
+
+
+class PasswordHasherBusy(Exception):
+    pass
+
+
+def _b64(data):
+    return base64.b64encode(data).decode('ascii')
+
+
+# Runs in the pool processes
+def _scrypt(password, salt, n, r, p):
+    return hashlib.scrypt(
+        password.encode('utf-8'), salt=salt, n=n, r=r, p=p,
+        maxmem=256 * r * n, dklen=KEY_BYTES
+    )
+
+
+def _hash(password, n):
+    salt = os.urandom(SALT_BYTES)
+    key = _scrypt(password, salt, n, SCRYPT_R, SCRYPT_P)
+    return f'{SCHEME}${n}${SCRYPT_R}${SCRYPT_P}${_b64(salt)}${_b64(key)}'
+
+
+# Runs in the pool processes - one chunk of PasswordHasher.map
+def _starmap(fn, calls):
+    return [fn(*args) for args in calls]
+
+
+# (matches, needs_rehash). A corrupt scrypt hash (bad base64 or parameters)
+# matches nothing, like a wrong password.
+def _verify(stored, password, n):
+    parts = stored.split('$')
+    if len(parts) != 6 or parts[0] != SCHEME:
+        # Legacy plaintext row
+        return hmac.compare_digest(stored.encode('utf-8'), password.encode('utf-8')), True
+    _, stored_n, r, p, salt, key = parts
+    try:
+        candidate = _scrypt(password, base64.b64decode(salt, validate=True), int(stored_n), int(r), int(p))
+        matches = hmac.compare_digest(candidate, base64.b64decode(key, validate=True))
+    except (ValueError, OverflowError):
+        return False, False
+    return matches, int(stored_n) != n
+
+
+class PasswordHasher:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.executor = None
+        self.pid = None
+        self.slots = None
+
+    # One pool per process - recreated after a fork (gunicorn --preload)
+    def _pool(self, workers, queue):
+        with self.lock:
+            if self.executor is None or self.pid != os.getpid():
+                self.executor = ProcessPoolExecutor(
+                    max_workers=workers, mp_context=multiprocessing.get_context('spawn')
+                )
+                self.pid = os.getpid()
+                self.slots = threading.BoundedSemaphore(workers + queue)
+            return self.executor, self.slots
+
+    # Submits fn(*args) once a slot is free. The slot is held until the call
+    # has finished in the pool - not just until the caller stops waiting - so
+    # calls that timed out still count against the bound while they run.
+    def _submit(self, executor, slots, timeout, fn, *args):
+        if not slots.acquire(timeout=timeout):
+            raise PasswordHasherBusy()
+        try:
+            future = executor.submit(fn, *args)
+        except BaseException:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: slots.release())
+        return future
+
+    def _result(self, future, timeout):
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            future.cancel()   # drops it if it hasn't started yet
+            raise PasswordHasherBusy()
+
+    def run(self, fn, *args):
+        config = current_app.config
+        workers = config.get('PASSWORD_HASH_WORKERS', os.cpu_count() or 1)
+        if not workers:
+            return fn(*args)
+
+        executor, slots = self._pool(workers, config.get('PASSWORD_HASH_QUEUE', workers * 4))
+        timeout = config.get('PASSWORD_HASH_TIMEOUT', HASH_TIMEOUT)
+        return self._result(self._submit(executor, slots, timeout, fn, *args), timeout)
+
+    # Many hashes at once (bulk create) - one pool round trip, and one slot,
+    # per chunk of MAP_CHUNK_SIZE calls
+    def map(self, fn, *iterables):
+        config = current_app.config
+        workers = config.get('PASSWORD_HASH_WORKERS', os.cpu_count() or 1)
+        if not workers:
+            return list(map(fn, *iterables))
+
+        executor, slots = self._pool(workers, config.get('PASSWORD_HASH_QUEUE', workers * 4))
+        timeout = config.get('PASSWORD_HASH_TIMEOUT', HASH_TIMEOUT)
+        calls = list(zip(*iterables))
+        futures = []
+        try:
+            for start in range(0, len(calls), MAP_CHUNK_SIZE):
+                futures.append(self._submit(executor, slots, timeout, _starmap, fn, calls[start:start + MAP_CHUNK_SIZE]))
+        except PasswordHasherBusy:
+            for future in futures:
+                future.cancel()
+            raise
+        # No timeout on the results - the batch's later chunks queue behind its
+        # earlier ones, and the slots already bound the work in flight
+        return [result for future in futures for result in future.result()]
+
+    def shutdown(self):
+        with self.lock:
+            if self.executor is not None and self.pid == os.getpid():
+                self.executor.shutdown()
+            self.executor = None
+
+
+hasher = PasswordHasher()
+
+
+def _cost():
+    return current_app.config.get('PASSWORD_SCRYPT_N', SCRYPT_N)
+
+
+def hash_password(password):
+    return hasher.run(_hash, password, _cost())
+
+
+def hash_passwords(passwords):
+    passwords = list(passwords)
+    return hasher.map(_hash, passwords, [_cost()] * len(passwords))
+
+
+# (matches, needs_rehash) - needs_rehash is True for legacy plaintext rows and
+# hashes made with a different cost
+def verify_password(stored, password):
+    return hasher.run(_verify, stored, password, _cost())
@@ -0,0 +1,377 @@
+# app/utils/rollups.py
+
+# Keeping the report rollup tables (report_daily_revenue, report_part_usage,
+# report_mechanic_workload - see app/models.py) in step with the tickets.
+#
+# Every change is a delta - "tickets + 1", "revenue + 12.5". A transaction's
+# deltas are collected in its session and saved as one rollups.apply job
+# (app/jobs.py), committed with the write itself, so the request doesn't
+# wait on the hot rollup rows. The worker adds the deltas with UPDATEs and
+# marks the job done in one transaction, which rolls back if the job was
+# requeued meanwhile, so each is applied exactly once, and concurrent
+# workers add to the counters instead of overwriting each other. A
+# rollup row that doesn't exist yet is first inserted as zeros (INSERT ... ON
+# CONFLICT DO NOTHING, INSERT IGNORE on MySQL). Reports trail the writes by
+# the worker's delay.
+#
+# The deltas come from
+#  - ORM flushes: new tickets (with their mechanics), mechanics added to or
+#    removed from a ticket through either side of the relationship, deleted
+#    mechanics, ticket part lines - the after_flush listener at the bottom
+#  - Core statements, which the session never sees: bulk ticket creation,
+#    PUT /service_tickets/<id>, add-part, and the parts_total updates in
+#    app/utils/totals.py call the functions below directly
+#
+# A ticket's service_date is never changed after it is created. After
+# loading data with plain INSERTs or editing rows by hand, run
+# `flask --app flask_app reports rebuild`.
+
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from itertools import chain
+from sqlalchemy import select, insert, update, delete, func, bindparam, event, inspect, Date, Float
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import FunctionElement
+from app.models import (db, Service_Ticket, Mechanic, ServiceTicketInventory, service_mechanic,
+                        DailyRevenue, PartUsage, MechanicWorkload, Job)
+from app.jobs import task, enqueue
+
+
+# Monday of the day's week
+def week_of(day):
+    return day - timedelta(days=day.weekday())
+
+
+# week_of in SQL
+class week_start(FunctionElement):
+    type = Date()
+    inherit_cache = True
+
+
+@compiles(week_start, 'sqlite')
+def _week_start_sqlite(element, compiler, **kw):
+    # On to Sunday (a Sunday stays put), then back to that week's Monday
+    return f"date({compiler.process(element.clauses, **kw)}, 'weekday 0', '-6 days')"
+
+
+@compiles(week_start, 'postgresql')
+def _week_start_postgresql(element, compiler, **kw):
+    return f"CAST(date_trunc('week', {compiler.process(element.clauses, **kw)}) AS DATE)"
+
+
+@compiles(week_start)
+def _week_start_mysql(element, compiler, **kw):
+    day = compiler.process(element.clauses, **kw)
+    return f'DATE_SUB({day}, INTERVAL WEEKDAY({day}) DAY)'
+
+
+# ----- The aggregates over the source tables -----
+# What each rollup holds, computed the slow way. rebuild() stores them.
+
+def revenue_query():
+    return (
+        select(
+            Service_Ticket.service_date.label('day'),
+            func.count().label('tickets'),
+            func.round(func.sum(Service_Ticket.parts_total), 2).label('revenue')
+        )
+        .group_by(Service_Ticket.service_date)
+    )
+
+
+def part_usage_query():
+    return (
+        select(
+            ServiceTicketInventory.inventory_id,
+            func.sum(ServiceTicketInventory.quantity).label('quantity'),
+            func.count().label('lines')
+        )
+        .group_by(ServiceTicketInventory.inventory_id)
+    )
+
+
+def workload_query():
+    week = week_start(Service_Ticket.service_date)
+    return (
+        select(service_mechanic.c.mechanic_id, week.label('week'), func.count().label('tickets'))
+        .join(Service_Ticket, Service_Ticket.id == service_mechanic.c.ticket_id)
+        .group_by(service_mechanic.c.mechanic_id, week)
+    )
+
+
+AGGREGATES = {
+    DailyRevenue: revenue_query,
+    PartUsage: part_usage_query,
+    MechanicWorkload: workload_query,
+}
+
+
+# Replaces every rollup with the aggregate over the source tables, and drops
+# the queued (or failed) delta jobs that the new numbers already include.
+# Returns {table name: rows}.
+def rebuild(executor=None):
+    executor = executor or db.session
+    executor.execute(delete(Job.__table__).where(
+        Job.task == 'rollups.apply', Job.status.in_(('queued', 'failed'))
+    ))
+    counts = {}
+    for model, query in AGGREGATES.items():
+        table = model.__table__
+        query = query()
+        executor.execute(delete(table))
+        executor.execute(insert(table).from_select([column.name for column in query.selected_columns], query))
+        counts[table.name] = executor.execute(select(func.count()).select_from(table)).scalar()
+    return counts
+
+
+# ----- Applying deltas -----
+
+def _dialect(executor):
+    return executor.dialect if hasattr(executor, 'dialect') else executor.get_bind().dialect
+
+
+def _insert_missing(table, dialect):
+    if dialect.name == 'sqlite':
+        return sqlite.insert(table).on_conflict_do_nothing()
+    if dialect.name == 'postgresql':
+        return postgresql.insert(table).on_conflict_do_nothing()
+    return insert(table).prefix_with('IGNORE')
+
+
+# Adds {primary key tuple: {column: delta}} to the model's rows, with one
+# executemany INSERT for missing rows and one executemany UPDATE. Keys are
+# visited in order, so two transactions can't lock the same rows in opposite
+# orders.
+def _apply(executor, model, deltas):
+    deltas = {key: changes for key, changes in deltas.items() if any(changes.values())}
+    if not deltas:
+        return
+    table = model.__table__
+    keys = [column.name for column in table.primary_key]
+    counters = sorted({name for changes in deltas.values() for name in changes})
+    ordered = sorted(deltas)
+
+    executor.execute(_insert_missing(table, _dialect(executor)), [dict(zip(keys, key)) for key in ordered])
+
+    values = {}
+    for name in counters:
+        value = table.c[name] + bindparam(f'delta_{name}')
+        values[name] = func.round(value, 2) if isinstance(table.c[name].type, Float) else value
+    executor.execute(
+        update(table)
+        .where(*(table.c[name] == bindparam(f'key_{name}') for name in keys))
+        .values(values),
+        [
+            {
+                **{f'key_{name}': value for name, value in zip(keys, key)},
+                **{f'delta_{name}': deltas[key].get(name, 0) for name in counters},
+            }
+            for key in ordered
+        ]
+    )
+
+
+# ----- Collecting deltas -----
+# session.info['rollup_deltas'] holds {model: {key: Counter}} for the open
+# transaction, and session.info['rollup_job'] the job that carries them.
+
+def _merge(session, model, deltas):
+    pending = session.info.setdefault('rollup_deltas', {}).setdefault(model, defaultdict(Counter))
+    for key, changes in deltas.items():
+        pending[key].update(changes)
+    session.info['rollup_changed'] = True
+
+
+def _encode(value):
+    return value.isoformat() if isinstance(value, date) else value
+
+
+# Writes the collected deltas into the transaction's job, adding it on first
+# use. Never during a flush - there the after_flush_postexec hook calls it.
+def _save_job(session):
+    if not session.info.pop('rollup_changed', False):
+        return
+    payload = {
+        model.__tablename__: [[[_encode(part) for part in key], dict(changes)] for key, changes in deltas.items()]
+        for model, deltas in session.info['rollup_deltas'].items()
+    }
+    job = session.info.get('rollup_job')
+    if job is None:
+        session.info['rollup_job'] = enqueue('rollups.apply', payload, session=session)
+    else:
+        job.payload = payload
+
+
+def _record(model, deltas):
+    session = db.session()
+    _merge(session, model, deltas)
+    _save_job(session)
+
+
+# New tickets (sign=-1: deleted ones) on the given service dates
+def add_tickets(service_dates, sign=1):
+    counts = Counter(service_dates)
+    _record(DailyRevenue, {(day,): {'tickets': sign * n} for day, n in counts.items()})
+
+
+# Mechanics assigned to tickets (sign=-1: unassigned), as
+# (mechanic id, ticket's service date) pairs
+def _assignment_deltas(pairs, sign):
+    counts = Counter((mechanic_id, week_of(day)) for mechanic_id, day in pairs)
+    return {key: {'tickets': sign * n} for key, n in counts.items()}
+
+
+def add_assignments(pairs, sign=1):
+    _record(MechanicWorkload, _assignment_deltas(pairs, sign))
+
+
+# quantity more units of the part on tickets, in lines new ticket lines
+def add_part_usage(inventory_id, quantity, lines=0):
+    _record(PartUsage, {(inventory_id,): {'quantity': quantity, 'lines': lines}})
+
+
+# The ticket's parts_total grew by amount (see add_to_parts_total)
+def add_ticket_revenue(ticket_id, amount):
+    ticket = db.session.get(Service_Ticket, ticket_id)
+    if ticket is not None:
+        _record(DailyRevenue, {(ticket.service_date,): {'revenue': amount}})
+
+
+# A part's price moved - must run before reprice_part updates the tickets.
+# Each day gains exactly what its tickets' parts_total will, rounding included.
+def reprice_revenue(inventory_id, old_price, new_price):
+    if old_price == new_price:
+        return
+    change = func.round(
+        Service_Ticket.parts_total + ServiceTicketInventory.quantity * (new_price - old_price), 2
+    ) - Service_Ticket.parts_total
+    rows = db.session.execute(
+        select(Service_Ticket.service_date, func.sum(change))
+        .join(ServiceTicketInventory, ServiceTicketInventory.service_ticket_id == Service_Ticket.id)
+        .where(ServiceTicketInventory.inventory_id == inventory_id)
+        .group_by(Service_Ticket.service_date)
+    ).all()
+    _record(DailyRevenue, {(day,): {'revenue': amount} for day, amount in rows})
+
+
+# ----- The job -----
+
+def _decode(model, key):
+    columns = model.__table__.primary_key.columns
+    return tuple(
+        date.fromisoformat(part) if isinstance(column.type, Date) else part
+        for column, part in zip(columns, key)
+    )
+
+
+@task('rollups.apply')
+def apply_deltas(payload):
+    for model in AGGREGATES:
+        rows = payload.get(model.__tablename__, [])
+        _apply(db.session, model, {_decode(model, key): changes for key, changes in rows})
+
+
+# ----- ORM changes -----
+
+def _loaded(obj, name):
+    return inspect(obj).dict.get(name)
+
+
+# (added, removed) items of a relationship in this flush - everything still
+# in the collection when the owner is deleted
+def _collection_changes(obj, name, deleted):
+    history = inspect(obj).attrs[name].history
+    if deleted:
+        return (), history.non_added()
+    return history.added, history.deleted
+
+
+# (old, new) of a changed column, None when unchanged
+def _column_change(obj, name):
+    history = inspect(obj).attrs[name].history
+    if not history.has_changes():
+        return None
+    return (history.deleted[0] if history.deleted else None) or 0, (history.added[0] if history.added else None) or 0
+
+
+def _ticket_dates(session, tickets):
+    dates = {ticket: _loaded(ticket, 'service_date') for ticket in tickets}
+    missing = {_loaded(ticket, 'id'): ticket for ticket, day in dates.items() if day is None}
+    if missing:
+        rows = session.execute(
+            select(Service_Ticket.id, Service_Ticket.service_date).where(Service_Ticket.id.in_(missing))
+        ).all()
+        dates.update({missing[id]: day for id, day in rows})
+    return dates
+
+
+@event.listens_for(Session, 'after_flush')
+def _after_flush(session, flush_context):
+    revenue = defaultdict(Counter)
+    usage = defaultdict(Counter)
+    assigned, unassigned = set(), set()   # (ticket, mechanic) - a pair seen from both sides counts once
+
+    for obj in session.new:
+        if isinstance(obj, Service_Ticket):
+            revenue[(obj.service_date,)].update(tickets=1, revenue=_loaded(obj, 'parts_total') or 0)
+        elif isinstance(obj, ServiceTicketInventory):
+            usage[(obj.inventory_id,)].update(quantity=obj.quantity, lines=1)
+
+    for obj in session.dirty:
+        if isinstance(obj, Service_Ticket):
+            change = _column_change(obj, 'parts_total')
+            if change:
+                revenue[(obj.service_date,)].update(revenue=change[1] - change[0])
+        elif isinstance(obj, ServiceTicketInventory):
+            change = _column_change(obj, 'quantity')
+            if change:
+                usage[(obj.inventory_id,)].update(quantity=change[1] - change[0])
+
+    for obj in session.deleted:
+        if isinstance(obj, Service_Ticket):
+            revenue[(obj.service_date,)].update(tickets=-1, revenue=-(obj.parts_total or 0))
+        elif isinstance(obj, ServiceTicketInventory):
+            usage[(obj.inventory_id,)].update(quantity=-obj.quantity, lines=-1)
+
+    for obj in chain(session.new, session.dirty, session.deleted):
+        deleted = obj in session.deleted
+        if isinstance(obj, Service_Ticket):
+            added, removed = _collection_changes(obj, 'mechanics', deleted)
+            assigned.update((obj, mechanic) for mechanic in added)
+            unassigned.update((obj, mechanic) for mechanic in removed)
+        elif isinstance(obj, Mechanic):
+            added, removed = _collection_changes(obj, 'service_tickets', deleted)
+            assigned.update((ticket, obj) for ticket in added)
+            unassigned.update((ticket, obj) for ticket in removed)
+
+    if revenue:
+        _merge(session, DailyRevenue, revenue)
+    if usage:
+        _merge(session, PartUsage, usage)
+    if assigned or unassigned:
+        dates = _ticket_dates(session, {ticket for ticket, _ in assigned | unassigned})
+        workload = defaultdict(Counter)
+        for pairs, sign in ((assigned, 1), (unassigned, -1)):
+            for key, changes in _assignment_deltas([(mechanic.id, dates[ticket]) for ticket, mechanic in pairs if dates.get(ticket)], sign).items():
+                workload[key].update(changes)
+        _merge(session, MechanicWorkload, workload)
+
+
+# The flush may have collected deltas - the job is saved by the commit's next flush
+@event.listens_for(Session, 'after_flush_postexec')
+def _after_flush_postexec(session, flush_context):
+    _save_job(session)
+
+
+@event.listens_for(Session, 'after_commit')
+def _after_commit(session):
+    for key in ('rollup_deltas', 'rollup_job', 'rollup_changed'):
+        session.info.pop(key, None)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _after_rollback(session):
+    for key in ('rollup_deltas', 'rollup_job', 'rollup_changed'):
+        session.info.pop(key, None)
@@ -0,0 +1,204 @@
+# app/utils/slow_queries.py
+
+# Slow-query log (SLOW_QUERY_MS). Every statement that takes at least the
+# threshold is recorded under its fingerprint - the statement with literals
+# replaced by ? and IN (...) lists collapsed, so "WHERE id IN (?, ?)" and
+# "WHERE id IN (?, ?, ?)" count as one query. For each fingerprint it keeps
+#  - how often it was slow, the total and the worst time
+#  - the Flask endpoints it came from
+#  - the shape of its bound parameters (types only - values can be
+#    passwords or emails and are never logged)
+#  - the query plan, captured with EXPLAIN QUERY PLAN (SQLite) / EXPLAIN
+#    (Postgres) the first time the fingerprint is seen
+#
+# The first occurrence is logged as a warning with the plan; repeats only
+# bump the counters. GET /slow-queries lists them, slowest total first.
+# SLOW_QUERY_MS=0 records every statement, which is handy for finding per-row
+# lazy loads (one fingerprint, many counts per request).
+#
+# Unset (the default) nothing is registered.
+
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from flask import current_app, has_app_context, has_request_context, request, jsonify
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+MAX_FINGERPRINTS = 1000
+
+_PLACEHOLDER = r"(?:\?|%s|%\(\w+\)s|\$\d+|:\w+)"
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'(?<![\w$])\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(rf'\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})*\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+_READ = re.compile(r'\s*(SELECT|WITH)\b', re.IGNORECASE)
+
+
+def fingerprint(statement):
+    statement = _STRING.sub('?', statement)
+    statement = _NUMBER.sub('?', statement)
+    statement = _IN_LIST.sub('(...)', statement)
+    return _WHITESPACE.sub(' ', statement).strip()
+
+
+def _type_runs(values):
+    runs = []
+    for value in values:
+        name = type(value).__name__
+        if runs and runs[-1][0] == name:
+            runs[-1][1] += 1
+        else:
+            runs.append([name, 1])
+    return ', '.join(name if count == 1 else f'{name} x{count}' for name, count in runs)
+
+
+# Types of the bound parameters, e.g. "(str, int x2)" or "{email: str}"
+def parameter_shape(parameters, executemany=False):
+    if executemany:
+        if not parameters:
+            return '[]'
+        return f'{len(parameters)} rows of {parameter_shape(parameters[0])}'
+    if isinstance(parameters, dict):
+        return '{' + ', '.join(f'{key}: {type(value).__name__}' for key, value in parameters.items()) + '}'
+    if isinstance(parameters, (list, tuple)):
+        return f'({_type_runs(parameters)})'
+    return type(parameters).__name__
+
+
+EXPLAIN = {
+    'sqlite': ('EXPLAIN QUERY PLAN ', lambda row: row[-1]),
+    'postgresql': ('EXPLAIN ', lambda row: row[0]),
+}
+
+
+# The statement's plan, run on the statement's own DBAPI connection (so it
+# sees the same transaction) through a raw cursor that fires no events
+def explain(conn, statement, parameters):
+    if conn.dialect.name not in EXPLAIN:
+        return None
+    if not _READ.match(statement):
+        return None
+    prefix, detail = EXPLAIN[conn.dialect.name]
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        return '\n'.join(str(detail(row)) for row in cursor.fetchall())
+    except Exception as e:
+        return f'EXPLAIN failed: {e}'
+    finally:
+        cursor.close()
+
+
+class SlowQuery:
+    def __init__(self, fingerprint, statement, shape):
+        self.fingerprint = fingerprint
+        self.statement = statement
+        self.parameter_shape = shape
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.endpoints = Counter()
+        self.plan = None
+
+    def as_dict(self):
+        return {
+            'fingerprint': self.fingerprint,
+            'statement': self.statement,
+            'parameter_shape': self.parameter_shape,
+            'count': self.count,
+            'total_ms': round(self.total * 1000, 3),
+            'max_ms': round(self.max * 1000, 3),
+            'endpoints': dict(self.endpoints.most_common()),
+            'plan': self.plan,
+        }
+
+
+class SlowQueryLog:
+    def __init__(self, threshold, explain=True):
+        self.threshold = threshold
+        self.explain = explain
+        self.lock = threading.Lock()
+        self.queries = {}
+        self.dropped = 0
+
+    def record(self, conn, statement, parameters, executemany, elapsed):
+        key = fingerprint(statement)
+        endpoint = (request.endpoint or request.path) if has_request_context() else None
+        with self.lock:
+            query = self.queries.get(key)
+            new = query is None
+            if new:
+                if len(self.queries) >= MAX_FINGERPRINTS:
+                    self.dropped += 1
+                    return
+                query = self.queries[key] = SlowQuery(key, statement, parameter_shape(parameters, executemany))
+            query.count += 1
+            query.total += elapsed
+            query.max = max(query.max, elapsed)
+            if endpoint:
+                query.endpoints[endpoint] += 1
+        if not new:
+            return
+
+        if self.explain and not executemany:
+            query.plan = explain(conn, statement, parameters)
+        logger.warning(
+            'Slow query (%.1f ms) from %s\n%s\nparameters: %s\nplan:\n%s',
+            elapsed * 1000, endpoint or 'outside a request', statement, query.parameter_shape, query.plan or '-'
+        )
+
+    def as_list(self):
+        with self.lock:
+            queries = sorted(self.queries.values(), key=lambda query: query.total, reverse=True)
+            return [query.as_dict() for query in queries]
+
+
+# ----- Engine events -----
+# Engine-wide, added the first time an app enables the log. Apps without it
+# return straight away.
+
+def _slow_query_log():
+    if not has_app_context():
+        return None
+    return current_app.extensions.get('slow_queries')
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _slow_query_log() is not None:
+        conn.info['slow_query_started'] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop('slow_query_started', None)
+    log = _slow_query_log()
+    if log is None or started is None:
+        return
+    elapsed = time.perf_counter() - started
+    if elapsed >= log.threshold:
+        log.record(conn, statement, parameters, executemany, elapsed)
+
+
+class SlowQueries:
+    def init_app(self, app):
+        threshold = app.config.get('SLOW_QUERY_MS')
+        if threshold in (None, ''):
+            return
+
+        log = app.extensions['slow_queries'] = SlowQueryLog(float(threshold) / 1000, app.config.get('SLOW_QUERY_EXPLAIN', True))
+        if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+            event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+        # Recorded slow queries, slowest total first
+        def slow_queries_view():
+            return jsonify({'threshold_ms': log.threshold * 1000, 'dropped': log.dropped, 'queries': log.as_list()}), 200
+
+        app.add_url_rule('/slow-queries', 'slow_queries', slow_queries_view, methods=['GET'])
+
+
+slow_queries = SlowQueries()
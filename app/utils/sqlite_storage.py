@@ -0,0 +1,215 @@
+# app/utils/sqlite_storage.py
+
+# Cache and rate-limit storage in a local SQLite file, shared by every worker
+# process on the host (gunicorn -w N) without running an external service.
+# SimpleCache / memory:// give each worker its own copy - N times the memory,
+# a fraction of the hit ratio, and rate limits that are really N x the limit.
+#
+#  - SQLiteCache:   CACHE_TYPE = 'app.utils.sqlite_storage.SQLiteCache'
+#                   (file from CACHE_SQLITE_PATH, default instance/cache.db)
+#  - SQLiteStorage: RATELIMIT_STORAGE_URI = 'sqlite:///instance/ratelimit.db'
+#                   (same URI form as SQLAlchemy: sqlite:////absolute/path)
+#
+# Counters are single UPSERT statements, so increments from concurrent
+# processes are atomic. The file runs in WAL mode, so readers don't block the
+# writer. For several hosts use Redis instead (CACHE_TYPE = 'RedisCache' +
+# CACHE_REDIS_URL, RATELIMIT_STORAGE_URI = 'redis://...').
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from flask_caching.backends.base import BaseCache
+from limits.storage import Storage
+
+BUSY_TIMEOUT_MS = 5000
+PRUNE_EVERY = 500   # writes between sweeps of expired rows
+
+
+# One connection per thread, reopened after a fork (a connection must never be
+# shared by two processes). Autocommit mode: every statement is its own
+# transaction, and each statement here is self-contained.
+class _Connections:
+    def __init__(self, path, schema):
+        self.path = path
+        self.schema = schema
+        self.local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None or self.local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(self.schema)
+            self.local.conn = conn
+            self.local.pid = os.getpid()
+        return conn
+
+
+def _path_from_uri(uri):
+    # sqlite:///relative.db -> relative.db, sqlite:////tmp/x.db -> /tmp/x.db
+    return uri.split('://', 1)[1][1:]
+
+
+# ----- Flask-Caching backend -----
+
+class SQLiteCache(BaseCache):
+    def __init__(self, path, default_timeout=300):
+        super().__init__(default_timeout=default_timeout)
+        self.connections = _Connections(path, (
+            'CREATE TABLE IF NOT EXISTS cache ('
+            'key TEXT PRIMARY KEY, value BLOB, expires_at REAL)'
+        ))
+        self.writes = 0
+
+    @classmethod
+    def factory(cls, app, config, args, kwargs):
+        path = config.get('CACHE_SQLITE_PATH') or os.path.join(app.instance_path, 'cache.db')
+        kwargs.setdefault('default_timeout', config['CACHE_DEFAULT_TIMEOUT'])
+        return cls(path, *args, **kwargs)
+
+    @property
+    def conn(self):
+        return self.connections.get()
+
+    def _expires_at(self, timeout):
+        timeout = self._normalize_timeout(timeout)
+        return time.time() + timeout if timeout else None
+
+    # Integers are stored as SQLite integers so inc() can add to them in SQL;
+    # everything else is pickled
+    @staticmethod
+    def _dump(value):
+        return value if type(value) is int else pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _load(value):
+        return pickle.loads(value) if isinstance(value, bytes) else value
+
+    def _prune(self):
+        self.writes += 1
+        if self.writes % PRUNE_EVERY == 0:
+            self.conn.execute('DELETE FROM cache WHERE expires_at <= ?', (time.time(),))
+
+    def get(self, key):
+        row = self.conn.execute(
+            'SELECT value FROM cache WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)',
+            (key, time.time())
+        ).fetchone()
+        return self._load(row[0]) if row else None
+
+    def has(self, key):
+        return self.conn.execute(
+            'SELECT 1 FROM cache WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)',
+            (key, time.time())
+        ).fetchone() is not None
+
+    def set(self, key, value, timeout=None):
+        self.conn.execute(
+            'INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)',
+            (key, self._dump(value), self._expires_at(timeout))
+        )
+        self._prune()
+        return True
+
+    # Only succeeds if the key is missing or expired
+    def add(self, key, value, timeout=None):
+        now = time.time()
+        cursor = self.conn.execute(
+            'INSERT INTO cache (key, value, expires_at) VALUES (?, ?, ?) '
+            'ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at '
+            'WHERE cache.expires_at IS NOT NULL AND cache.expires_at <= ?',
+            (key, self._dump(value), self._expires_at(timeout), now)
+        )
+        self._prune()
+        return cursor.rowcount == 1
+
+    def delete(self, key):
+        return self.conn.execute('DELETE FROM cache WHERE key = ?', (key,)).rowcount == 1
+
+    def clear(self):
+        self.conn.execute('DELETE FROM cache')
+        return True
+
+    # Atomic across processes. A missing or expired key starts from 0 and
+    # never expires, like the other cachelib backends.
+    def inc(self, key, delta=1):
+        row = self.conn.execute(
+            'INSERT INTO cache (key, value, expires_at) VALUES (?, ?, NULL) '
+            'ON CONFLICT(key) DO UPDATE SET '
+            'value = CASE WHEN cache.expires_at <= ? THEN excluded.value ELSE cache.value + excluded.value END, '
+            'expires_at = CASE WHEN cache.expires_at <= ? THEN NULL ELSE cache.expires_at END '
+            'RETURNING value',
+            (key, delta, time.time(), time.time())
+        ).fetchone()
+        return row[0]
+
+    def dec(self, key, delta=1):
+        return self.inc(key, -delta)
+
+
+# ----- limits storage (registered for sqlite:// URIs) -----
+
+class SQLiteStorage(Storage):
+    STORAGE_SCHEME = ['sqlite']
+
+    def __init__(self, uri, wrap_exceptions=False, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self.connections = _Connections(_path_from_uri(uri), (
+            'CREATE TABLE IF NOT EXISTS ratelimit ('
+            'key TEXT PRIMARY KEY, value INTEGER NOT NULL, expires_at REAL NOT NULL)'
+        ))
+        self.writes = 0
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    @property
+    def conn(self):
+        return self.connections.get()
+
+    # An expired window restarts at `amount` with a fresh expiry
+    def incr(self, key, expiry, amount=1):
+        now = time.time()
+        row = self.conn.execute(
+            'INSERT INTO ratelimit (key, value, expires_at) VALUES (?, ?, ?) '
+            'ON CONFLICT(key) DO UPDATE SET '
+            'value = CASE WHEN ratelimit.expires_at <= ? THEN excluded.value ELSE ratelimit.value + excluded.value END, '
+            'expires_at = CASE WHEN ratelimit.expires_at <= ? THEN excluded.expires_at ELSE ratelimit.expires_at END '
+            'RETURNING value',
+            (key, amount, now + expiry, now, now)
+        ).fetchone()
+        self.writes += 1
+        if self.writes % PRUNE_EVERY == 0:
+            self.conn.execute('DELETE FROM ratelimit WHERE expires_at <= ?', (now,))
+        return row[0]
+
+    def get(self, key):
+        row = self.conn.execute(
+            'SELECT value FROM ratelimit WHERE key = ? AND expires_at > ?', (key, time.time())
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get_expiry(self, key):
+        row = self.conn.execute(
+            'SELECT expires_at FROM ratelimit WHERE key = ? AND expires_at > ?', (key, time.time())
+        ).fetchone()
+        return row[0] if row else time.time()
+
+    def check(self):
+        try:
+            self.conn.execute('SELECT 1')
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self):
+        return self.conn.execute('DELETE FROM ratelimit').rowcount
+
+    def clear(self, key):
+        self.conn.execute('DELETE FROM ratelimit WHERE key = ?', (key,))
@@ -0,0 +1,122 @@
+# app/utils/totals.py
+
+# Parts totals for service tickets: SUM(quantity * price) over a ticket's
+# service_ticket_inventory rows.
+#
+#  - ticket_totals / invoice_lines compute them live with one aggregate /
+#    join query, however many tickets are asked for
+#  - service_tickets.parts_total keeps the same number materialized. add_part
+#    adds the new line to it, and a price change shifts every ticket using the
+#    part by quantity * (new price - old price), both as single UPDATEs.
+#    recompute_parts_totals rebuilds it from scratch (migration 4).
+#  - both updates also move the day's revenue in report_daily_revenue
+#    (app/utils/rollups.py) and put the tickets in the change feed
+#    (app/utils/changes.py)
+
+from sqlalchemy import select, update, func
+from app.models import db, Service_Ticket, ServiceTicketInventory, Inventory
+from app.utils import rollups, changes
+
+line_total = ServiceTicketInventory.quantity * Inventory.price
+
+
+def _round(value):
+    return round(value or 0, 2)
+
+
+# {ticket id: parts total} for the given ids, in one GROUP BY query.
+# Tickets without parts are 0.
+def ticket_totals(ticket_ids, executor=None):
+    executor = executor or db.session
+    ticket_ids = list(ticket_ids)
+    if not ticket_ids:
+        return {}
+    rows = executor.execute(
+        select(ServiceTicketInventory.service_ticket_id, func.sum(line_total))
+        .join(Inventory, Inventory.id == ServiceTicketInventory.inventory_id)
+        .where(ServiceTicketInventory.service_ticket_id.in_(ticket_ids))
+        .group_by(ServiceTicketInventory.service_ticket_id)
+    ).all()
+    totals = dict.fromkeys(ticket_ids, 0.0)
+    totals.update({ticket_id: _round(total) for ticket_id, total in rows})
+    return totals
+
+
+# The ticket's parts with quantity, unit price and line total, in one query
+def invoice_lines(ticket_id):
+    rows = db.session.execute(
+        select(
+            Inventory.id, Inventory.part_name, Inventory.price,
+            ServiceTicketInventory.quantity, line_total
+        )
+        .join(Inventory, Inventory.id == ServiceTicketInventory.inventory_id)
+        .where(ServiceTicketInventory.service_ticket_id == ticket_id)
+        .order_by(ServiceTicketInventory.id)
+    ).all()
+    return [
+        {
+            'part_id': part_id,
+            'part_name': part_name,
+            'unit_price': price,
+            'quantity': quantity,
+            'line_total': _round(total),
+        }
+        for part_id, part_name, price, quantity, total in rows
+    ]
+
+
+# ----- Maintaining service_tickets.parts_total -----
+
+def add_to_parts_total(ticket_id, amount):
+    db.session.execute(
+        update(Service_Ticket)
+        .where(Service_Ticket.id == ticket_id)
+        .values(parts_total=func.round(Service_Ticket.parts_total + amount, 2)),
+        execution_options={'synchronize_session': False}
+    )
+    rollups.add_ticket_revenue(ticket_id, amount)
+    changes.record(Service_Ticket, [ticket_id])
+
+
+# A part's price moved from old_price to new_price
+def reprice_part(inventory_id, old_price, new_price):
+    if old_price == new_price:
+        return
+    rollups.reprice_revenue(inventory_id, old_price, new_price)   # reads the old totals
+    changes.record(Service_Ticket, db.session.execute(
+        select(ServiceTicketInventory.service_ticket_id.distinct())
+        .where(ServiceTicketInventory.inventory_id == inventory_id)
+    ).scalars().all())
+    quantity = (
+        select(func.sum(ServiceTicketInventory.quantity))
+        .where(
+            ServiceTicketInventory.service_ticket_id == Service_Ticket.id,
+            ServiceTicketInventory.inventory_id == inventory_id
+        )
+        .scalar_subquery()
+    )
+    db.session.execute(
+        update(Service_Ticket)
+        .where(Service_Ticket.id.in_(
+            select(ServiceTicketInventory.service_ticket_id)
+            .where(ServiceTicketInventory.inventory_id == inventory_id)
+        ))
+        .values(parts_total=func.round(Service_Ticket.parts_total + quantity * (new_price - old_price), 2)),
+        execution_options={'synchronize_session': False}
+    )
+
+
+# Rebuilds parts_total for every ticket (or the given ids) from the parts.
+# Leaves the revenue rollup alone - follow with rollups.rebuild().
+def recompute_parts_totals(executor=None, ticket_ids=None):
+    executor = executor or db.session
+    total = (
+        select(func.coalesce(func.round(func.sum(line_total), 2), 0))
+        .join(Inventory, Inventory.id == ServiceTicketInventory.inventory_id)
+        .where(ServiceTicketInventory.service_ticket_id == Service_Ticket.id)
+        .scalar_subquery()
+    )
+    statement = update(Service_Ticket).values(parts_total=total)
+    if ticket_ids is not None:
+        statement = statement.where(Service_Ticket.id.in_(list(ticket_ids)))
+    executor.execute(statement)
@@ -1,72 +1,136 @@
 # app/utils/util.py
 from flask import current_app
 from datetime import datetime, timedelta, timezone
-from jose import jwt
+from collections import OrderedDict
+from jose import jwt, jwk
+from jose.exceptions import JWTError, ExpiredSignatureError
 from functools import wraps
 from flask import request, jsonify
+import inspect
+import threading
+import time
 import os
 
 SECRET_KEY = os.environ.get('SECRET_KEY') or "super secret secrets"
 
+ALGORITHM = 'HS256'
+TOKEN_LIFETIME = timedelta(hours=1)
+TOKEN_CACHE_SIZE = 1024
+
+# Per-app token state: the HMAC key object built once from SECRET_KEY (instead
+# of re-parsing the secret on every encode/decode), and an LRU of tokens that
+# already passed verification. Entries are keyed by the token's signature and
+# keep the signed header.payload, so a hit needs the exact same token - a
+# forged payload can't borrow a cached signature. They're evicted once the
+# token's exp has passed.
+class TokenState:
+    def __init__(self, config):
+        self.key = jwk.construct(config.get('SECRET_KEY', 'fallback-secret'), ALGORITHM)
+        self.maxsize = config.get('TOKEN_CACHE_SIZE', TOKEN_CACHE_SIZE)
+        self.verified = OrderedDict()
+        self.lock = threading.Lock()
+
+    def lookup(self, signing_input, signature):
+        with self.lock:
+            entry = self.verified.get(signature)
+            if entry is None or entry[0] != signing_input:
+                return None
+            if entry[1]['exp'] <= time.time():
+                del self.verified[signature]
+                raise ExpiredSignatureError('Signature has expired.')
+            self.verified.move_to_end(signature)
+            return entry[1]
+
+    def store(self, signing_input, signature, claims):
+        with self.lock:
+            self.verified[signature] = (signing_input, claims)
+            self.verified.move_to_end(signature)
+            while len(self.verified) > self.maxsize:
+                self.verified.popitem(last=False)
+
+
+def _token_state():
+    state = current_app.extensions.get('tokens')
+    if state is None:
+        state = current_app.extensions['tokens'] = TokenState(current_app.config)
+    return state
+
+
 # encode_token function that takes in a mechanic_id or customer_id to create a token specific to that user
 def encode_token(user_id, user_type):
+    now = datetime.now(timezone.utc)
     payload = {
-        'exp': datetime.now(timezone.utc) + timedelta(days=0, hours=1),
-        'iat': datetime.now(timezone.utc), 
+        'exp': now + TOKEN_LIFETIME,
+        'iat': now,
         'sub': str(user_id),
         'type': user_type
     }
-    
-    # fetch secret from the Flask app config
-    secret_key = current_app.config.get('SECRET_KEY', 'fallback-secret')
-    
-    
-    # this encrypes the token and then returns it
-    token = jwt.encode(payload, secret_key, algorithm='HS256')
+
+    # this signs the token with the app's key and then returns it
+    token = jwt.encode(payload, _token_state().key, algorithm=ALGORITHM)
     return token
 
+# Verified claims of a token. Raises ExpiredSignatureError / JWTError.
+# Repeat calls with the same token skip the HMAC and claim parsing.
+def decode_token(token):
+    state = _token_state()
+    signing_input, _, signature = token.rpartition('.')
+    claims = state.lookup(signing_input, signature)
+    if claims is None:
+        claims = jwt.decode(token, state.key, algorithms=[ALGORITHM])
+        if 'exp' not in claims:
+            raise JWTError('Token has no expiry.')
+        state.store(signing_input, signature, claims)
+    return claims
+
+# (user_id, user_type, None) for the request's bearer token, or
+# (None, None, error response)
+def _authenticate(required_type):
+    if 'Authorization' not in request.headers:
+        return None, None, (jsonify({'message': 'You must be logged in to access this.'}), 400)
+
+    parts = request.headers['Authorization'].split()
+    token = parts[1] if len(parts) > 1 else None
+
+    if not token:
+        return None, None, (jsonify({'message': 'Missing token'}), 400)
+
+    try:
+        data = decode_token(token)
+
+        user_id = data['sub']
+        user_type = data.get('type')
+
+        if required_type and user_type != required_type:
+            return None, None, (jsonify({"message": f'User must be a {required_type}'}), 403)
+
+    except ExpiredSignatureError:
+        return None, None, (jsonify({'message': 'Token expired'}), 400)
+    except (JWTError, KeyError):
+        return None, None, (jsonify({'message': 'Invalid token'}), 400)
+
+    return user_id, user_type, None
+
+# Works on plain views and on the async views in app/asgi.py
 def token_required(required_type=None):
     def decorator(f):
+        if inspect.iscoroutinefunction(f):
+            @wraps(f)
+            async def decorated_async(*args, **kwargs):
+                user_id, user_type, error = _authenticate(required_type)
+                if error:
+                    return error
+                return await f(user_id, user_type, *args, **kwargs)
+
+            return decorated_async
+
         @wraps(f)
         def decorated(*args, **kwargs):
-            token = None
-        
-            if 'Authorization' in request.headers:
-            
-                token = request.headers['Authorization'].split()[1]
-            
-                if not token:
-                    return jsonify({'message': 'Missing token'}), 400
-            
-                try:
-                    from flask import current_app
-                    from jose.exceptions import JWTError, ExpiredSignatureError
-                    
-                    secret_key = current_app.config.get('SECRET_KEY', 'fallback-secret')
-                    data = jwt.decode(token, secret_key, algorithms=['HS256'])
-
-                    user_id = data['sub']
-                    user_type = data.get('type')
-                    
-                    if required_type and user_type != required_type:
-                        return jsonify({"message": f'User must be a {required_type}'}), 403
-            
-                except jwt.ExpiredSignatureError as e:
-                    return jsonify({'message': 'Token expired'}), 400
-                except jwt.InvalidTokenError:
-                    return jsonify({'message': 'Invalid token'}), 400
-            
-                return f(user_id, user_type, *args, **kwargs)
-        
-            else:
-                return jsonify({'message': 'You must be logged in to access this.'}), 400
-        
+            user_id, user_type, error = _authenticate(required_type)
+            if error:
+                return error
+            return f(user_id, user_type, *args, **kwargs)
+
         return decorated
-    
-    return decorator  
-            
-                
-            
-            
-            
-            
\ No newline at end of file
+
+    return decorator
@@ -0,0 +1,8 @@
+# asgi.py
+# ASGI entry point - the read-only routes in app/asgi.py run on the async
+# engine, everything else is served by the Flask app from flask_app.py
+#   uvicorn asgi:app
+from flask_app import app as flask_app
+from app.asgi import create_asgi_app
+
+app = create_asgi_app(flask_app)
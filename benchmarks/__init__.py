@@ -0,0 +1,4 @@
+# /benchmarks/__init__.py
+
+# Performance scripts - run from the project root, e.g.
+#   python -m benchmarks.bench_connection_pool
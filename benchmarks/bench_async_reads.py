@@ -0,0 +1,169 @@
+# /benchmarks/bench_async_reads.py
+
+# Throughput and latency of the read endpoints under concurrent clients when
+# every query is slow (network round trips, a loaded database server): gunicorn
+# sync workers, where each in-flight request holds a worker, versus the ASGI
+# entry point under uvicorn, where the async routes wait on the database
+# without holding anything.
+#
+# BENCH_DB_DELAY_MS (default 20) is added to every statement - time.sleep on
+# the sync engine, asyncio.sleep on the async one. Both servers run as
+# subprocesses against the same seeded database.
+#
+#   python -m benchmarks.bench_async_reads --workers 4 --concurrency 8 32 64
+
+import argparse
+import asyncio
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.util import await_only
+from app import create_app
+from app.asgi import create_asgi_app
+from app.models import db
+from .common import make_app, seed_service_tickets
+
+CUSTOMERS = 1000
+
+
+def _delay():
+    return int(os.getenv('BENCH_DB_DELAY_MS', 20)) / 1000
+
+
+# ----- Server factories (gunicorn / uvicorn import these) -----
+
+def sync_app():
+    app = create_app('BenchmarkConfig')
+    delay = _delay()
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', lambda *args: time.sleep(delay))
+    return app
+
+
+def async_app():
+    app = create_app('BenchmarkConfig')
+    asgi = create_asgi_app(app, engine_options={'pool_size': 64, 'max_overflow': 0})
+    delay = _delay()
+    # Runs inside SQLAlchemy's greenlet, so it can await on the event loop
+    event.listen(asgi.engine.sync_engine, 'before_cursor_execute', lambda *args: await_only(asyncio.sleep(delay)))
+    return asgi
+
+
+# ----- Load generation -----
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _wait_ready(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            conn.request('GET', '/customers/1')
+            conn.getresponse().read()
+            conn.close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'server on port {port} did not start')
+
+
+def _urls(n):
+    return [
+        f'/customers/{i % CUSTOMERS + 1}' if i % 2 else f'/service_tickets/?page={i % 50 + 1}&per_page=20'
+        for i in range(n)
+    ]
+
+
+# Each client sends its share of the requests over one keep-alive connection
+def load(port, concurrency, requests):
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+
+    def client(urls):
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+        mine = []
+        for url in urls:
+            start = time.perf_counter()
+            conn.request('GET', url)
+            response = conn.getresponse()
+            response.read()
+            mine.append(time.perf_counter() - start)
+            if response.status != 200:
+                with lock:
+                    errors.append(response.status)
+        conn.close()
+        with lock:
+            latencies.extend(mine)
+
+    urls = _urls(requests)
+    threads = [threading.Thread(target=client, args=(urls[i::concurrency],)) for i in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p50 = statistics.median(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return requests / elapsed, p50, p99, len(errors)
+
+
+def run_server(command, env):
+    return subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tickets', type=int, default=5000)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=4, help='gunicorn sync workers')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[8, 32, 64])
+    args = parser.parse_args()
+
+    app = make_app()
+    seed_service_tickets(app, args.tickets, customers=CUSTOMERS)
+    with app.app_context():
+        db.engine.dispose()
+
+    env = dict(os.environ, BENCH_DB_DELAY_MS=str(int(_delay() * 1000)))
+    servers = {
+        f'gunicorn, {args.workers} sync workers': lambda port: [
+            sys.executable, '-m', 'gunicorn', '--workers', str(args.workers), '--worker-class', 'sync',
+            '--bind', f'127.0.0.1:{port}', 'benchmarks.bench_async_reads:sync_app()',
+        ],
+        'uvicorn, ASGI async routes': lambda port: [
+            sys.executable, '-m', 'uvicorn', '--factory', 'benchmarks.bench_async_reads:async_app',
+            '--host', '127.0.0.1', '--port', str(port), '--log-level', 'warning',
+        ],
+    }
+
+    print(f"{int(_delay() * 1000)} ms added to every query, {args.requests} requests per run")
+    print(f"{'server':<32} {'clients':>7} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>6}")
+    for label, command in servers.items():
+        port = _free_port()
+        server = run_server(command(port), env)
+        try:
+            _wait_ready(port)
+            for concurrency in args.concurrency:
+                rps, p50, p99, errors = load(port, concurrency, args.requests)
+                print(f"{label:<32} {concurrency:>7} {rps:>9.1f} {p50 * 1000:>8.1f} {p99 * 1000:>8.1f} {errors:>6}")
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+# /benchmarks/bench_bulk_create.py
+
+# Rows/sec importing inventory parts: one POST /inventory/ per part (before)
+# versus POST /inventory/bulk with the whole batch, as a JSON array and as
+# NDJSON (after). The one-at-a-time baseline only runs up to --single-max rows.
+#
+#   python -m benchmarks.bench_bulk_create --sizes 1000 10000 100000
+
+import argparse
+import json
+from app.models import db, Inventory
+from .common import make_app, timed
+
+
+def rows_per_sec(label, rows, seconds):
+    print(f"{label:<40} {rows:>8} rows  {seconds:8.3f} s  {rows / seconds:10.1f} rows/s")
+
+
+def parts(size, prefix):
+    return [{'part_name': f'{prefix} part {i}', 'price': round(1 + i % 500 * 0.25, 2)} for i in range(size)]
+
+
+def reset(app):
+    with app.app_context():
+        db.session.query(Inventory).delete()
+        db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--single-max', type=int, default=1000)
+    args = parser.parse_args()
+
+    app = make_app()
+    client = app.test_client()
+
+    for size in args.sizes:
+        print(f"--- {size} rows")
+        if size <= args.single_max:
+            reset(app)
+            payload = parts(size, 'single')
+            seconds = timed(lambda: [client.post('/inventory/', json=row) for row in payload])
+            rows_per_sec('POST /inventory/ per row (before)', size, seconds)
+
+        reset(app)
+        payload = parts(size, 'array')
+        response = None
+        def post_array():
+            nonlocal response
+            response = client.post('/inventory/bulk', json=payload)
+        seconds = timed(post_array)
+        assert response.json['created'] == size, response.json.get('error')
+        rows_per_sec('POST /inventory/bulk JSON array (after)', size, seconds)
+
+        reset(app)
+        body = '\n'.join(json.dumps(row) for row in parts(size, 'ndjson'))
+        seconds = timed(lambda: client.post('/inventory/bulk', data=body, content_type='application/x-ndjson'))
+        rows_per_sec('POST /inventory/bulk NDJSON (after)', size, seconds)
+
+
+if __name__ == '__main__':
+    main()
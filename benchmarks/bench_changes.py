@@ -0,0 +1,76 @@
+# /benchmarks/bench_changes.py
+
+# What a downstream sync costs after a round of writes: re-reading the ticket
+# and inventory tables in full (before - GET ?stream=true, O(table)) against
+# reading the change feed since the last seen seq (after - GET /changes,
+# O(changes)). Also checks that the feed names every written row.
+#
+#   python -m benchmarks.bench_changes --tickets 100000 --writes 200
+
+import argparse
+import random
+import statistics
+import time
+from app.extensions import cache
+from app.utils.util import encode_token
+from .common import make_app
+from .seed import seed_database, add_size_arguments, sizes_from_args
+
+
+# Median wall time of fn() in ms, and its last result
+def median_ms(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    add_size_arguments(parser)
+    parser.add_argument('--writes', type=int, default=200, help='Parts added to random tickets between syncs.')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    app = make_app()
+    sizes = seed_database(app, sizes_from_args(args), seed=args.seed)
+    app.config['CACHE_TYPE'] = 'NullCache'   # time the reads, not the response cache
+    cache.init_app(app)
+    client = app.test_client()
+    with app.app_context():
+        headers = {'Authorization': f'Bearer {encode_token(1, user_type="mechanic")}'}
+    since = client.get('/changes?limit=1').json['last_seq']
+
+    rng = random.Random(args.seed)
+    written = set()
+    for _ in range(args.writes):
+        ticket_id = rng.randint(1, sizes['tickets'])
+        response = client.put(f'/service_tickets/{ticket_id}/add-part', json={'part_id': rng.randint(1, sizes['parts'])})
+        assert response.status_code == 200
+        written.add(ticket_id)
+    print(f"{sizes['tickets']} tickets, {sizes['parts']} parts, {args.writes} writes to {len(written)} tickets")
+
+    def full_sync():
+        return sum(len(client.get(url, headers=headers).get_data()) for url in ('/service_tickets/?stream=true', '/inventory/?stream=true'))
+
+    def feed_sync():
+        position, size, tickets = since, 0, set()
+        while True:
+            response = client.get(f'/changes?since={position}&limit=1000')
+            size += len(response.get_data())
+            tickets.update(change['id'] for change in response.json['changes'] if change['entity'] == 'service_tickets')
+            position = response.json['next']
+            if not response.json['more']:
+                return size, tickets
+
+    before, full_bytes = median_ms(full_sync, args.repeat)
+    after, (feed_bytes, tickets) = median_ms(feed_sync, args.repeat)
+    assert tickets == written, 'the feed missed a written ticket'
+    print(f"full re-read  {before:10.2f} ms  {full_bytes / 1e6:8.2f} MB")
+    print(f"change feed   {after:10.2f} ms  {feed_bytes / 1e6:8.2f} MB  ({before / after:6.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
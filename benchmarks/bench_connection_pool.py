@@ -0,0 +1,42 @@
+# /benchmarks/bench_connection_pool.py
+
+# Requests/sec for GET /customers/<id> with the old dispose-on-teardown
+# behaviour versus a connection pool that stays warm across requests.
+# Point BENCHMARK_DATABASE_URL at Postgres/MySQL to see the handshake cost.
+#
+#   python -m benchmarks.bench_connection_pool --requests 2000
+
+import argparse
+from app.models import db, Customer
+from .common import make_app, timed, report
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+
+    app = make_app()
+    with app.app_context():
+        customer = Customer(name='Bench', email='bench@example.com', phone='000', password='x')
+        db.session.add(customer)
+        db.session.commit()
+        customer_id = customer.id
+
+    client = app.test_client()
+    url = f'/customers/{customer_id}'
+    client.get(url)  # warm up
+
+    app.config['SQLALCHEMY_DISPOSE_ON_TEARDOWN'] = True
+    before = timed(lambda: client.get(url), args.requests)
+    report('dispose engine every request (before)', args.requests, before)
+
+    app.config['SQLALCHEMY_DISPOSE_ON_TEARDOWN'] = False
+    after = timed(lambda: client.get(url), args.requests)
+    report('persistent connection pool (after)', args.requests, after)
+
+    print(f"speedup: {before / after:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+# /benchmarks/bench_keyset_pagination.py
+
+# Latency of a deep page of GET /service_tickets/ - OFFSET pagination
+# (db.paginate: COUNT(*) + OFFSET scan) versus the ?cursor= keyset mode.
+#
+#   python -m benchmarks.bench_keyset_pagination --rows 1000000 --page 10000
+
+import argparse
+import statistics
+import time
+from sqlalchemy import select
+from app.models import db, Service_Ticket
+from app.utils.pagination import encode_cursor
+from .common import make_app, seed_service_tickets
+
+
+def median_ms(client, url, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get(url)
+        timings.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200, response.data
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--page', type=int, default=10_000)
+    parser.add_argument('--per-page', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    app = make_app()
+    start = time.perf_counter()
+    seed_service_tickets(app, args.rows)
+    print(f"seeded {args.rows} service tickets in {time.perf_counter() - start:.1f} s")
+
+    # The keyset cursor for page N is the key of the last row on page N - 1
+    skip = (args.page - 1) * args.per_page
+    with app.app_context():
+        last_row = db.session.execute(
+            select(Service_Ticket.service_date, Service_Ticket.id)
+            .order_by(Service_Ticket.service_date, Service_Ticket.id)
+            .offset(skip - 1)
+            .limit(1)
+        ).one()
+    cursor = encode_cursor(list(last_row))
+
+    client = app.test_client()
+    offset_ms = median_ms(client, f'/service_tickets/?page={args.page}&per_page={args.per_page}', args.repeat)
+    keyset_ms = median_ms(client, f'/service_tickets/?cursor={cursor}&per_page={args.per_page}', args.repeat)
+
+    print(f"page {args.page} ({args.per_page} per page, offset {skip})")
+    print(f"  offset pagination  {offset_ms:9.2f} ms")
+    print(f"  keyset pagination  {keyset_ms:9.2f} ms")
+    print(f"  speedup            {offset_ms / keyset_ms:9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
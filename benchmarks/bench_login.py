@@ -0,0 +1,117 @@
+# /benchmarks/bench_login.py
+
+# Login latency under a burst of concurrent logins, served by a threaded WSGI
+# server: scrypt verified on the request threads (before) versus in the
+# password process pool (after). Also times a cheap request
+# (GET /customers/<id>) issued during the burst - the thing that stalls when
+# hashing hogs the request threads.
+#
+#   python -m benchmarks.bench_login --clients 32 --logins 20
+
+import argparse
+import http.client
+import json
+import os
+import statistics
+import threading
+import time
+from werkzeug.serving import make_server, WSGIRequestHandler
+from app.models import db, Customer
+from app.utils.passwords import hasher, hash_password
+from .common import make_app, bulk_insert
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p / 100))]
+
+
+def run(app, clients, logins):
+    with app.app_context():
+        db.session.query(Customer).delete()
+        db.session.commit()
+        stored = hash_password('pw')
+    bulk_insert(app, Customer.__table__, (
+        {'id': i, 'name': f'Customer {i}', 'email': f'c{i}@example.com', 'phone': '1', 'password': stored}
+        for i in range(1, clients + 1)
+    ))
+
+    server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=QuietHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    port = server.server_port
+
+    login_times, other_times = [], []
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def login_client(i):
+        conn = http.client.HTTPConnection('127.0.0.1', port)
+        body = json.dumps({'email': f'c{i}@example.com', 'password': 'pw'})
+        for _ in range(logins):
+            start = time.perf_counter()
+            conn.request('POST', '/customers/login', body, {'Content-Type': 'application/json'})
+            response = conn.getresponse()
+            response.read()
+            assert response.status == 200, response.status
+            with lock:
+                login_times.append(time.perf_counter() - start)
+        conn.close()
+
+    def other_client():
+        conn = http.client.HTTPConnection('127.0.0.1', port)
+        while not done.is_set():
+            start = time.perf_counter()
+            conn.request('GET', '/customers/1')
+            conn.getresponse().read()
+            other_times.append(time.perf_counter() - start)
+        conn.close()
+
+    watcher = threading.Thread(target=other_client)
+    watcher.start()
+    workers = [threading.Thread(target=login_client, args=(i,)) for i in range(1, clients + 1)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    done.set()
+    watcher.join()
+    server.shutdown()
+    return login_times, other_times, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--logins', type=int, default=20)
+    parser.add_argument('--cost', type=int, default=2 ** 14)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    app = make_app()
+    app.config['PASSWORD_SCRYPT_N'] = args.cost
+    scenarios = [
+        ('scrypt on request threads (before)', 0),
+        (f'scrypt in pool, {args.workers} workers (after)', args.workers),
+    ]
+    print(f"{args.clients} concurrent clients x {args.logins} logins, scrypt n={args.cost}")
+    for label, workers in scenarios:
+        app.config['PASSWORD_HASH_WORKERS'] = workers
+        logins, others, elapsed = run(app, args.clients, args.logins)
+        print(
+            f"{label:<40} login p50 {statistics.median(logins) * 1000:7.1f} ms  "
+            f"p99 {percentile(logins, 99) * 1000:7.1f} ms  {len(logins) / elapsed:7.1f} logins/s  "
+            f"| GET during burst p99 {percentile(others, 99) * 1000:6.1f} ms"
+        )
+        hasher.shutdown()
+
+
+if __name__ == '__main__':
+    main()
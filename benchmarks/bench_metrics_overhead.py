@@ -0,0 +1,36 @@
+# /benchmarks/bench_metrics_overhead.py
+
+# Cost of the request instrumentation in app/utils/metrics.py: requests/sec
+# for a single-row GET and a 100-row list page with METRICS_ENABLED off
+# (nothing registered) and on (hooks, cursor events, Server-Timing header).
+#
+#   python -m benchmarks.bench_metrics_overhead --requests 2000
+
+import argparse
+from app import create_app
+from app.utils.metrics import metrics
+from .common import make_app, timed, report, seed_service_tickets
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+
+    seed_service_tickets(make_app(), 1000, customers=100)
+    urls = {'one row': '/customers/1', '100-row page': '/service_tickets/?page=1&per_page=100'}
+
+    for enabled in (False, True):
+        app = create_app('BenchmarkConfig')
+        if enabled:
+            app.config['METRICS_ENABLED'] = True
+            metrics.init_app(app)
+        client = app.test_client()
+        for label, url in urls.items():
+            client.get(url)  # warm up
+            seconds = timed(lambda: client.get(url), args.requests)
+            report(f"{label}, metrics {'on' if enabled else 'off'}", args.requests, seconds)
+
+
+if __name__ == '__main__':
+    main()
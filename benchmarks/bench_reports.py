@@ -0,0 +1,113 @@
+# /benchmarks/bench_reports.py
+
+# The /reports queries computed ad hoc over the source tables (before - one
+# GROUP BY over every ticket, line or assignment per request) against reading
+# the rollup tables (after), plus the full /reports requests. Also checks
+# that both give the same numbers.
+#
+#   python -m benchmarks.bench_reports --tickets 100000
+
+import argparse
+import statistics
+import time
+from sqlalchemy import select, func
+from app.extensions import cache
+from app.models import db, Inventory, Mechanic, DailyRevenue, PartUsage, MechanicWorkload
+from app.utils import rollups
+from app.utils.util import encode_token
+from .common import make_app
+from .seed import seed_database, add_size_arguments, sizes_from_args
+
+
+def adhoc_revenue():
+    return {row.day: (row.tickets, row.revenue) for row in db.session.execute(rollups.revenue_query())}
+
+
+def rollup_revenue():
+    return {row.day: (row.tickets, row.revenue) for row in db.session.scalars(select(DailyRevenue).where(DailyRevenue.tickets > 0))}
+
+
+def adhoc_parts():
+    usage = rollups.part_usage_query().subquery()
+    rows = db.session.execute(
+        select(usage.c.inventory_id, usage.c.quantity, func.round(usage.c.quantity * Inventory.price, 2))
+        .join(Inventory, Inventory.id == usage.c.inventory_id)
+        .order_by(usage.c.quantity.desc(), usage.c.inventory_id)
+    )
+    return [tuple(row) for row in rows]
+
+
+def rollup_parts():
+    rows = db.session.execute(
+        select(PartUsage.inventory_id, PartUsage.quantity, func.round(PartUsage.quantity * Inventory.price, 2))
+        .join(Inventory, Inventory.id == PartUsage.inventory_id)
+        .where(PartUsage.lines > 0)
+        .order_by(PartUsage.quantity.desc(), PartUsage.inventory_id)
+    )
+    return [tuple(row) for row in rows]
+
+
+def adhoc_workload():
+    workload = rollups.workload_query().subquery()
+    rows = db.session.execute(
+        select(workload.c.mechanic_id, Mechanic.name, workload.c.week, workload.c.tickets)
+        .join(Mechanic, Mechanic.id == workload.c.mechanic_id)
+        .order_by(workload.c.week, workload.c.mechanic_id)
+    )
+    return [tuple(row) for row in rows]
+
+
+def rollup_workload():
+    rows = db.session.execute(
+        select(MechanicWorkload.mechanic_id, Mechanic.name, MechanicWorkload.week, MechanicWorkload.tickets)
+        .join(Mechanic, Mechanic.id == MechanicWorkload.mechanic_id)
+        .where(MechanicWorkload.tickets > 0)
+        .order_by(MechanicWorkload.week, MechanicWorkload.mechanic_id)
+    )
+    return [tuple(row) for row in rows]
+
+
+# Median wall time of fn() in ms, and its last result
+def median_ms(app, fn, repeat):
+    times = []
+    for _ in range(repeat):
+        with app.app_context():
+            start = time.perf_counter()
+            result = fn()
+            times.append(time.perf_counter() - start)
+            db.session.remove()
+    return statistics.median(times) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    add_size_arguments(parser)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    app = make_app()
+    sizes = seed_database(app, sizes_from_args(args), seed=args.seed)
+    app.config['CACHE_TYPE'] = 'NullCache'   # time the queries, not the response cache
+    cache.init_app(app)
+    with app.app_context():
+        token = encode_token(1, user_type='mechanic')
+    client = app.test_client()
+    headers = {'Authorization': f'Bearer {token}'}
+    print(f"{sizes['tickets']} tickets, {sizes['parts']} parts, {sizes['mechanics']} mechanics")
+
+    for name, adhoc, rollup, url in [
+        ('revenue per day', adhoc_revenue, rollup_revenue, '/reports/revenue'),
+        ('parts usage', adhoc_parts, rollup_parts, '/reports/parts?per_page=100'),
+        ('mechanic workload', adhoc_workload, rollup_workload, '/reports/mechanics'),
+    ]:
+        before, expected = median_ms(app, adhoc, args.repeat)
+        after, actual = median_ms(app, rollup, args.repeat)
+        assert actual == expected, f'{name}: rollup disagrees with the aggregate'
+        request_ms, response = median_ms(app, lambda: client.get(url, headers=headers), args.repeat)
+        assert response.status_code == 200
+        print(f"{name:<20} {len(actual):>6} rows  ad hoc {before:9.2f} ms  rollup {after:8.2f} ms  "
+              f"({before / after:6.1f}x)  GET {url} {request_ms:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
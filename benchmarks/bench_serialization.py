@@ -0,0 +1,87 @@
+# /benchmarks/bench_serialization.py
+
+# Serializing 10k rows per model with marshmallow's Schema.dump (before)
+# versus the compiled dump functions from app/utils/fastdump.py (after).
+# Rows are loaded once up front, so only serialization is timed.
+#
+#   python -m benchmarks.bench_serialization --rows 10000
+
+import argparse
+import random
+from datetime import date, timedelta
+from sqlalchemy import select
+from app.models import db, Customer, Mechanic, Service_Ticket, Inventory, ServiceTicketInventory, service_mechanic
+from app.blueprints.customers.schemas import customers_schema
+from app.blueprints.mechanics.schemas import mechanics_schema
+from app.blueprints.service_tickets.schemas import service_tickets_schema
+from app.blueprints.inventory.schemas import inventory_schema
+from .common import make_app, bulk_insert, timed
+
+
+def seed(app, rows, seed=42):
+    rng = random.Random(seed)
+    bulk_insert(app, Customer.__table__, (
+        {'id': i, 'name': f'Customer {i}', 'email': f'customer{i}@example.com', 'phone': '555-0100', 'password': 'x'}
+        for i in range(1, rows + 1)
+    ))
+    bulk_insert(app, Mechanic.__table__, (
+        {'id': i, 'name': f'Mechanic {i}', 'email': f'mechanic{i}@example.com', 'phone': '555-0100', 'salary': '50000', 'password': 'x'}
+        for i in range(1, rows + 1)
+    ))
+    bulk_insert(app, Service_Ticket.__table__, (
+        {'id': i, 'VIN': f'VIN{i:012d}', 'service_date': date(2023, 1, 1) + timedelta(days=rng.randrange(1095)),
+         'service_desc': 'Oil Change', 'customer_id': rng.randint(1, rows)}
+        for i in range(1, rows + 1)
+    ))
+    bulk_insert(app, Inventory.__table__, (
+        {'id': i, 'part_name': f'Part {i}', 'price': round(rng.uniform(5, 500), 2), 'stock': rng.choice([None, 10])}
+        for i in range(1, rows + 1)
+    ))
+    bulk_insert(app, service_mechanic, (
+        {'ticket_id': ticket_id, 'mechanic_id': mechanic_id}
+        for ticket_id in range(1, rows + 1)
+        for mechanic_id in rng.sample(range(1, rows + 1), 2)
+    ))
+    bulk_insert(app, ServiceTicketInventory.__table__, (
+        {'service_ticket_id': ticket_id, 'inventory_id': rng.randint(1, rows), 'quantity': rng.randint(1, 4)}
+        for ticket_id in range(1, rows + 1)
+    ))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    app = make_app()
+    seed(app, args.rows)
+    print(f"{args.rows} rows per model, best of {args.repeat}")
+
+    with app.app_context():
+        for schema, model in [
+            (customers_schema, Customer),
+            (mechanics_schema, Mechanic),
+            (service_tickets_schema, Service_Ticket),
+            (inventory_schema, Inventory),
+        ]:
+            query = select(model).options(*getattr(schema, 'load_options', ()))
+            rows = db.session.scalars(query).all()
+
+            results = {}
+            for fast in (False, True):
+                app.config['FAST_SERIALIZATION'] = fast
+                results[fast] = schema.dump(rows, many=True)
+                results[fast, 'time'] = min(timed(lambda: schema.dump(rows, many=True)) for _ in range(args.repeat))
+            assert results[True] == results[False], f'{type(schema).__name__} output differs'
+
+            before, after = results[False, 'time'], results[True, 'time']
+            print(
+                f"{type(schema).__name__:<24} marshmallow {before * 1000:8.1f} ms  "
+                f"compiled {after * 1000:7.1f} ms  {before / after:5.1f}x"
+            )
+            db.session.expunge_all()
+
+
+if __name__ == '__main__':
+    main()
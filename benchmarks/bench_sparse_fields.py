@@ -0,0 +1,71 @@
+# /benchmarks/bench_sparse_fields.py
+
+# Payload size and latency of a typical list page (100 items) with every
+# field (before) versus ?fields=id,name (after). The response cache is
+# cleared before each request so every request hits the database.
+#
+#   python -m benchmarks.bench_sparse_fields --requests 200
+
+import argparse
+import random
+import statistics
+import time
+from app.extensions import cache
+from app.models import Mechanic, service_mechanic
+from .common import make_app, bulk_insert, seed_service_tickets
+
+
+def seed(app, tickets, mechanics, seed=42):
+    rng = random.Random(seed)
+    seed_service_tickets(app, tickets)
+    bulk_insert(app, Mechanic.__table__, (
+        {'id': i, 'name': f'Mechanic {i}', 'email': f'mechanic{i}@example.com', 'phone': '555-0100', 'salary': '50000', 'password': 'x'}
+        for i in range(1, mechanics + 1)
+    ))
+    bulk_insert(app, service_mechanic, (
+        {'ticket_id': ticket_id, 'mechanic_id': mechanic_id}
+        for ticket_id in range(1, tickets + 1)
+        for mechanic_id in rng.sample(range(1, mechanics + 1), 2)
+    ))
+
+
+def measure(app, client, url, requests):
+    latencies = []
+    for _ in range(requests):
+        with app.app_context():
+            cache.clear()
+        start = time.perf_counter()
+        response = client.get(url)
+        latencies.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.status_code
+    return len(response.get_data()), latencies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--tickets', type=int, default=20000)
+    parser.add_argument('--mechanics', type=int, default=1000)
+    args = parser.parse_args()
+
+    app = make_app()
+    seed(app, args.tickets, args.mechanics)
+    client = app.test_client()
+
+    for label, url in [
+        ('customers, all fields', '/customers/?per_page=100'),
+        ('customers, ?fields=id,name', '/customers/?per_page=100&fields=id,name'),
+        ('mechanics, all fields', '/mechanics/?per_page=100'),
+        ('mechanics, ?fields=id,name', '/mechanics/?per_page=100&fields=id,name'),
+        ('service tickets, all fields', '/service_tickets/?per_page=100'),
+        ('service tickets, ?fields=id,VIN', '/service_tickets/?per_page=100&fields=id,VIN'),
+    ]:
+        size, latencies = measure(app, client, url, args.requests)
+        print(
+            f"{label:<34} {size:>8} bytes  p50 {statistics.median(latencies) * 1000:6.2f} ms  "
+            f"p95 {sorted(latencies)[int(len(latencies) * 0.95)] * 1000:6.2f} ms"
+        )
+
+
+if __name__ == '__main__':
+    main()
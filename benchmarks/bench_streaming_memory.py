@@ -0,0 +1,58 @@
+# /benchmarks/bench_streaming_memory.py
+
+# Peak Python memory (tracemalloc) for returning every service ticket:
+# the old unpaginated fallback (load the whole table, serialize, jsonify)
+# versus ?stream=true (yield_per chunks serialized as they are fetched).
+#
+#   python -m benchmarks.bench_streaming_memory --rows 500000
+
+import argparse
+import time
+import tracemalloc
+from sqlalchemy import select
+from app.models import db, Service_Ticket
+from app.blueprints.service_tickets.schemas import service_tickets_schema
+from .common import make_app, seed_service_tickets
+
+
+def measure(label, fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} peak {peak / 2**20:9.1f} MiB  {elapsed:7.2f} s  {size / 2**20:8.1f} MiB body")
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=500_000)
+    args = parser.parse_args()
+
+    app = make_app()
+    seed_service_tickets(app, args.rows)
+    client = app.test_client()
+
+    # What the list routes used to do when no page was requested
+    def load_everything():
+        with app.test_request_context('/service_tickets/'):
+            service_tickets = db.session.execute(select(Service_Ticket)).scalars().all()
+            body = service_tickets_schema.jsonify(service_tickets).get_data()
+            db.session.remove()
+            return len(body)
+
+    def stream():
+        response = client.get('/service_tickets/?stream=true', buffered=False)
+        size = sum(len(chunk) for chunk in response.response)
+        response.close()
+        return size
+
+    before = measure('load whole table (before)', load_everything)
+    after = measure('stream=true (after)', stream)
+    print(f"peak memory reduced {before / after:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
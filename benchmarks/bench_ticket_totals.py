@@ -0,0 +1,80 @@
+# /benchmarks/bench_ticket_totals.py
+
+# Parts totals for every ticket at once: walking each ticket's parts through
+# the ORM relationships (before - what clients did by hand), one GROUP BY
+# aggregate query, and reading the maintained service_tickets.parts_total
+# column (after). Also checks the three agree.
+#
+#   python -m benchmarks.bench_ticket_totals --tickets 10000
+
+import argparse
+import random
+import time
+from sqlalchemy import select
+from app.models import db, Service_Ticket, Inventory, ServiceTicketInventory
+from app.utils.totals import ticket_totals, recompute_parts_totals
+from .common import make_app, bulk_insert, seed_service_tickets
+
+
+def seed(app, tickets, parts, per_ticket, seed=42):
+    rng = random.Random(seed)
+    seed_service_tickets(app, tickets)
+    bulk_insert(app, Inventory.__table__, (
+        {'id': i, 'part_name': f'Part {i}', 'price': round(rng.uniform(5, 500), 2)}
+        for i in range(1, parts + 1)
+    ))
+    bulk_insert(app, ServiceTicketInventory.__table__, (
+        {'service_ticket_id': ticket_id, 'inventory_id': part_id, 'quantity': rng.randint(1, 4)}
+        for ticket_id in range(1, tickets + 1)
+        for part_id in rng.sample(range(1, parts + 1), rng.randint(0, per_ticket))
+    ))
+    with app.app_context():
+        recompute_parts_totals()
+        db.session.commit()
+
+
+def per_ticket():
+    totals = {}
+    for ticket in db.session.scalars(select(Service_Ticket)):
+        totals[ticket.id] = round(sum(link.quantity * link.inventory.price for link in ticket.service_ticket_inventory), 2)
+    return totals
+
+
+def aggregate():
+    return ticket_totals(db.session.scalars(select(Service_Ticket.id)).all())
+
+
+def materialized():
+    return dict(db.session.execute(select(Service_Ticket.id, Service_Ticket.parts_total)).all())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tickets', type=int, default=10000)
+    parser.add_argument('--parts', type=int, default=500)
+    parser.add_argument('--per-ticket', type=int, default=5)
+    args = parser.parse_args()
+
+    app = make_app()
+    seed(app, args.tickets, args.parts, args.per_ticket)
+    print(f"{args.tickets} tickets, up to {args.per_ticket} parts each")
+
+    results = []
+    for label, fn in [
+        ('per-ticket ORM walk (before)', per_ticket),
+        ('one aggregate query (after)', aggregate),
+        ('parts_total column (after)', materialized),
+    ]:
+        with app.app_context():
+            start = time.perf_counter()
+            totals = fn()
+            elapsed = time.perf_counter() - start
+            db.session.remove()
+        results.append(totals)
+        print(f"{label:<40} {len(totals):>8} tickets  {elapsed * 1000:9.1f} ms")
+
+    assert all(totals == results[0] for totals in results), 'totals disagree'
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+# /benchmarks/bench_token_required.py
+
+# Per-request overhead of @token_required: a full jwt.decode with the secret
+# string on every call (before), versus the verified-token cache (after).
+# Runs the decorated no-op view directly inside a request context, so only
+# the decorator is measured.
+#
+#   python -m benchmarks.bench_token_required --calls 20000
+
+import argparse
+from jose import jwt
+from flask import current_app
+from app.utils.util import encode_token, token_required, TokenState
+from .common import make_app, timed
+
+
+@token_required(required_type='mechanic')
+def view(user_id, user_type):
+    return user_id
+
+
+# What the decorator did before: parse the secret and verify every time
+def full_decode(token):
+    secret_key = current_app.config.get('SECRET_KEY', 'fallback-secret')
+    data = jwt.decode(token, secret_key, algorithms=['HS256'])
+    return data['sub']
+
+
+def per_call(label, seconds, calls):
+    print(f"{label:<40} {calls:>8} calls  {seconds / calls * 1e6:8.2f} us/call")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--calls', type=int, default=20000)
+    args = parser.parse_args()
+
+    app = make_app()
+    with app.app_context():
+        token = encode_token(1, user_type='mechanic')
+
+    with app.test_request_context(headers={'Authorization': f'Bearer {token}'}):
+        before = timed(lambda: full_decode(token), args.calls)
+        per_call('jwt.decode every request (before)', before, args.calls)
+
+        app.extensions['tokens'] = TokenState({**app.config, 'TOKEN_CACHE_SIZE': 0})
+        uncached = timed(view, args.calls)
+        per_call('token_required, cache disabled', uncached, args.calls)
+
+        app.extensions['tokens'] = TokenState(app.config)
+        view()  # warm up
+        after = timed(view, args.calls)
+        per_call('token_required, cached token (after)', after, args.calls)
+
+    print(f"speedup: {before / after:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+# /benchmarks/common.py
+
+# Shared helpers for the benchmark scripts
+
+import time
+from app import create_app
+from app.models import db
+
+
+# Fresh app + empty schema on the benchmark database (BENCHMARK_DATABASE_URL)
+def make_app(config_name='BenchmarkConfig'):
+    app = create_app(config_name)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+    return app
+
+
+# Run fn() n times and return the elapsed wall time in seconds
+def timed(fn, n=1):
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return time.perf_counter() - start
+
+
+def report(label, requests, seconds):
+    print(f"{label:<40} {requests:>8} req  {seconds:8.3f} s  {requests / seconds:10.1f} req/s")
+
+
+# Insert rows (an iterable of dicts) with executemany in chunks, one transaction
+def bulk_insert(app, table, rows, chunk_size=10000):
+    with app.app_context():
+        with db.engine.begin() as conn:
+            chunk = []
+            for row in rows:
+                chunk.append(row)
+                if len(chunk) == chunk_size:
+                    conn.execute(table.insert(), chunk)
+                    chunk = []
+            if chunk:
+                conn.execute(table.insert(), chunk)
+
+
+# Deterministic customers + service tickets (service dates spread over ~3 years)
+def seed_service_tickets(app, tickets, customers=1000, seed=42):
+    from datetime import date, timedelta
+    import random
+    from app.models import Customer, Service_Ticket
+
+    rng = random.Random(seed)
+    start = date(2023, 1, 1)
+    bulk_insert(app, Customer.__table__, (
+        {'id': i, 'name': f'Customer {i}', 'email': f'customer{i}@example.com', 'phone': '555-0100', 'password': 'x'}
+        for i in range(1, customers + 1)
+    ))
+    bulk_insert(app, Service_Ticket.__table__, (
+        {
+            'id': i,
+            'VIN': f'VIN{i:012d}',
+            'service_date': start + timedelta(days=rng.randrange(1095)),
+            'service_desc': 'Oil Change',
+            'customer_id': rng.randint(1, customers),
+        }
+        for i in range(1, tickets + 1)
+    ))
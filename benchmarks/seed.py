@@ -0,0 +1,95 @@
+# /benchmarks/seed.py
+
+# Deterministic data set for the benchmark suite: the same sizes and seed
+# always produce the same rows (ids, dates, prices, associations), so runs on
+# different days or branches measure the same database.
+#
+#   python -m benchmarks.seed --customers 2000 --tickets 20000
+
+import argparse
+import random
+from datetime import date, datetime, timedelta
+from app.models import db, Customer, Mechanic, Service_Ticket, Inventory, MechanicServiceTicket, ServiceTicketInventory, service_mechanic
+from app.utils.totals import recompute_parts_totals
+from app.utils import rollups
+from .common import make_app, bulk_insert
+
+DEFAULT_SIZES = {
+    'customers': 1000,
+    'mechanics': 50,
+    'tickets': 10000,
+    'parts': 500,
+    'mechanics_per_ticket': 2,
+    'parts_per_ticket': 2,
+}
+
+PART_NAMES = ['Brake Pad', 'Brake Rotor', 'Oil Filter', 'Air Filter', 'Spark Plug', 'Wiper Blade', 'Timing Belt', 'Headlight Bulb']
+
+
+def seed_database(app, sizes=None, seed=42):
+    sizes = dict(DEFAULT_SIZES, **(sizes or {}))
+    rng = random.Random(seed)
+    customers, mechanics, tickets, parts = sizes['customers'], sizes['mechanics'], sizes['tickets'], sizes['parts']
+
+    bulk_insert(app, Customer.__table__, (
+        {'id': i, 'name': f'Customer {i}', 'email': f'customer{i}@example.com', 'phone': '555-0100', 'password': 'x'}
+        for i in range(1, customers + 1)
+    ))
+    bulk_insert(app, Mechanic.__table__, (
+        {'id': i, 'name': f'Mechanic {i}', 'email': f'mechanic{i}@example.com', 'phone': '555-0100',
+         'salary': str(rng.randrange(40000, 90000, 1000)), 'password': 'x'}
+        for i in range(1, mechanics + 1)
+    ))
+    bulk_insert(app, Inventory.__table__, (
+        {'id': i, 'part_name': f'{PART_NAMES[i % len(PART_NAMES)]} {i}', 'price': round(rng.uniform(5, 500), 2), 'stock': None}
+        for i in range(1, parts + 1)
+    ))
+    bulk_insert(app, Service_Ticket.__table__, (
+        {'id': i, 'VIN': f'VIN{i:012d}', 'service_date': date(2023, 1, 1) + timedelta(days=rng.randrange(1095)),
+         'service_desc': 'Oil Change', 'customer_id': rng.randint(1, customers)}
+        for i in range(1, tickets + 1)
+    ))
+
+    assignments = [
+        (ticket_id, mechanic_id)
+        for ticket_id in range(1, tickets + 1)
+        for mechanic_id in rng.sample(range(1, mechanics + 1), min(sizes['mechanics_per_ticket'], mechanics))
+    ]
+    bulk_insert(app, service_mechanic, ({'ticket_id': t, 'mechanic_id': m} for t, m in assignments))
+    bulk_insert(app, MechanicServiceTicket.__table__, (
+        {'mechanic_id': m, 'service_id': t, 'start_date': datetime(2023, 1, 1) + timedelta(minutes=rng.randrange(1095 * 24 * 60))}
+        for t, m in assignments
+    ))
+    bulk_insert(app, ServiceTicketInventory.__table__, (
+        {'service_ticket_id': ticket_id, 'inventory_id': part_id, 'quantity': rng.randint(1, 4)}
+        for ticket_id in range(1, tickets + 1)
+        for part_id in rng.sample(range(1, parts + 1), min(sizes['parts_per_ticket'], parts))
+    ))
+
+    with app.app_context():
+        recompute_parts_totals()
+        rollups.rebuild()
+        db.session.commit()
+    return sizes
+
+
+def add_size_arguments(parser):
+    for name, default in DEFAULT_SIZES.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, default=default)
+    parser.add_argument('--seed', type=int, default=42)
+
+
+def sizes_from_args(args):
+    return {name: getattr(args, name) for name in DEFAULT_SIZES}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    add_size_arguments(parser)
+    args = parser.parse_args()
+    sizes = seed_database(make_app(), sizes_from_args(args), seed=args.seed)
+    print(', '.join(f'{name}={value}' for name, value in sizes.items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,274 @@
+# /benchmarks/suite.py
+
+# Load test for every blueprint. Seeds a deterministic database (see
+# benchmarks/seed.py), then runs each scenario below twice:
+#  - client: sequential requests through the Flask test client (no network,
+#    isolates the per-request cost)
+#  - server: the app behind an in-process threaded WSGI server, driven by
+#    --concurrency HTTP clients at once
+#
+# and reports p50/p95/p99 latency, requests/sec and SQL statements per request
+# for each. --output writes the results as JSON; --baseline compares against
+# an earlier --output file and exits with status 1 when a scenario regressed:
+# p95 or req/s worse than --tolerance (relative), or more queries per request
+# (exact - the data set is deterministic). Compare runs from the same machine.
+#
+#   python -m benchmarks.suite --output instance/benchmark-baseline.json
+#   python -m benchmarks.suite --baseline instance/benchmark-baseline.json
+
+import argparse
+import http.client
+import itertools
+import json
+import logging
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import threading
+import time
+from sqlalchemy import event
+from werkzeug.serving import make_server
+from app.extensions import cache
+from app.models import db
+from app.utils.util import encode_token
+from .common import make_app
+from .seed import seed_database, add_size_arguments, sizes_from_args
+
+TOKENS = 50   # customers with a pre-made login token for my-tickets
+
+
+# ----- Scenarios -----
+# Each takes (rng, sizes, state) and returns (method, url, json body, headers)
+
+def _page(rng, sizes, rows, per_page=20):
+    return rng.randint(1, max(1, sizes[rows] // per_page))
+
+
+SCENARIOS = {
+    'customers.list': lambda rng, sizes, state: ('GET', f"/customers/?page={_page(rng, sizes, 'customers')}&per_page=20", None, {}),
+    'customers.get': lambda rng, sizes, state: ('GET', f"/customers/{rng.randint(1, sizes['customers'])}", None, {}),
+    'customers.search': lambda rng, sizes, state: ('GET', f"/customers/search?email=customer{rng.randint(1, sizes['customers'])}", None, {}),
+    'customers.create': lambda rng, sizes, state: ('POST', '/customers/', {
+        'name': 'Bench', 'email': f"bench{next(state['counter'])}@example.com", 'phone': '555-0100', 'password': 'secret1'
+    }, {}),
+    'mechanics.list': lambda rng, sizes, state: ('GET', f"/mechanics/?page={_page(rng, sizes, 'mechanics', 10)}&per_page=10", None, {}),
+    'mechanics.get': lambda rng, sizes, state: ('GET', f"/mechanics/{rng.randint(1, sizes['mechanics'])}", None, {}),
+    'mechanics.popular': lambda rng, sizes, state: ('GET', '/mechanics/popular', None, {}),
+    'service_tickets.list': lambda rng, sizes, state: ('GET', f"/service_tickets/?page={_page(rng, sizes, 'tickets')}&per_page=20", None, {}),
+    'service_tickets.list_totals': lambda rng, sizes, state: ('GET', f"/service_tickets/?page={_page(rng, sizes, 'tickets')}&per_page=20&include=totals", None, {}),
+    'service_tickets.keyset': lambda rng, sizes, state: ('GET', '/service_tickets/?cursor=&per_page=20', None, {}),
+    'service_tickets.get': lambda rng, sizes, state: ('GET', f"/service_tickets/{rng.randint(1, sizes['tickets'])}", None, {}),
+    'service_tickets.invoice': lambda rng, sizes, state: ('GET', f"/service_tickets/{rng.randint(1, sizes['tickets'])}/invoice", None, {}),
+    'service_tickets.my_tickets': lambda rng, sizes, state: ('GET', '/service_tickets/my-tickets', None, {
+        'Authorization': f"Bearer {state['tokens'][rng.randrange(len(state['tokens']))]}"
+    }),
+    'service_tickets.add_part': lambda rng, sizes, state: ('PUT', f"/service_tickets/{rng.randint(1, sizes['tickets'])}/add-part", {
+        'part_id': rng.randint(1, sizes['parts']), 'quantity': 1
+    }, {}),
+    'inventory.list': lambda rng, sizes, state: ('GET', f"/inventory/?page={_page(rng, sizes, 'parts')}&per_page=20", None, {}),
+    'inventory.get': lambda rng, sizes, state: ('GET', f"/inventory/{rng.randint(1, sizes['parts'])}", None, {}),
+    'inventory.search': lambda rng, sizes, state: ('GET', f"/inventory/search?part_name={rng.choice(['brake', 'filter', 'plug', 'belt'])}", None, {}),
+    'reports.revenue': lambda rng, sizes, state: ('GET', f"/reports/revenue?start=2023-{rng.randint(1, 12):02d}-01", None, state['mechanic_headers']),
+    'reports.parts': lambda rng, sizes, state: ('GET', f"/reports/parts?page={_page(rng, sizes, 'parts')}&per_page=20", None, state['mechanic_headers']),
+    'reports.mechanics': lambda rng, sizes, state: ('GET', f"/reports/mechanics?mechanic_id={rng.randint(1, sizes['mechanics'])}", None, state['mechanic_headers']),
+}
+
+
+# The scenario's requests - the same list on every run
+def build_requests(name, n, sizes, state, seed):
+    rng = random.Random(f'{seed}:{name}')
+    return [SCENARIOS[name](rng, sizes, state) for _ in range(n)]
+
+
+class QueryCounter:
+    def __init__(self, app):
+        with app.app_context():
+            self.engine = db.engine
+        self.lock = threading.Lock()
+        self.count = 0
+
+    def _before_cursor_execute(self, *args):
+        with self.lock:
+            self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(self.engine, 'before_cursor_execute', self._before_cursor_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._before_cursor_execute)
+        return False
+
+
+def summarize(latencies, errors, queries, elapsed):
+    latencies = sorted(latencies)
+    def percentile(p):
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 3)
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(statistics.median(latencies) * 1000, 3),
+        'p95_ms': percentile(0.95),
+        'p99_ms': percentile(0.99),
+        'queries_per_request': round(queries / len(latencies), 2),
+    }
+
+
+# ----- Runners -----
+
+def run_client(app, requests, warmup):
+    client = app.test_client()
+    for method, url, body, headers in requests[:warmup]:
+        client.open(url, method=method, json=body, headers=headers)
+
+    latencies, errors = [], 0
+    with QueryCounter(app) as counter:
+        start = time.perf_counter()
+        for method, url, body, headers in requests[warmup:]:
+            began = time.perf_counter()
+            response = client.open(url, method=method, json=body, headers=headers)
+            latencies.append(time.perf_counter() - began)
+            errors += response.status_code >= 400
+        elapsed = time.perf_counter() - start
+    return summarize(latencies, errors, counter.count, elapsed)
+
+
+def _send(conn, method, url, body, headers):
+    payload = json.dumps(body).encode() if body is not None else None
+    headers = dict(headers, **({'Content-Type': 'application/json'} if payload else {}))
+    conn.request(method, url, body=payload, headers=headers)
+    response = conn.getresponse()
+    response.read()
+    return response.status
+
+
+def run_server(app, port, requests, warmup, concurrency):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    for request in requests[:warmup]:
+        _send(conn, *request)
+    conn.close()
+
+    timed = requests[warmup:]
+    latencies, errors = [], []
+    lock = threading.Lock()
+
+    def client(share):
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+        mine, failed = [], 0
+        for request in share:
+            began = time.perf_counter()
+            status = _send(conn, *request)
+            mine.append(time.perf_counter() - began)
+            failed += status >= 400
+        conn.close()
+        with lock:
+            latencies.extend(mine)
+            errors.append(failed)
+
+    threads = [threading.Thread(target=client, args=(timed[i::concurrency],)) for i in range(concurrency)]
+    with QueryCounter(app) as counter:
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+    return summarize(latencies, sum(errors), counter.count, elapsed)
+
+
+# ----- Baseline comparison -----
+
+def compare(results, baseline, tolerance, min_delta_ms=1.0):
+    regressions = []
+    for key, current in results['scenarios'].items():
+        before = baseline['scenarios'].get(key)
+        if before is None:
+            continue
+        if current['p95_ms'] > before['p95_ms'] * (1 + tolerance) and current['p95_ms'] - before['p95_ms'] > min_delta_ms:
+            regressions.append(f"{key}: p95 {before['p95_ms']} -> {current['p95_ms']} ms")
+        if current['rps'] < before['rps'] * (1 - tolerance):
+            regressions.append(f"{key}: {before['rps']} -> {current['rps']} req/s")
+        if current['queries_per_request'] > before['queries_per_request']:
+            regressions.append(f"{key}: {before['queries_per_request']} -> {current['queries_per_request']} queries/request")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    add_size_arguments(parser)
+    parser.add_argument('--requests', type=int, default=200, help='timed requests per scenario and mode')
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--mode', choices=['client', 'server', 'both'], default='both')
+    parser.add_argument('--scenario', action='append', help='run only these (repeatable)')
+    parser.add_argument('--no-cache', action='store_true', help='disable the response cache')
+    parser.add_argument('--output', help='write the results as JSON')
+    parser.add_argument('--baseline', help='JSON from an earlier --output to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    args = parser.parse_args()
+
+    app = make_app()
+    sizes = seed_database(app, sizes_from_args(args), seed=args.seed)
+    if args.no_cache:
+        app.config['CACHE_TYPE'] = 'NullCache'
+        cache.init_app(app)
+    with app.app_context():
+        tokens = [encode_token(customer_id, user_type='customer') for customer_id in range(1, min(TOKENS, sizes['customers']) + 1)]
+        mechanic_headers = {'Authorization': f"Bearer {encode_token(1, user_type='mechanic')}"}
+    state = {'counter': itertools.count(1), 'tokens': tokens, 'mechanic_headers': mechanic_headers}
+    names = args.scenario or list(SCENARIOS)
+    modes = ['client', 'server'] if args.mode == 'both' else [args.mode]
+
+    server = None
+    if 'server' in modes:
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)   # no access log
+        server = make_server('127.0.0.1', 0, app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    results = {
+        'meta': {
+            'sizes': sizes, 'seed': args.seed, 'requests': args.requests, 'concurrency': args.concurrency,
+            'cache': not args.no_cache, 'database': app.config['SQLALCHEMY_DATABASE_URI'].split(':')[0],
+            'python': platform.python_version(), 'sqlite': sqlite3.sqlite_version,
+        },
+        'scenarios': {},
+    }
+    print(f"{'scenario':<40} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'q/req':>6} {'errors':>6}")
+    try:
+        for mode in modes:
+            for name in names:
+                requests = build_requests(name, args.warmup + args.requests, sizes, state, args.seed)
+                if mode == 'client':
+                    result = run_client(app, requests, args.warmup)
+                else:
+                    result = run_server(app, server.server_port, requests, args.warmup, args.concurrency)
+                key = f'{mode}:{name}'
+                results['scenarios'][key] = result
+                print(f"{key:<40} {result['rps']:>9.1f} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} "
+                      f"{result['p99_ms']:>8.2f} {result['queries_per_request']:>6.2f} {result['errors']:>6}")
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f'\n{len(regressions)} regression(s) against {args.baseline}:')
+            for line in regressions:
+                print(f'  {line}')
+            sys.exit(1)
+        print(f'\nNo regressions against {args.baseline}.')
+
+
+if __name__ == '__main__':
+    main()
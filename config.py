@@ -5,23 +5,86 @@ from dotenv import load_dotenv
 dotenv_path = os.path.join(os.path.dirname(__file__), '.env')
 load_dotenv(dotenv_path)
 
+# Connection pool settings - keeps database connections warm across requests
+# instead of paying a fresh TCP/auth handshake every time. SQLite gets the
+# driver defaults chosen by Flask-SQLAlchemy (its pool classes don't take these).
+def engine_options(database_uri):
+    if database_uri.startswith('sqlite'):
+        return {}
+    return {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', 10)),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 20)),
+        'pool_timeout': int(os.getenv('DB_POOL_TIMEOUT', 30)),
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 1800)),
+        'pool_pre_ping': os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true',
+    }
+
+# Cache / rate-limit storage. The defaults are per-process (fine for one
+# worker); with several gunicorn workers share them through a local SQLite
+# file or Redis (see app/utils/sqlite_storage.py), e.g. in .env:
+#   CACHE_TYPE=app.utils.sqlite_storage.SQLiteCache  RATELIMIT_STORAGE_URI=sqlite:///instance/ratelimit.db
+#   CACHE_TYPE=RedisCache CACHE_REDIS_URL=redis://...  RATELIMIT_STORAGE_URI=redis://...
+
 class DevelopmentConfig:
     DEBUG = True
     SECRET_KEY = os.getenv('SECRET_KEY', 'fallback-secret')
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///fallback.db')
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+    SQLALCHEMY_DISPOSE_ON_TEARDOWN = False
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    CACHE_TYPE = 'SimpleCache'
+    CACHE_TYPE = os.getenv('CACHE_TYPE', 'SimpleCache')
+    CACHE_SQLITE_PATH = os.getenv('CACHE_SQLITE_PATH')
+    CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL')
+    RATELIMIT_STORAGE_URI = os.getenv('RATELIMIT_STORAGE_URI', 'memory://')
     RATELIMIT_DEFAULT = '200 per day;50 per hour'
+    # Password hashing (see app/utils/passwords.py)
+    PASSWORD_SCRYPT_N = int(os.getenv('PASSWORD_SCRYPT_N', 2 ** 14))
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', os.cpu_count() or 1))
+    # auto | fts5 | trigram | ngram | like (see app/search.py)
+    SEARCH_BACKEND = os.getenv('SEARCH_BACKEND', 'auto')
+    # Compiled serializers for list responses (see app/utils/fastdump.py)
+    FAST_SERIALIZATION = os.getenv('FAST_SERIALIZATION', 'true').lower() == 'true'
+    # Async engine for the ASGI entry point, default derived from the URI above (see app/asgi.py)
+    ASYNC_DATABASE_URI = os.getenv('ASYNC_DATABASE_URI')
+    # Server-Timing headers + GET /metrics (see app/utils/metrics.py)
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'false').lower() == 'true'
+    # Log statements slower than this many ms, with their plan (see app/utils/slow_queries.py)
+    SLOW_QUERY_MS = os.getenv('SLOW_QUERY_MS')
 
 class TestingConfig:
     DEBUG = True
     TESTING = True
     SECRET_KEY = os.getenv('SECRET_KEY', 'fallback-secret')
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///fallback_test.db')
+    # Tests recreate the SQLite file constantly - drop pooled connections after
+    # every request so no handle is left open (avoids ResourceWarning)
+    SQLALCHEMY_DISPOSE_ON_TEARDOWN = True
     CACHE_TYPE = 'SimpleCache'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Cheap hashes, computed inline - tests create and log in users constantly
+    PASSWORD_SCRYPT_N = 16
+    PASSWORD_HASH_WORKERS = 0
 
 class ProductionConfig:
     SQLALCHEMY_DATABASE_URI = os.environ.get('SQLALCHEMY_DATABASE_URI') or 'sqlite:///app.db'
-    CACHE_TYPE = "SimpleCache"
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+    SQLALCHEMY_DISPOSE_ON_TEARDOWN = False
+    CACHE_TYPE = os.getenv('CACHE_TYPE', 'SimpleCache')
+    CACHE_SQLITE_PATH = os.getenv('CACHE_SQLITE_PATH')
+    CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL')
+    RATELIMIT_STORAGE_URI = os.getenv('RATELIMIT_STORAGE_URI', 'memory://')
+    PASSWORD_SCRYPT_N = int(os.getenv('PASSWORD_SCRYPT_N', 2 ** 14))
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', os.cpu_count() or 1))
+    SEARCH_BACKEND = os.getenv('SEARCH_BACKEND', 'auto')
+    FAST_SERIALIZATION = os.getenv('FAST_SERIALIZATION', 'true').lower() == 'true'
+    ASYNC_DATABASE_URI = os.getenv('ASYNC_DATABASE_URI')
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'false').lower() == 'true'
+    SLOW_QUERY_MS = os.getenv('SLOW_QUERY_MS')
 
+# Used by the scripts in /benchmarks - separate database file, no rate limits
+class BenchmarkConfig(TestingConfig):
+    DEBUG = False
+    SQLALCHEMY_DATABASE_URI = os.getenv('BENCHMARK_DATABASE_URL', 'sqlite:///benchmark.db')
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+    SQLALCHEMY_DISPOSE_ON_TEARDOWN = False
+    RATELIMIT_ENABLED = False
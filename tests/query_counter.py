@@ -0,0 +1,31 @@
+# /tests/query_counter.py
+
+# Test helper - counts the SQL statements sent to the database while the
+# block runs, e.g.
+#
+#   with count_queries(self.app) as counter:
+#       self.client.get('/mechanics/popular')
+#   self.assertEqual(counter.count, 1)
+
+from sqlalchemy import event
+from app.models import db
+
+
+class count_queries:
+    def __init__(self, app):
+        with app.app_context():
+            self.engine = db.engine
+        self.count = 0
+        self.statements = []
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self._before_cursor_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._before_cursor_execute)
+        return False
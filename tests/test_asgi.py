@@ -0,0 +1,131 @@
+# /tests/test_asgi.py
+
+import asyncio
+import json
+import unittest
+from datetime import date
+from urllib.parse import urlsplit
+from app import create_app
+from app.asgi import create_asgi_app
+from app.models import db, Customer, Service_Ticket, Inventory
+from app.utils.util import encode_token
+from app.extensions import cache
+
+
+# One request through the ASGI app -> (status, headers, body)
+async def asgi_request(app, method, url, headers=None, body=b''):
+    parts = urlsplit(url)
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'path': parts.path,
+        'raw_path': parts.path.encode(),
+        'query_string': parts.query.encode(),
+        'root_path': '',
+        'headers': [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()],
+        'client': ('127.0.0.1', 12345),
+        'server': ('localhost', 80),
+    }
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    start = sent[0]
+    body = b''.join(message.get('body', b'') for message in sent[1:])
+    return start['status'], {name.decode(): value.decode() for name, value in start['headers']}, body
+
+
+class TestAsgi(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('TestingConfig')
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.drop_all()
+            db.create_all()
+            customer = Customer(name='Test Customer', email='test@example.com', phone='123-456-7890', password='123456')
+            db.session.add(customer)
+            db.session.add(Inventory(part_name='Brake Pad', price=25.0))
+            db.session.commit()
+            for i in range(3):
+                db.session.add(Service_Ticket(VIN=f'VIN{i}', service_date=date(2025, 1, 1), service_desc='Oil Change', customer_id=customer.id))
+            db.session.commit()
+            self.customer_id = customer.id
+            self.token = encode_token(customer.id, user_type='customer')
+        self.asgi = create_asgi_app(self.app)
+        # Paths handed on to the Flask app
+        self.wsgi_paths = []
+        wsgi = self.asgi.wsgi
+        async def recording_wsgi(scope, receive, send):
+            self.wsgi_paths.append(scope['path'])
+            await wsgi(scope, receive, send)
+        self.asgi.wsgi = recording_wsgi
+
+    # Runs the requests on one event loop, then closes the async engine's connections
+    def run_requests(self, *requests):
+        async def main():
+            try:
+                return [await asgi_request(self.asgi, *request) for request in requests]
+            finally:
+                await self.asgi.dispose()
+        return asyncio.run(main())
+
+    # The async routes answer exactly like the Flask ones ⚡ Tested!
+    def test_async_reads_match_wsgi(self):
+        auth = {'Authorization': f'Bearer {self.token}'}
+        urls = [
+            ('/service_tickets/?page=1&per_page=2', {}),
+            ('/service_tickets/?fields=id,VIN', {}),
+            ('/service_tickets/my-tickets', auth),
+            (f'/customers/{self.customer_id}', {}),
+            ('/customers/search?email=example', {}),
+            ('/inventory/search?part_name=brake', {}),
+        ]
+        responses = self.run_requests(*[('GET', url, headers) for url, headers in urls])
+        self.assertEqual(self.wsgi_paths, [])
+        for (url, headers), (status, _, body) in zip(urls, responses):
+            cache.clear()
+            expected = self.client.get(url, headers=headers)
+            self.assertEqual(status, expected.status_code, url)
+            self.assertEqual(json.loads(body), expected.json, url)
+        self.assertEqual(len(json.loads(responses[0][2])), 2)
+        self.assertEqual(len(json.loads(responses[2][2])), 3)
+
+    # Negative Test - errors keep their Flask responses ⚡ Tested!
+    def test_async_errors(self):
+        (missing, _, missing_body), (no_token, _, no_token_body), (bad_fields, _, bad_fields_body) = self.run_requests(
+            ('GET', '/customers/999'),
+            ('GET', '/service_tickets/my-tickets'),
+            ('GET', '/service_tickets/?fields=id,nope'),
+        )
+        self.assertEqual(missing, 404)
+        self.assertEqual(json.loads(missing_body), {'error': 'Customer not found.'})
+        self.assertEqual(no_token, 400)
+        self.assertEqual(json.loads(no_token_body), {'message': 'You must be logged in to access this.'})
+        self.assertEqual(bad_fields, 400)
+        self.assertEqual(json.loads(bad_fields_body)['invalid_fields'], ['nope'])
+        self.assertEqual(self.wsgi_paths, [])
+
+    # Writes and the other list modes are served by the Flask app ⚡ Tested!
+    def test_other_requests_go_to_flask(self):
+        payload = json.dumps({'part_name': 'Oil Filter', 'price': 9.5}).encode()
+        (created, _, _), (streamed, _, streamed_body), (unknown, _, _) = self.run_requests(
+            ('POST', '/inventory/', {'Content-Type': 'application/json', 'Content-Length': str(len(payload))}, payload),
+            ('GET', '/service_tickets/?stream=true'),
+            ('GET', '/nowhere'),
+        )
+        self.assertEqual(created, 201)
+        self.assertEqual(streamed, 200)
+        self.assertEqual(len(json.loads(streamed_body)), 3)
+        self.assertEqual(unknown, 404)
+        self.assertEqual(self.wsgi_paths, ['/inventory/', '/service_tickets/', '/nowhere'])
+        with self.app.app_context():
+            self.assertIsNotNone(db.session.execute(db.select(Inventory).filter_by(part_name='Oil Filter')).scalar())
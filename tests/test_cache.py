@@ -0,0 +1,110 @@
+# /tests/test_cache.py
+
+import unittest
+from sqlalchemy import update
+from app import create_app
+from app.models import db, Inventory, Mechanic
+from app.utils.util import encode_token
+from app.utils import cache as response_cache
+from app.extensions import cache
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('TestingConfig')
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.drop_all()
+            db.create_all()
+            cache.clear()
+            db.session.add_all([Inventory(part_name=f'Part {i}', price=10.0 + i) for i in range(15)])
+            self.mechanic = Mechanic(
+                name='Test Mechanic',
+                email='testmech@email.com',
+                phone='123-456-7890',
+                salary="50000",
+                password='123456'
+            )
+            db.session.add(self.mechanic)
+            db.session.commit()
+            self.token = encode_token(self.mechanic.id, user_type='mechanic')
+
+    # Query String Is Part of the Key Test - ⚡ Tested!
+    def test_pages_cached_separately(self):
+        first = self.client.get('/inventory/?page=1&per_page=10')
+        second = self.client.get('/inventory/?page=2&per_page=10')
+        self.assertEqual(first.headers['X-Cache'], 'MISS')
+        self.assertEqual(second.headers['X-Cache'], 'MISS')
+        self.assertEqual(len(first.json), 10)
+        self.assertEqual(len(second.json), 5)
+        self.assertNotEqual(first.json, second.json)
+
+        # Same arguments in a different order hit the same entry
+        again = self.client.get('/inventory/?per_page=10&page=2')
+        self.assertEqual(again.headers['X-Cache'], 'HIT')
+        self.assertEqual(again.json, second.json)
+
+    # Create Invalidates the List Test - ⚡ Tested!
+    def test_create_inventory_invalidates(self):
+        self.client.get('/inventory/?page=2&per_page=10')
+        response = self.client.post('/inventory/', json={"part_name": "New Part", "price": 5.0},
+                                    headers={"Authorization": f"Bearer {self.token}"})
+        self.assertEqual(response.status_code, 201)
+
+        response = self.client.get('/inventory/?page=2&per_page=10')
+        self.assertEqual(response.headers['X-Cache'], 'MISS')
+        self.assertIn('New Part', [part['part_name'] for part in response.json])
+
+    # Update Invalidates the List Test - ⚡ Tested!
+    def test_update_mechanic_invalidates(self):
+        self.client.get('/mechanics/')
+        payload = {
+            'name': 'Updated Mechanic',
+            'email': 'testmech@email.com',
+            'phone': '123-456-7890',
+            'salary': "60000",
+            'password': '123456'
+        }
+        response = self.client.put('/mechanics/', json=payload, headers={'Authorization': 'Bearer ' + self.token})
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get('/mechanics/')
+        self.assertEqual(response.headers['X-Cache'], 'MISS')
+        self.assertEqual(response.json[0]['name'], 'Updated Mechanic')
+
+    # Bulk (Core) Statement Invalidates the List Test - ⚡ Tested!
+    def test_bulk_update_invalidates(self):
+        self.client.get('/inventory/')
+        with self.app.app_context():
+            db.session.execute(update(Inventory).values(price=1.0))
+            db.session.commit()
+        response = self.client.get('/inventory/')
+        self.assertEqual(response.headers['X-Cache'], 'MISS')
+        self.assertTrue(all(part['price'] == 1.0 for part in response.json))
+
+    # Negative Test - Rolled Back Writes Keep the Entry ⚡ Tested!
+    def test_rollback_keeps_entry(self):
+        self.client.get('/inventory/')
+        with self.app.app_context():
+            db.session.execute(update(Inventory).values(price=1.0))
+            db.session.rollback()
+        response = self.client.get('/inventory/')
+        self.assertEqual(response.headers['X-Cache'], 'HIT')
+
+    # Hit/Miss Counters Test - ⚡ Tested!
+    def test_cache_stats(self):
+        before = response_cache.stats.as_dict()
+        self.client.get('/customers/')
+        self.client.get('/customers/')
+        self.client.get('/customers/')
+        response = self.client.get('/cache/stats')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['hits'] - before['hits'], 2)
+        self.assertEqual(response.json['misses'] - before['misses'], 1)
+        self.assertGreater(response.json['hit_ratio'], 0)
+
+    # Negative Test - Streamed Responses Aren't Cached ⚡ Tested!
+    def test_stream_not_cached(self):
+        self.client.get('/inventory/?stream=true')
+        response = self.client.get('/inventory/?stream=true')
+        self.assertEqual(response.headers['X-Cache'], 'MISS')
+        self.assertEqual(len(response.json), 15)
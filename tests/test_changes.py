@@ -0,0 +1,257 @@
+# /tests/test_changes.py
+
+import json
+import threading
+import time
+import unittest
+from datetime import timedelta
+from unittest.mock import patch
+from sqlalchemy import select
+from app import create_app
+from app.models import db, Customer, Mechanic, Inventory, Change
+from app.utils import changes
+from app.utils.util import encode_token
+
+class TestChanges(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('TestingConfig')
+        self.app.config['CHANGES_POLL_SECONDS'] = 0.05
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.drop_all()
+            db.create_all()
+            customer = Customer(name='Feed Customer', email='feed@example.com', phone='123-456-7890', password='123456')
+            mechanic = Mechanic(name='Feed Mechanic', email='feedmech@example.com', phone='123-456-7890', salary='50000', password='123456')
+            part = Inventory(part_name='Brake Pad', price=40.0, stock=10)
+            db.session.add_all([customer, mechanic, part])
+            db.session.commit()
+            self.customer_id = customer.id
+            self.mechanic_id = mechanic.id
+            self.part_id = part.id
+            self.headers = {'Authorization': f'Bearer {encode_token(mechanic.id, user_type="mechanic")}'}
+
+    def entries(self, since=0):
+        with self.app.app_context():
+            return [
+                (change.entity, change.row_id, change.op)
+                for change in db.session.scalars(select(Change).where(Change.seq > since).order_by(Change.seq))
+            ]
+
+    def last_seq(self):
+        with self.app.app_context():
+            return changes.latest_seq()
+
+    def create_ticket(self, vin, mechanic_ids=()):
+        response = self.client.post('/service_tickets/', json={
+            'VIN': vin, 'service_date': '2025-03-03', 'service_desc': 'Brakes',
+            'customer_id': self.customer_id, 'mechanic_ids': list(mechanic_ids)
+        })
+        self.assertEqual(response.status_code, 201)
+        return response.json['id']
+
+    # Every Write Appends To The Change Log - ⚡ Tested!
+    def test_writes_are_logged(self):
+        self.assertEqual(self.entries(), [
+            ('customers', self.customer_id, 'insert'),
+            ('mechanics', self.mechanic_id, 'insert'),
+            ('inventory', self.part_id, 'insert'),
+        ])
+
+        # A ticket with a mechanic updates the mechanic too
+        seq = self.last_seq()
+        ticket_id = self.create_ticket('FEEDVIN1', [self.mechanic_id])
+        self.assertEqual(self.entries(seq), [('service_tickets', ticket_id, 'insert'), ('mechanics', self.mechanic_id, 'update')])
+
+        # Core writes: add-part takes stock and adds a line and a total
+        seq = self.last_seq()
+        response = self.client.put(f'/service_tickets/{ticket_id}/add-part', json={'part_id': self.part_id, 'quantity': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.entries(seq), [('inventory', self.part_id, 'update'), ('service_tickets', ticket_id, 'update')])
+
+        # A price change shifts the totals of the tickets using the part
+        seq = self.last_seq()
+        response = self.client.put(f'/inventory/{self.part_id}', json={'price': 45.0}, headers=self.headers)
+        self.assertEqual(response.status_code, 201)
+        self.assertCountEqual(self.entries(seq), [('service_tickets', ticket_id, 'update'), ('inventory', self.part_id, 'update')])
+
+        # Mechanics removed with Core statements, then added through the ORM
+        seq = self.last_seq()
+        response = self.client.put(f'/service_tickets/{ticket_id}', json={'add_ids': [], 'remove_ids': [self.mechanic_id]})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.post(f'/mechanics/{self.mechanic_id}/add-ticket/{ticket_id}', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.entries(seq), [
+            ('service_tickets', ticket_id, 'update'), ('mechanics', self.mechanic_id, 'update'),
+            ('mechanics', self.mechanic_id, 'update'), ('service_tickets', ticket_id, 'update'),
+        ])
+
+        # Bulk inserts
+        seq = self.last_seq()
+        response = self.client.post('/inventory/bulk', json=[{'part_name': 'Oil Filter', 'price': 12.5}, {'part_name': 'Spark Plug', 'price': 8.0}])
+        self.assertEqual(response.status_code, 201)
+        ids = [result['id'] for result in response.json['results']]
+        self.assertEqual(self.entries(seq), [('inventory', ids[0], 'insert'), ('inventory', ids[1], 'insert')])
+
+        # Deletes, once per row
+        seq = self.last_seq()
+        response = self.client.delete(f'/inventory/{ids[0]}', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.entries(seq), [('inventory', ids[0], 'delete')])
+
+    # Rolled Back Writes Leave No Entry - ⚡ Tested!
+    def test_rollback(self):
+        seq = self.last_seq()
+        with self.app.app_context():
+            customer = db.session.get(Customer, self.customer_id)
+            customer.name = 'Renamed'
+            db.session.flush()
+            self.assertEqual(db.session.scalar(select(Change.entity).where(Change.seq > seq)), 'customers')
+            db.session.rollback()
+        self.assertEqual(self.entries(seq), [])
+
+        # Out of stock: the stock UPDATE matches nothing and the request rolls back
+        ticket_id = self.create_ticket('FEEDVIN1')
+        seq = self.last_seq()
+        response = self.client.put(f'/service_tickets/{ticket_id}/add-part', json={'part_id': self.part_id, 'quantity': 99})
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.entries(seq), [])
+
+    # Changes Since A Seq, With Current Rows - ⚡ Tested!
+    def test_get_changes(self):
+        ticket_id = self.create_ticket('FEEDVIN1', [self.mechanic_id])
+
+        response = self.client.get('/changes?limit=2')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([change['entity'] for change in response.json['changes']], ['customers', 'mechanics'])
+        self.assertEqual(response.json['changes'][0]['data']['email'], 'feed@example.com')
+        self.assertNotIn('password', response.json['changes'][0]['data'])
+        self.assertEqual(response.json['next'], response.json['changes'][1]['seq'])
+        self.assertEqual(response.json['last_seq'], 5)
+        self.assertTrue(response.json['more'])
+
+        response = self.client.get(f"/changes?since={response.json['next']}")
+        self.assertEqual([(change['entity'], change['op']) for change in response.json['changes']],
+                         [('inventory', 'insert'), ('service_tickets', 'insert'), ('mechanics', 'update')])
+        self.assertEqual(response.json['changes'][1]['data']['VIN'], 'FEEDVIN1')
+        self.assertEqual(response.json['changes'][2]['data']['service_tickets'], [ticket_id])
+        self.assertFalse(response.json['more'])
+
+        # Caught up
+        response = self.client.get('/changes?since=5')
+        self.assertEqual((response.json['changes'], response.json['next']), ([], 5))
+
+        # Filtered by entity, without the rows
+        response = self.client.get('/changes?entity=service_tickets,inventory&data=false')
+        self.assertEqual([change['entity'] for change in response.json['changes']], ['inventory', 'service_tickets'])
+        self.assertNotIn('data', response.json['changes'][0])
+
+        # A deleted row has no data
+        response = self.client.delete(f'/inventory/{self.part_id}', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get('/changes?entity=inventory')
+        self.assertEqual([(change['op'], change['data']) for change in response.json['changes']], [('insert', None), ('delete', None)])
+
+    # Negative Test - Invalid Feed Parameters - ⚡ Tested!
+    def test_invalid_params(self):
+        self.assertEqual(self.client.get('/changes?since=-1').status_code, 400)
+        self.assertEqual(self.client.get('/changes?limit=5000').status_code, 400)
+        response = self.client.get('/changes?entity=tickets')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('entity', response.json)
+
+    # Long Poll Returns When A Change Commits - ⚡ Tested!
+    def test_long_poll(self):
+        seq = self.last_seq()
+        started = time.monotonic()
+        response = self.client.get(f'/changes?since={seq}&wait=0.2')
+        self.assertEqual(response.json['changes'], [])
+        self.assertGreaterEqual(time.monotonic() - started, 0.2)
+
+        def rename():
+            time.sleep(0.2)
+            with self.app.app_context():
+                db.session.get(Customer, self.customer_id).name = 'Renamed'
+                db.session.commit()
+
+        writer = threading.Thread(target=rename)
+        writer.start()
+        started = time.monotonic()
+        response = self.client.get(f'/changes?since={seq}&wait=10')
+        writer.join()
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual([(change['entity'], change['op']) for change in response.json['changes']], [('customers', 'update')])
+        self.assertEqual(response.json['changes'][0]['data']['name'], 'Renamed')
+
+    # Server-Sent Events Stream - ⚡ Tested!
+    def test_stream(self):
+        response = self.client.get('/changes/stream?data=false', headers={'Last-Event-ID': '1'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'text/event-stream')
+        events = iter(response.response)
+        first = next(events).decode()
+        self.assertTrue(first.startswith('id: 2\nevent: change\ndata: '))
+        item = json.loads(first.split('data: ', 1)[1])
+        self.assertEqual((item['seq'], item['entity'], item['id'], item['op']), (2, 'mechanics', self.mechanic_id, 'insert'))
+        self.assertNotIn('data', item)
+        self.assertTrue(next(events).startswith(b'id: 3\n'))
+
+        # Waits for the next commit
+        with self.app.app_context():
+            db.session.get(Customer, self.customer_id).name = 'Renamed'
+            db.session.commit()
+        item = json.loads(next(events).decode().split('data: ', 1)[1])
+        self.assertEqual((item['seq'], item['entity'], item['op']), (4, 'customers', 'update'))
+        response.close()
+
+    # Pruned Changes Answer 410 - ⚡ Tested!
+    def test_prune(self):
+        runner = self.app.test_cli_runner()
+        result = runner.invoke(args=['changes', 'prune', '--days', '30'])
+        self.assertIn('Deleted 0 changes', result.output)
+        with self.app.app_context():
+            self.assertEqual(changes.prune(changes.utcnow() + timedelta(seconds=1)), 2)   # all but the newest
+            db.session.commit()
+        self.assertEqual(self.client.get('/changes?since=3').status_code, 200)
+
+        # New entries keep counting up from the pruned ones
+        self.create_ticket('FEEDVIN1')
+        response = self.client.get('/changes?since=0')
+        self.assertEqual(response.status_code, 410)
+        self.assertEqual(response.json['last_seq'], 4)
+        response = self.client.get('/changes?since=3')
+        self.assertEqual([change['seq'] for change in response.json['changes']], [4])
+
+    # Pruning Everything Old Keeps The Seq - ⚡ Tested!
+    def test_prune_all(self):
+        with self.app.app_context():
+            changes.prune(changes.utcnow() + timedelta(seconds=1))
+            changes.prune(changes.utcnow() + timedelta(seconds=1))   # again: still keeps the newest
+            db.session.commit()
+        response = self.client.get('/changes?since=1')
+        self.assertEqual(response.status_code, 410)
+        self.assertEqual(response.json['last_seq'], 3)
+        self.assertEqual(self.client.get('/changes/stream?since=1').status_code, 410)
+
+        # A client that had caught up isn't sent backwards
+        response = self.client.get('/changes?since=3')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.json['changes'], response.json['next'], response.json['last_seq']), ([], 3, 3))
+
+    # Postgres Writers Take The Change Log Lock Once Per Transaction - ⚡ Tested!
+    def test_postgres_lock(self):
+        locks = []
+        with self.app.app_context():
+            # Stands in for Postgres' function on the SQLite connection
+            db.session.connection().connection.driver_connection.create_function('pg_advisory_xact_lock', 1, locks.append)
+            with patch.object(db.engine.dialect, 'name', 'postgresql'):
+                customer = db.session.get(Customer, self.customer_id)
+                customer.name = 'Renamed'
+                db.session.flush()
+                db.session.get(Inventory, self.part_id).price = 41.0
+                db.session.flush()
+                self.assertEqual(locks, [changes.CHANGE_LOG_LOCK])
+                db.session.commit()
+
+                customer.name = 'Renamed Again'
+                db.session.commit()
+        self.assertEqual(locks, [changes.CHANGE_LOG_LOCK] * 2)
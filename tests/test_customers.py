@@ -5,6 +5,8 @@ from app import create_app
 from app.models import db, Customer
 from app.utils.util import encode_token
 from marshmallow import ValidationError
+from app.extensions import cache
+from query_counter import count_queries
 
 class TestCustomer(unittest.TestCase):
     def setUp(self):
@@ -139,6 +141,100 @@ class TestCustomer(unittest.TestCase):
         response_bad = self.client.get('/customers/search?email=nomatch@example.com')
         self.assertEqual(response_bad.status_code, 200)
         self.assertEqual(response_bad.json, [])
+
+    # Get All Customers Statement Count Doesn't Grow With Rows - ⚡ Tested!
+    def test_get_customers_query_count(self):
+        def add_customers(start, count):
+            with self.app.app_context():
+                for i in range(start, start + count):
+                    db.session.add(Customer(name=f'Customer {i}', email=f'c{i}@example.com', phone='111', password='123456'))
+                db.session.commit()
+                cache.clear()
+
+        add_customers(0, 3)
+        with count_queries(self.app) as small:
+            self.client.get('/customers/?page=1&per_page=100')
+        add_customers(3, 30)
+        with count_queries(self.app) as large:
+            response = self.client.get('/customers/?page=1&per_page=100')
+        self.assertEqual(len(response.json), 34)
+        self.assertEqual(small.count, large.count)
+
+    # Get All Customers With a Cursor Test - ⚡ Tested!
+    def test_get_customers_with_cursor(self):
+        with self.app.app_context():
+            db.session.add(Customer(name='Second User', email='second@example.com', phone='111', password='123456'))
+            db.session.commit()
+
+        response = self.client.get('/customers/?cursor=&per_page=1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['items'][0]['name'], 'Test User')
+
+        # Each cursor is its own cache entry
+        response = self.client.get(f"/customers/?cursor={response.json['next_cursor']}&per_page=1")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['items'][0]['name'], 'Second User')
+        self.assertIsNone(response.json['next_cursor'])
+
+
+    # Bulk Create Customers Test - ⚡ Tested!
+    def test_bulk_create_customers(self):
+        payload = [
+            {'name': f'Bulk {i}', 'email': f'bulk{i}@example.com', 'phone': '111', 'password': '123456'}
+            for i in range(50)
+        ]
+        with count_queries(self.app) as counter:
+            response = self.client.post('/customers/bulk', json=payload)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json['created'], 50)
+        self.assertEqual([r['status'] for r in response.json['results']], ['created'] * 50)
+        # Duplicate check + INSERT - not one round of queries per row
+        self.assertLess(counter.count, 10)
+
+        response = self.client.get(f"/customers/{response.json['results'][7]['id']}")
+        self.assertEqual(response.json['email'], 'bulk7@example.com')
+
+    # Negative Test - Bulk Rows With Errors ⚡ Tested!
+    def test_bulk_create_customers_with_errors(self):
+        payload = [
+            {'name': 'New', 'email': 'new@example.com', 'phone': '111', 'password': '123456'},
+            {'name': 'Taken', 'email': 'test@example.com', 'phone': '111', 'password': '123456'},
+            {'name': 'No Email', 'phone': '111', 'password': '123456'},
+            {'name': 'Repeat', 'email': 'new@example.com', 'phone': '111', 'password': '123456'},
+        ]
+        response = self.client.post('/customers/bulk', json=payload)
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.json['created'], 1)
+        results = response.json['results']
+        self.assertEqual([r['status'] for r in results], ['created', 'error', 'error', 'error'])
+        self.assertIn('email', results[1]['errors'])
+        self.assertIn('email', results[2]['errors'])
+        self.assertIn('email', results[3]['errors'])
+
+    # Negative Test - Bulk Body Not a List ⚡ Tested!
+    def test_bulk_create_customers_invalid_body(self):
+        response = self.client.post('/customers/bulk', json={'name': 'Not a list'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('error', response.json)
+
+    # Sparse Fieldset Test - ⚡ Tested!
+    # ?fields= narrows the response and the SELECT
+    def test_get_customers_fields(self):
+        with count_queries(self.app) as queries:
+            response = self.client.get('/customers/?fields=id,name')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, [{'id': 1, 'name': 'Test User'}])
+        select_sql = next(sql for sql in queries.statements if 'FROM customers' in sql and 'count' not in sql)
+        self.assertIn('customers.name', select_sql)
+        self.assertNotIn('customers.email', select_sql)
         
-    
-            
\ No newline at end of file
+        response = self.client.get('/customers/1?fields=email')
+        self.assertEqual(response.json, {'email': 'test@example.com'})
+        response = self.client.get('/customers/search?email=test&fields=id')
+        self.assertEqual(response.json, [{'id': 1}])
+        
+    # Negative Test - Unknown or Write-Only Field ⚡ Tested!
+    def test_get_customers_invalid_fields(self):
+        response = self.client.get('/customers/?fields=id,password,nope')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json['invalid_fields'], ['nope', 'password'])
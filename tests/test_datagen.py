@@ -0,0 +1,92 @@
+# /tests/test_datagen.py
+
+import unittest
+from collections import Counter
+from sqlalchemy import select, func
+from app import create_app
+from app.models import db, Customer, Mechanic, Service_Ticket, MechanicServiceTicket, ServiceTicketInventory, service_mechanic
+from app import datagen
+from app.utils.totals import ticket_totals
+
+SIZES = {'customers': 200, 'mechanics': 20, 'parts': 100, 'tickets': 3000, 'max_mechanics_per_ticket': 3, 'max_parts_per_ticket': 4}
+
+class TestDatagen(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('TestingConfig')
+        with self.app.app_context():
+            db.drop_all()
+            db.create_all()
+
+    def generate(self, **options):
+        with self.app.app_context():
+            return datagen.generate(db.engine, sizes=SIZES, chunk_size=500, **options)
+
+    def tickets_per_customer(self):
+        return sorted(db.session.execute(
+            select(func.count()).select_from(Service_Ticket).group_by(Service_Ticket.customer_id)
+        ).scalars(), reverse=True)
+
+    # Generated Rows And Skew Test - ⚡ Tested!
+    def test_generate(self):
+        counts = self.generate()
+        with self.app.app_context():
+            self.assertEqual(db.session.scalar(select(func.count()).select_from(Service_Ticket)), 3000)
+            self.assertEqual(counts['service_tickets'], 3000)
+            self.assertEqual(counts['customers'], 200)
+            assignments = db.session.scalar(select(func.count()).select_from(service_mechanic))
+            self.assertEqual(assignments, counts['service_mechanic'])
+            self.assertEqual(db.session.scalar(select(func.count()).select_from(MechanicServiceTicket)), assignments)
+            
+            # Zipf: the busiest customer has far more tickets than the median one
+            per_customer = self.tickets_per_customer()
+            self.assertGreater(per_customer[0], 20 * per_customer[len(per_customer) // 2])
+            # A few mechanics are on most tickets
+            per_mechanic = Counter(db.session.execute(select(service_mechanic.c.mechanic_id)).scalars())
+            top3 = sum(count for _, count in per_mechanic.most_common(3))
+            self.assertGreater(top3, assignments / 2)
+            # Long-tailed parts usage, at most one line per ticket and part
+            lines = db.session.execute(select(ServiceTicketInventory.service_ticket_id, ServiceTicketInventory.inventory_id)).all()
+            self.assertEqual(len(lines), len(set(lines)))
+            per_part = Counter(part_id for _, part_id in lines).most_common()
+            self.assertGreater(per_part[0][1], 10 * per_part[-1][1])
+            # Start dates spread over years, and totals are materialized
+            first, last = db.session.execute(select(func.min(MechanicServiceTicket.start_date), func.max(MechanicServiceTicket.start_date))).one()
+            self.assertGreater((last - first).days, 3 * 365)
+            tickets = db.session.execute(select(Service_Ticket).limit(50)).scalars().all()
+            live = ticket_totals([ticket.id for ticket in tickets])
+            self.assertEqual({ticket.id: ticket.parts_total for ticket in tickets}, live)
+
+    # Same Seed Same Data / Appending Test - ⚡ Tested!
+    def test_seeded_and_appends(self):
+        self.generate(seed=7)
+        with self.app.app_context():
+            first = db.session.execute(select(Service_Ticket.customer_id, Service_Ticket.service_date).order_by(Service_Ticket.id)).all()
+            db.drop_all()
+            db.create_all()
+        self.generate(seed=7)
+        with self.app.app_context():
+            again = db.session.execute(select(Service_Ticket.customer_id, Service_Ticket.service_date).order_by(Service_Ticket.id)).all()
+        self.assertEqual(first, again)
+        
+        # A second run adds rows after the existing ids
+        self.generate(seed=8)
+        with self.app.app_context():
+            self.assertEqual(db.session.scalar(select(func.count()).select_from(Customer)), 400)
+            self.assertEqual(db.session.scalar(select(func.max(Service_Ticket.id))), 6000)
+
+    # CLI Command Test - ⚡ Tested!
+    def test_cli_generate(self):
+        runner = self.app.test_cli_runner()
+        result = runner.invoke(args=['db', 'generate', '--customers', '10', '--mechanics', '3', '--parts', '5', '--tickets', '40'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('service_tickets: 40 rows', result.output)
+        with self.app.app_context():
+            self.assertEqual(db.session.scalar(select(func.count()).select_from(Mechanic)), 3)
+        # Generated users can log in with the --password
+        response = self.app.test_client().post('/customers/login', json={'email': 'customer1@example.com', 'password': 'password'})
+        self.assertEqual(response.status_code, 200)
+        
+    # Negative Test - Tickets Without Customers ⚡ Tested!
+        result = runner.invoke(args=['db', 'generate', '--customers', '0', '--tickets', '5'])
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertIn('at least one customer', result.output)
@@ -2,9 +2,16 @@
 
 import unittest 
 from app import create_app
-from app.models import db, Inventory, Mechanic
+from app.models import db, Inventory, Mechanic, Customer, Service_Ticket, ServiceTicketInventory
 from app.utils.util import encode_token
 from marshmallow import ValidationError
+from app.extensions import cache
+from app.utils.bulk import BulkBatch
+from app.blueprints.inventory.schemas import inventory_bulk_create_schema
+from sqlalchemy import event
+from unittest.mock import patch
+from query_counter import count_queries
+from datetime import date
 
 class TestInventory(unittest.TestCase):
     def setUp(self):
@@ -40,6 +47,31 @@ class TestInventory(unittest.TestCase):
         self.assertEqual(response.status_code, 201)
         self.assertEqual(response.json['part_name'], payload['part_name'])
     
+    # Create an Inventory Item With Stock Test - ⚡ Tested!
+    def test_create_inventory_with_stock(self):
+        headers = {"Authorization": f"Bearer {self.token}"}
+        response = self.client.post('/inventory/', json={"part_name": "Filter", "price": 5, "stock": 12}, headers=headers)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json['stock'], 12)
+        # Untracked unless given
+        response = self.client.get(f'/inventory/{self.inventory_id}')
+        self.assertIsNone(response.json['stock'])
+        
+        response = self.client.post('/inventory/', json={"part_name": "Belt", "price": 5, "stock": -1}, headers=headers)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('stock', response.json)
+    
+    # Sparse Fieldset Test - ⚡ Tested!
+    def test_get_inventory_fields(self):
+        response = self.client.get('/inventory/?fields=part_name,price')
+        self.assertEqual(response.json, [{'part_name': 'Test Part', 'price': 29.99}])
+        response = self.client.get(f'/inventory/{self.inventory_id}?fields=id,service_ticket_inventory')
+        self.assertEqual(response.json, {'id': self.inventory_id, 'service_ticket_inventory': []})
+        response = self.client.get('/inventory/search?part_name=test&fields=id')
+        self.assertEqual(response.json, [{'id': self.inventory_id}])
+        response = self.client.get('/inventory/?fields=')
+        self.assertEqual(response.json[0]['part_name'], 'Test Part')
+    
     # Negative Test - Missing Price Information ⚡ Tested! 
     def test_create_inventory_missing_price(self): 
         payload = {
@@ -112,18 +144,110 @@ class TestInventory(unittest.TestCase):
         self.assertEqual(response.status_code, 404)
         self.assertIn('error', response.json)
     
-    # Search for an Inventory Item Based on Email Test - ⚡ Tested!
+    # Search for Inventory Items Based on Part Name Test - ⚡ Tested!
     def test_search_inventory_by_part_name(self):
         response = self.client.get(f'/inventory/search?part_name={self.inventory_name}')
         self.assertEqual(response.status_code, 200)
-        self.assertIsInstance(response.json, dict)
-        self.assertEqual(response.json['part_name'], self.inventory_name)
+        self.assertIsInstance(response.json, list)
+        self.assertEqual(response.json[0]['part_name'], self.inventory_name)
         
     # Negative Test - No matching part name ⚡ Tested!
     def test_search_invalid_inventory_by_part_name(self):
         response = self.client.get('/inventory/search?part_name=XXXX')
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.json, {})
-        
+        self.assertEqual(response.json, [])
     
-            
\ No newline at end of file
+    # Get All Inventory Statement Count Doesn't Grow With Rows - ⚡ Tested!
+    def test_get_inventory_query_count(self):
+        with self.app.app_context():
+            customer = Customer(name='Test Customer', email='c@example.com', phone='111', password='123456')
+            db.session.add(customer)
+            db.session.commit()
+            ticket = Service_Ticket(VIN='VIN1', service_date=date(2025, 1, 1), service_desc='Brakes', customer_id=customer.id)
+            db.session.add(ticket)
+            db.session.commit()
+            ticket_id = ticket.id
+        
+        def add_parts(start, count):
+            with self.app.app_context():
+                for i in range(start, start + count):
+                    part = Inventory(part_name=f'Part {i}', price=1.0)
+                    part.service_ticket_inventory.append(ServiceTicketInventory(service_ticket_id=ticket_id, quantity=1))
+                    db.session.add(part)
+                db.session.commit()
+                cache.clear()
+        
+        add_parts(0, 3)
+        with count_queries(self.app) as small:
+            self.client.get('/inventory/?page=1&per_page=100')
+        add_parts(3, 30)
+        with count_queries(self.app) as large:
+            response = self.client.get('/inventory/?page=1&per_page=100')
+        self.assertEqual(len(response.json), 34)
+        self.assertEqual(response.json[-1]['service_ticket_inventory'][0]['service_ticket_id'], ticket_id)
+        self.assertEqual(small.count, large.count)
+
+
+    # Bulk Create Inventory From NDJSON Test - ⚡ Tested!
+    def test_bulk_create_inventory_ndjson(self):
+        body = '\n'.join([
+            '{"part_name": "Bulk Part 1", "price": 1.5}',
+            '{"part_name": "Bulk Part 2", "price": 2.5}',
+            'not json',
+            '{"part_name": "Test Part", "price": 3.5}',
+            '',
+        ])
+        response = self.client.post('/inventory/bulk', data=body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.json['created'], 2)
+        self.assertEqual(response.json['failed'], 2)
+        self.assertEqual([r['status'] for r in response.json['results']], ['created', 'created', 'error', 'error'])
+
+        response = self.client.get('/inventory/search?part_name=bulk part')
+        self.assertEqual(len(response.json), 2)
+
+    # Bulk Ids Are The Batch's Own Rows, Even With A Concurrent Same-Name Part - ⚡ Tested!
+    def test_bulk_ids_with_concurrent_duplicate(self):
+        # Another request adds the same (non-unique) part name right after the
+        # batch's INSERT
+        def concurrent_insert(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith('INSERT INTO inventory') and not conn.info.get('raced'):
+                conn.info['raced'] = True
+                cursor.connection.execute("INSERT INTO inventory (part_name, price) VALUES ('Race Part', 9.0)")
+
+        with self.app.app_context():
+            batch = BulkBatch(inventory_bulk_create_schema, [{'part_name': 'Race Part', 'price': 1.0}])
+            batch.reject_duplicates(Inventory.part_name, 'duplicate')
+            event.listen(db.engine, 'after_cursor_execute', concurrent_insert)
+            try:
+                ids = batch.insert(Inventory, Inventory.part_name)
+            finally:
+                event.remove(db.engine, 'after_cursor_execute', concurrent_insert)
+            self.assertEqual(db.session.get(Inventory, ids[0]).price, 1.0)
+            db.session.rollback()
+
+    # Bulk Ids Without executemany RETURNING (MySQL) - ⚡ Tested!
+    def test_bulk_ids_without_returning(self):
+        statements = []
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        payload = [{'part_name': f'Part {i}', 'price': float(i)} for i in range(3)]
+        with self.app.app_context():
+            event.listen(db.engine, 'after_cursor_execute', capture)
+            try:
+                with patch.object(db.engine.dialect, 'insert_executemany_returning', False):
+                    response = self.client.post('/inventory/bulk', json=payload)
+            finally:
+                event.remove(db.engine, 'after_cursor_execute', capture)
+            self.assertEqual(response.status_code, 201)
+            self.assertFalse(any('RETURNING' in statement for statement in statements))
+            for i, result in enumerate(response.json['results']):
+                self.assertEqual(db.session.get(Inventory, result['id']).price, float(i))
+
+    # Negative Test - Bulk Batch Too Large ⚡ Tested!
+    def test_bulk_create_inventory_too_many_rows(self):
+        self.app.config['MAX_BULK_ROWS'] = 2
+        payload = [{'part_name': f'Part {i}', 'price': 1.0} for i in range(3)]
+        response = self.client.post('/inventory/bulk', json=payload)
+        self.assertEqual(response.status_code, 413)
@@ -0,0 +1,189 @@
+# /tests/test_jobs.py
+
+import time
+import unittest
+from datetime import timedelta
+from sqlalchemy import select
+from app import create_app, jobs
+from app.models import db, Job
+
+CALLS = []
+FAILURES = {'left': 0}
+
+
+@jobs.task('tests.record')
+def record(payload):
+    CALLS.append(payload['value'])
+
+
+@jobs.task('tests.flaky', max_attempts=3)
+def flaky(payload):
+    if FAILURES['left'] > 0:
+        FAILURES['left'] -= 1
+        raise RuntimeError('temporary failure')
+    CALLS.append(payload['value'])
+
+
+class TestJobs(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('TestingConfig')
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.drop_all()
+            db.create_all()
+        CALLS.clear()
+        FAILURES['left'] = 0
+
+    def enqueue(self, name, value, delay=0):
+        with self.app.app_context():
+            job = jobs.enqueue(name, {'value': value}, delay=delay)
+            db.session.commit()
+            return job.id
+
+    def job(self, job_id):
+        with self.app.app_context():
+            job = db.session.get(Job, job_id)
+            db.session.expunge(job)
+            return job
+
+# Jobs Run Once, Oldest First - ⚡ Tested!
+    def test_run_pending(self):
+        first = self.enqueue('tests.record', 1)
+        self.enqueue('tests.record', 2)
+        self.enqueue('tests.record', 3, delay=60)   # not due yet
+        with self.app.app_context():
+            self.assertEqual(jobs.run_pending(), 2)
+            self.assertEqual(jobs.run_pending(), 0)
+        self.assertEqual(CALLS, [1, 2])
+        job = self.job(first)
+        self.assertEqual((job.status, job.attempts, job.locked_by), (jobs.DONE, 1, 'inline'))
+        self.assertIsNotNone(job.finished_at)
+
+# A Claimed Job Can't Be Claimed Again - ⚡ Tested!
+    def test_claim_is_exclusive(self):
+        job_id = self.enqueue('tests.record', 1)
+        with self.app.app_context():
+            self.assertEqual(jobs.claim('worker-a'), job_id)
+            self.assertIsNone(jobs.claim('worker-b'))
+        self.assertEqual(self.job(job_id).locked_by, 'worker-a')
+
+# Failed Jobs Retry With Backoff, Then Fail - ⚡ Tested!
+    def test_retry_with_backoff(self):
+        FAILURES['left'] = 1
+        job_id = self.enqueue('tests.flaky', 1)
+        with self.app.app_context():
+            with self.assertLogs('app.jobs', 'WARNING'):
+                self.assertEqual(jobs.run_pending(), 1)
+        job = self.job(job_id)
+        self.assertEqual((job.status, job.attempts), (jobs.QUEUED, 1))
+        self.assertIn('temporary failure', job.last_error)
+        self.assertAlmostEqual((job.run_at - jobs.utcnow()).total_seconds(), jobs.JOB_BACKOFF_SECONDS, delta=1)
+
+        with self.app.app_context():
+            self.assertEqual(jobs.run_pending(), 0)   # backing off
+            self.assertEqual(jobs.run_pending(now=jobs.utcnow() + timedelta(seconds=10)), 1)
+        job = self.job(job_id)
+        self.assertEqual((job.status, job.attempts, job.last_error), (jobs.DONE, 2, None))
+        self.assertEqual(CALLS, [1])
+
+        FAILURES['left'] = 10
+        job_id = self.enqueue('tests.flaky', 2)
+        later = jobs.utcnow()
+        with self.app.app_context(), self.assertLogs('app.jobs', 'WARNING') as logs:
+            for _ in range(3):
+                later += timedelta(hours=1)
+                jobs.run_pending(now=later)
+        job = self.job(job_id)
+        self.assertEqual((job.status, job.attempts), (jobs.FAILED, 3))
+        self.assertIn('failed after 3 attempts', logs.output[-1])
+
+        # flask jobs retry puts failed jobs back in the queue
+        result = self.app.test_cli_runner().invoke(args=['jobs', 'retry'])
+        self.assertIn('Requeued 1 failed jobs.', result.output)
+        FAILURES['left'] = 0
+        with self.app.app_context():
+            self.assertEqual(jobs.run_pending(), 1)
+        self.assertEqual(CALLS, [1, 2])
+
+# Backoff Doubles Up To The Cap - ⚡ Tested!
+    def test_backoff(self):
+        with self.app.app_context():
+            self.assertEqual([jobs.backoff(attempts) for attempts in (1, 2, 3)], [2, 4, 8])
+            self.assertEqual(jobs.backoff(20), jobs.JOB_MAX_BACKOFF_SECONDS)
+
+# Negative Test - Unknown Task Fails Its Job - ⚡ Tested!
+    def test_unknown_task(self):
+        with self.app.app_context():
+            job = Job(task='tests.missing', payload={}, max_attempts=1)
+            db.session.add(job)
+            db.session.commit()
+            with self.assertLogs('app.jobs', 'ERROR'):
+                jobs.run_pending()
+            job = db.session.get(Job, job.id)
+            self.assertEqual(job.status, jobs.FAILED)
+            self.assertIn("Unknown task 'tests.missing'", job.last_error)
+
+# Stale Jobs Are Requeued, Old Ones Deleted - ⚡ Tested!
+    def test_maintain(self):
+        stale = self.enqueue('tests.record', 1)
+        done = self.enqueue('tests.record', 2)
+        with self.app.app_context():
+            jobs.claim('dead-worker')
+            jobs.run_job(jobs.claim('inline'), 'inline')
+            later = jobs.utcnow() + timedelta(seconds=jobs.JOB_TIMEOUT_SECONDS + 1)
+            self.assertEqual(jobs.maintain(later), (1, 0))
+            self.assertEqual(jobs.maintain(later + timedelta(days=2)), (0, 1))
+            self.assertIsNone(db.session.get(Job, done))
+        job = self.job(stale)
+        self.assertEqual((job.status, job.locked_by), (jobs.QUEUED, None))
+
+# A Requeued Job's Late Result Is Discarded - ⚡ Tested!
+    def test_late_result(self):
+        FAILURES['left'] = 1
+        job_id = self.enqueue('tests.flaky', 1)
+        later = jobs.utcnow() + timedelta(seconds=jobs.JOB_TIMEOUT_SECONDS + 1)
+        with self.app.app_context():
+            jobs.claim('worker-a')
+            jobs.maintain(later)
+            self.assertEqual(jobs.claim('worker-b', later), job_id)
+            with self.assertLogs('app.jobs', 'WARNING') as logs:
+                self.assertFalse(jobs.run_job(job_id, 'worker-a'))   # fails, but the job isn't worker-a's anymore
+                self.assertFalse(jobs.run_job(job_id, 'worker-a'))   # succeeds, same
+            self.assertEqual(len(logs.output), 2)
+            self.assertTrue(all('was requeued while running' in line for line in logs.output))
+        self.assertEqual(CALLS, [1])   # the task ran, its result wasn't kept
+        job = self.job(job_id)
+        self.assertEqual((job.status, job.locked_by, job.attempts, job.last_error), (jobs.RUNNING, 'worker-b', 2, None))
+
+# Worker Threads Drain The Queue - ⚡ Tested!
+    def test_worker_pool(self):
+        for value in range(20):
+            self.enqueue('tests.record', value)
+        worker = jobs.Worker(self.app, threads=3, poll_interval=0.05)
+        worker.start()
+        deadline = time.monotonic() + 10
+        while worker.processed < 20 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        worker.stop()
+        self.assertEqual(worker.processed, 20)
+        self.assertEqual(sorted(CALLS), list(range(20)))
+        with self.app.app_context():
+            workers = set(db.session.scalars(select(Job.locked_by)))
+        self.assertTrue(all(name.startswith(worker.name) for name in workers))
+
+# Queue Stats Endpoint And CLI - ⚡ Tested!
+    def test_stats(self):
+        self.enqueue('tests.record', 1)
+        self.enqueue('tests.record', 2, delay=60)
+        response = self.client.get('/jobs/stats')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['queued'], 2)
+        self.assertEqual(response.json['due'], 1)
+        self.assertEqual(response.json['tasks'], {'tests.record': {'queued': 2, 'running': 0, 'done': 0, 'failed': 0}})
+
+        runner = self.app.test_cli_runner()
+        result = runner.invoke(args=['jobs', 'worker', '--burst'])
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn('Ran 1 jobs.', result.output)
+        result = runner.invoke(args=['jobs', 'stats'])
+        self.assertIn('queued: 1, running: 0, done: 1, failed: 0, due: 0', result.output)
@@ -2,10 +2,12 @@
 
 import unittest 
 from app import create_app
-from app.models import db, Mechanic, Service_Ticket, Customer
+from app.models import db, Mechanic, Service_Ticket, Customer, service_mechanic
 from app.utils.util import encode_token
 from marshmallow import ValidationError
 from datetime import date
+from app.extensions import cache
+from query_counter import count_queries
 
 class TestMechanic(unittest.TestCase):
     def setUp(self):
@@ -240,4 +242,105 @@ class TestMechanic(unittest.TestCase):
             db.session.commit()
         response = self.client.get('/mechanics/popular')
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.json, [])
\ No newline at end of file
+        self.assertEqual(response.json, [])
+        
+    # Popular Mechanics Are Ranked by Ticket Count - ⚡ Tested!
+    def test_popular_mechanic_ranking(self):
+        with self.app.app_context():
+            busy = Mechanic(name='Busy Mechanic', email='busy@example.com', phone='111', salary="1", password='123456')
+            ticket = db.session.get(Service_Ticket, self.ticket_id)
+            busy.service_tickets.append(ticket)
+            db.session.add(busy)
+            db.session.commit()
+        response = self.client.get('/mechanics/popular?limit=1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json), 1)
+        self.assertEqual(response.json[0]['name'], 'Busy Mechanic')
+        self.assertEqual(response.json[0]['ticket_count'], 1)
+        self.assertEqual(response.json[0]['rank'], 1)
+        response = self.client.get('/mechanics/popular?limit=1&offset=1')
+        self.assertEqual(response.json[0]['name'], 'Test Mechanic')
+        self.assertEqual(response.json[0]['ticket_count'], 0)
+        self.assertEqual(response.json[0]['rank'], 2)
+        
+    # Popular Mechanics Statement Count Doesn't Grow With Mechanics - ⚡ Tested!
+    def test_popular_mechanic_query_count(self):
+        def add_mechanics(start, count):
+            with self.app.app_context():
+                ticket = db.session.get(Service_Ticket, self.ticket_id)
+                for i in range(start, start + count):
+                    mechanic = Mechanic(name=f'Mechanic {i}', email=f'm{i}@example.com', phone='111', salary="1", password='123456')
+                    mechanic.service_tickets.append(ticket)
+                    db.session.add(mechanic)
+                db.session.commit()
+        
+        add_mechanics(0, 5)
+        with count_queries(self.app) as small:
+            self.client.get('/mechanics/popular?limit=100')
+        add_mechanics(5, 50)
+        with count_queries(self.app) as large:
+            response = self.client.get('/mechanics/popular?limit=100')
+        self.assertEqual(len(response.json), 56)
+        self.assertEqual(small.count, large.count)
+        self.assertEqual(large.count, 1)
+        
+    # Sparse Fieldset Test - ⚡ Tested!
+    # Relationships are only loaded when asked for
+    def test_get_mechanics_fields(self):
+        with count_queries(self.app) as full:
+            self.client.get('/mechanics/')
+        with self.app.app_context():
+            cache.clear()
+        with count_queries(self.app) as sparse:
+            response = self.client.get('/mechanics/?fields=id,name')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, [{'id': 1, 'name': 'Test Mechanic'}])
+        self.assertEqual(sparse.count, full.count - 2)
+        
+        response = self.client.get('/mechanics/?fields=id,service_tickets')
+        self.assertEqual(response.json, [{'id': 1, 'service_tickets': []}])
+        response = self.client.get('/mechanics/popular?fields=name')
+        self.assertEqual(response.json, [{'name': 'Test Mechanic', 'ticket_count': 0, 'rank': 1}])
+        response = self.client.get('/mechanics/popular?fields=salary,service_tickets')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json['invalid_fields'], ['service_tickets'])
+        
+    # Get All Mechanics Statement Count Doesn't Grow With Rows - ⚡ Tested!
+    def test_get_mechanics_query_count(self):
+        def add_mechanics(start, count):
+            with self.app.app_context():
+                ticket = db.session.get(Service_Ticket, self.ticket_id)
+                for i in range(start, start + count):
+                    mechanic = Mechanic(name=f'Mechanic {i}', email=f'm{i}@example.com', phone='111', salary="1", password='123456')
+                    mechanic.service_tickets.append(ticket)
+                    db.session.add(mechanic)
+                db.session.commit()
+                cache.clear()
+        
+        for url in ['/mechanics/?page=1&per_page=100', '/mechanics/?stream=true']:
+            with self.subTest(url=url):
+                with self.app.app_context():
+                    db.session.execute(service_mechanic.delete())
+                    db.session.query(Mechanic).delete()
+                    db.session.commit()
+                add_mechanics(0, 3)
+                with count_queries(self.app) as small:
+                    self.client.get(url)
+                add_mechanics(3, 30)
+                with count_queries(self.app) as large:
+                    response = self.client.get(url)
+                self.assertEqual(len(response.json), 33)
+                self.assertEqual(response.json[0]['service_tickets'], [self.ticket_id])
+                self.assertEqual(small.count, large.count)
+
+
+    # Bulk Create Mechanics Test - ⚡ Tested!
+    def test_bulk_create_mechanics(self):
+        payload = [
+            {'name': 'Bulk 1', 'email': 'bulk1@email.com', 'phone': '111', 'salary': '50000', 'password': '123456'},
+            {'name': 'Bulk 2', 'email': 'testmech@example.com', 'phone': '111', 'salary': '50000', 'password': '123456'},
+        ]
+        response = self.client.post('/mechanics/bulk', json=payload)
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.json['results'][0]['status'], 'created')
+        self.assertEqual(response.json['results'][1]['errors'], {'email': ['Email already associated with an account.']})
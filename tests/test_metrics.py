@@ -0,0 +1,76 @@
+# /tests/test_metrics.py
+
+import re
+import unittest
+from app import create_app
+from app.models import db, Customer, Inventory
+from app.utils.metrics import metrics
+from app.extensions import cache
+from query_counter import count_queries
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('TestingConfig')
+        self.app.config['METRICS_ENABLED'] = True
+        metrics.init_app(self.app)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.drop_all()
+            db.create_all()
+            cache.clear()
+            customer = Customer(name='Test User', email='test@example.com', phone='123-456-7890', password='123456')
+            db.session.add(customer)
+            db.session.add_all([Inventory(part_name=f'Part {i}', price=10.0 + i) for i in range(3)])
+            db.session.commit()
+            self.customer_id = customer.id
+
+    # Server-Timing Header Test - ⚡ Tested!
+    def test_server_timing_header(self):
+        with count_queries(self.app) as counter:
+            response = self.client.get(f'/customers/{self.customer_id}')
+        self.assertEqual(response.status_code, 200)
+        timing = response.headers['Server-Timing']
+        self.assertRegex(timing, r'^app;dur=[\d.]+, db;dur=[\d.]+;desc="\d+ queries", serialize;dur=[\d.]+$')
+        self.assertIn(f'desc="{counter.count} queries"', timing)
+        
+    # Cache Result In Server-Timing Test - ⚡ Tested!
+        first = self.client.get('/inventory/')
+        second = self.client.get('/inventory/')
+        self.assertIn('cache;desc="MISS"', first.headers['Server-Timing'])
+        self.assertIn('cache;desc="HIT"', second.headers['Server-Timing'])
+        self.assertIn('desc="0 queries"', second.headers['Server-Timing'])
+
+    # Prometheus /metrics Endpoint Test - ⚡ Tested!
+    def test_metrics_endpoint(self):
+        self.client.get(f'/customers/{self.customer_id}')
+        self.client.get('/customers/999')
+        self.client.get('/inventory/')
+        self.client.get('/inventory/')
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith('text/plain; version=0.0.4'))
+        text = response.get_data(as_text=True)
+        self.assertIn('http_requests_total{blueprint="customers_bp",method="GET",status="200"} 1', text)
+        self.assertIn('http_requests_total{blueprint="customers_bp",method="GET",status="404"} 1', text)
+        self.assertIn('# TYPE http_request_duration_seconds histogram', text)
+        self.assertIn('http_request_duration_seconds_bucket{blueprint="customers_bp",le="+Inf"} 2', text)
+        self.assertIn('http_request_duration_seconds_count{blueprint="inventory_bp"} 2', text)
+        self.assertIn('http_request_db_queries_count{blueprint="customers_bp"} 2', text)
+        self.assertIn('http_request_cache_total{blueprint="inventory_bp",result="HIT"} 1', text)
+        self.assertIn('http_request_cache_total{blueprint="inventory_bp",result="MISS"} 1', text)
+        self.assertRegex(text, r'response_cache_hits_total \d+')
+        # Buckets are cumulative
+        buckets = [int(n) for n in re.findall(r'http_request_duration_seconds_bucket\{blueprint="customers_bp",le="[^"]+"\} (\d+)', text)]
+        self.assertEqual(buckets, sorted(buckets))
+
+    # Negative Test - Disabled Registers Nothing ⚡ Tested!
+    def test_disabled_by_default(self):
+        app = create_app('TestingConfig')
+        client = app.test_client()
+        response = client.get(f'/customers/{self.customer_id}')
+        self.assertNotIn('Server-Timing', response.headers)
+        self.assertEqual(client.get('/metrics').status_code, 404)
+        self.assertNotIn('metrics', app.extensions)
+        hooks = app.before_request_funcs.get(None, []) + app.after_request_funcs.get(None, [])
+        self.assertNotIn('start_request_timings', [getattr(hook, '__name__', None) for hook in hooks])
+        self.assertNotIn('record_request_timings', [getattr(hook, '__name__', None) for hook in hooks])
@@ -0,0 +1,163 @@
+# /tests/test_migrations.py
+
+import unittest 
+from app import create_app
+from app.models import db, Customer, Service_Ticket, Inventory, ServiceTicketInventory, service_mechanic
+from app import migrations
+from sqlalchemy import inspect, select, text
+from datetime import date
+
+# The tables as they were before app/migrations.py existed - no indexes, and
+# none of the columns or tables the later migrations add
+BASELINE_SCHEMA = [
+    """CREATE TABLE customers (
+        id INTEGER NOT NULL, name VARCHAR(255) NOT NULL, email VARCHAR(360) NOT NULL,
+        phone VARCHAR(20) NOT NULL, password VARCHAR(255) NOT NULL,
+        PRIMARY KEY (id), UNIQUE (email))""",
+    """CREATE TABLE inventory (
+        id INTEGER NOT NULL, part_name VARCHAR(255) NOT NULL, price FLOAT NOT NULL,
+        PRIMARY KEY (id))""",
+    """CREATE TABLE mechanics (
+        id INTEGER NOT NULL, name VARCHAR(255) NOT NULL, email VARCHAR(360) NOT NULL,
+        phone VARCHAR(25) NOT NULL, salary VARCHAR(12) NOT NULL, password VARCHAR(255) NOT NULL,
+        PRIMARY KEY (id), UNIQUE (email))""",
+    """CREATE TABLE service_tickets (
+        id INTEGER NOT NULL, "VIN" VARCHAR(360) NOT NULL, service_date DATE NOT NULL,
+        service_desc VARCHAR(360) NOT NULL, customer_id INTEGER NOT NULL,
+        PRIMARY KEY (id), UNIQUE ("VIN"), FOREIGN KEY(customer_id) REFERENCES customers (id))""",
+    """CREATE TABLE "MechanicServiceTicket" (
+        id INTEGER NOT NULL, mechanic_id INTEGER NOT NULL, service_id INTEGER NOT NULL,
+        start_date DATETIME NOT NULL, PRIMARY KEY (id),
+        FOREIGN KEY(mechanic_id) REFERENCES mechanics (id), FOREIGN KEY(service_id) REFERENCES service_tickets (id))""",
+    """CREATE TABLE service_mechanic (
+        ticket_id INTEGER, mechanic_id INTEGER,
+        FOREIGN KEY(ticket_id) REFERENCES service_tickets (id), FOREIGN KEY(mechanic_id) REFERENCES mechanics (id))""",
+    """CREATE TABLE service_ticket_inventory (
+        id INTEGER NOT NULL, inventory_id INTEGER NOT NULL, service_ticket_id INTEGER NOT NULL,
+        quantity INTEGER NOT NULL, PRIMARY KEY (id),
+        FOREIGN KEY(inventory_id) REFERENCES inventory (id), FOREIGN KEY(service_ticket_id) REFERENCES service_tickets (id))""",
+]
+
+class TestMigrations(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('TestingConfig')
+        with self.app.app_context():
+            db.drop_all()
+            migrations.version_metadata.drop_all(db.engine)
+            db.create_all()
+            
+    def create_baseline(self):
+        db.drop_all()
+        with db.engine.begin() as conn:
+            for statement in BASELINE_SCHEMA:
+                conn.exec_driver_sql(statement)
+
+    def index_names(self, table_name):
+        return {index['name'] for index in inspect(db.engine).get_indexes(table_name)}
+    
+    def query_plan(self, query):
+        sql = str(query.compile(db.engine, compile_kwargs={'literal_binds': True}))
+        with db.engine.connect() as conn:
+            return ' '.join(row[-1] for row in conn.execute(text('EXPLAIN QUERY PLAN ' + sql)))
+    
+    # Every table, column and index of the models, as the database has them
+    def assertSchemaMatchesModels(self):
+        inspector = inspect(db.engine)
+        for table in db.metadata.sorted_tables:
+            self.assertEqual({c['name'] for c in inspector.get_columns(table.name)}, set(table.c.keys()), table.name)
+            self.assertLessEqual({index.name for index in table.indexes}, self.index_names(table.name), table.name)
+        self.assertEqual(migrations.current_version(), max(version for version, _, _ in migrations.MIGRATIONS))
+
+    # Upgrade an Existing Database Test - ⚡ Tested!
+    def test_upgrade_existing_database(self):
+        with self.app.app_context():
+            self.create_baseline()
+            with db.engine.begin() as conn:
+                conn.execute(text("INSERT INTO customers (id, name, email, phone, password) VALUES (1, 'Test Customer', 'c@example.com', '111', 'x')"))
+            self.assertEqual(migrations.current_version(), 0)
+            self.assertNotIn('ix_service_tickets_customer_id', self.index_names('service_tickets'))
+            self.assertNotIn('parts_total', {c['name'] for c in inspect(db.engine).get_columns('service_tickets')})
+
+            applied = migrations.upgrade()
+
+            self.assertEqual([version for version, _ in applied], [version for version, _, _ in migrations.MIGRATIONS])
+            self.assertSchemaMatchesModels()
+            self.assertIn('uq_service_mechanic_ticket_mechanic', self.index_names('service_mechanic'))
+            self.assertIn('uq_service_ticket_inventory_ticket_part', self.index_names('service_ticket_inventory'))
+            self.assertEqual(db.session.scalars(select(Customer.email)).all(), ['c@example.com'])
+
+            # Nothing left to apply the second time
+            self.assertEqual(migrations.upgrade(), [])
+
+    # Upgrade a Database Built By db.create_all() Test - ⚡ Tested!
+    def test_upgrade_created_database(self):
+        with self.app.app_context():
+            applied = migrations.upgrade()
+            self.assertEqual([version for version, _ in applied], [version for version, _, _ in migrations.MIGRATIONS])
+            self.assertSchemaMatchesModels()
+
+    # Upgrade a Pre-Migration Database, Every Step In Order - ⚡ Tested!
+    def test_upgrade_baseline_database(self):
+        with self.app.app_context():
+            self.create_baseline()
+            with db.engine.begin() as conn:
+                conn.execute(text("INSERT INTO customers (id, name, email, phone, password) VALUES (1, 'C', 'c@example.com', '1', 'x')"))
+                conn.execute(text("INSERT INTO service_tickets (id, VIN, service_date, service_desc, customer_id) VALUES (1, 'VIN1', '2025-01-01', 'Brakes', 1)"))
+                conn.execute(text("INSERT INTO inventory (id, part_name, price) VALUES (1, 'Part', 2.5)"))
+                conn.execute(text("INSERT INTO service_ticket_inventory (inventory_id, service_ticket_id, quantity) VALUES (1, 1, 2)"))
+
+            applied = migrations.upgrade()
+
+            self.assertEqual([version for version, _ in applied], [version for version, _, _ in migrations.MIGRATIONS])
+            self.assertSchemaMatchesModels()
+            with db.engine.connect() as conn:
+                # Migration 6 built the rollups from the existing tickets
+                self.assertEqual(conn.execute(text('SELECT tickets, revenue FROM report_daily_revenue')).one(), (1, 5.0))
+                self.assertEqual(conn.execute(text('SELECT COUNT(*) FROM jobs')).scalar(), 0)
+
+    # Upgrade a Database With Duplicate Association Rows Test - ⚡ Tested!
+    def test_upgrade_removes_duplicates(self):
+        with self.app.app_context():
+            self.create_baseline()
+            with db.engine.begin() as conn:
+                conn.execute(text("INSERT INTO customers (id, name, email, phone, password) VALUES (1, 'C', 'c@example.com', '1', 'x')"))
+                conn.execute(text("INSERT INTO service_tickets (id, VIN, service_date, service_desc, customer_id) VALUES (1, 'VIN1', '2025-01-01', 'Brakes', 1)"))
+                conn.execute(text("INSERT INTO mechanics (id, name, email, phone, salary, password) VALUES (1, 'M', 'm@example.com', '1', '1', 'x')"))
+                conn.execute(text("INSERT INTO inventory (id, part_name, price) VALUES (1, 'Part', 1.0)"))
+                conn.execute(text("INSERT INTO service_mechanic (ticket_id, mechanic_id) VALUES (1, 1), (1, 1)"))
+                conn.execute(text("INSERT INTO service_ticket_inventory (inventory_id, service_ticket_id, quantity) VALUES (1, 1, 1), (1, 1, 1)"))
+            
+            migrations.upgrade()
+            
+            with db.engine.connect() as conn:
+                self.assertEqual(conn.execute(text('SELECT COUNT(*) FROM service_mechanic')).scalar(), 1)
+                self.assertEqual(conn.execute(text('SELECT COUNT(*) FROM service_ticket_inventory')).scalar(), 1)
+                # parts_total backfilled from the remaining row
+                self.assertEqual(conn.execute(text('SELECT parts_total FROM service_tickets')).scalar(), 1.0)
+    
+    # Customer's Tickets Lookup Uses the customer_id Index (get_my_tickets) - ⚡ Tested!
+    def test_my_tickets_query_uses_index(self):
+        with self.app.app_context():
+            plan = self.query_plan(select(Service_Ticket).where(Service_Ticket.customer_id == 1))
+        self.assertIn('ix_service_tickets_customer_id', plan)
+    
+    # Duplicate Part Check Uses the Unique Index (add_part) - ⚡ Tested!
+    def test_add_part_query_uses_index(self):
+        with self.app.app_context():
+            plan = self.query_plan(select(ServiceTicketInventory).where(
+                ServiceTicketInventory.service_ticket_id == 1,
+                ServiceTicketInventory.inventory_id == 1
+            ))
+        self.assertIn('uq_service_ticket_inventory_ticket_part', plan)
+        
+    # Part Name Check Uses the part_name Index (create_inventory) - ⚡ Tested!
+    def test_part_name_query_uses_index(self):
+        with self.app.app_context():
+            plan = self.query_plan(select(Inventory).where(Inventory.part_name == 'Brake Pad'))
+        self.assertIn('ix_inventory_part_name', plan)
+        
+    # Mechanic's Tickets Lookup Uses the service_mechanic Index - ⚡ Tested!
+    def test_mechanic_tickets_query_uses_index(self):
+        with self.app.app_context():
+            plan = self.query_plan(select(service_mechanic.c.ticket_id).where(service_mechanic.c.mechanic_id == 1))
+        self.assertIn('ix_service_mechanic_mechanic_id', plan)
@@ -0,0 +1,137 @@
+# /tests/test_passwords.py
+
+import unittest
+from app import create_app
+from app.models import db, Customer, Mechanic
+from app.utils.passwords import hasher, hash_password, verify_password, PasswordHasherBusy
+
+class TestPasswords(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('TestingConfig')
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.drop_all()
+            db.create_all()
+            # Row from before hashing - plaintext password
+            self.customer = Customer(
+                name='Legacy User',
+                email='legacy@example.com',
+                phone='123-456-7890',
+                password='123456')
+            db.session.add(self.customer)
+            db.session.commit()
+            self.customer_id = self.customer.id
+
+    def tearDown(self):
+        hasher.shutdown()
+
+    # Hash and Verify Test - ⚡ Tested!
+    def test_hash_and_verify(self):
+        with self.app.app_context():
+            hashed = hash_password('s3cret')
+            self.assertTrue(hashed.startswith('scrypt$16$'))
+            self.assertNotIn('s3cret', hashed)
+            self.assertNotEqual(hashed, hash_password('s3cret'))  # salted
+            self.assertEqual(verify_password(hashed, 's3cret'), (True, False))
+            self.assertEqual(verify_password(hashed, 'wrong'), (False, False))
+
+            # Raising the cost flags existing hashes for rehashing
+            self.app.config['PASSWORD_SCRYPT_N'] = 32
+            self.assertEqual(verify_password(hashed, 's3cret'), (True, True))
+
+    # Created Customers Are Stored Hashed Test - ⚡ Tested!
+    def test_create_customer_stores_hash(self):
+        payload = {'name': 'New', 'email': 'new@example.com', 'phone': '111', 'password': 'pw123'}
+        response = self.client.post('/customers/', json=payload)
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn('password', response.json)
+        with self.app.app_context():
+            stored = db.session.get(Customer, response.json['id']).password
+            self.assertTrue(stored.startswith('scrypt$'))
+
+        response = self.client.post('/customers/login', json={'email': 'new@example.com', 'password': 'pw123'})
+        self.assertEqual(response.status_code, 200)
+
+    # Legacy Plaintext Rehashed on Login Test - ⚡ Tested!
+    def test_legacy_password_rehashed_on_login(self):
+        response = self.client.post('/customers/login', json={'email': 'legacy@example.com', 'password': '123456'})
+        self.assertEqual(response.status_code, 200)
+        with self.app.app_context():
+            stored = db.session.get(Customer, self.customer_id).password
+            self.assertTrue(stored.startswith('scrypt$'))
+
+        # The new hash keeps working
+        response = self.client.post('/customers/login', json={'email': 'legacy@example.com', 'password': '123456'})
+        self.assertEqual(response.status_code, 200)
+
+    # Negative Test - Wrong Password Leaves Legacy Row Alone ⚡ Tested!
+    def test_wrong_legacy_password(self):
+        response = self.client.post('/customers/login', json={'email': 'legacy@example.com', 'password': 'nope'})
+        self.assertEqual(response.status_code, 401)
+        with self.app.app_context():
+            self.assertEqual(db.session.get(Customer, self.customer_id).password, '123456')
+
+    # Negative Test - Corrupt Stored Hash Fails Login With 401 ⚡ Tested!
+    def test_corrupt_hash(self):
+        with self.app.app_context():
+            for stored in ('scrypt$16$8$1$not base64!$AAAA', 'scrypt$x$8$1$AAAA$AAAA', 'scrypt$3$8$1$AAAA$AAAA'):
+                self.assertEqual(verify_password(stored, '123456'), (False, False))
+            db.session.get(Customer, self.customer_id).password = 'scrypt$16$8$1$not base64!$AAAA'
+            db.session.commit()
+        response = self.client.post('/customers/login', json={'email': 'legacy@example.com', 'password': '123456'})
+        self.assertEqual(response.status_code, 401)
+
+        # Same from the pool, where the error would surface from the future
+        self.app.config['PASSWORD_HASH_WORKERS'] = 1
+        response = self.client.post('/customers/login', json={'email': 'legacy@example.com', 'password': '123456'})
+        self.assertEqual(response.status_code, 401)
+
+    # Hashing in the Process Pool Test - ⚡ Tested!
+    def test_process_pool(self):
+        self.app.config['PASSWORD_HASH_WORKERS'] = 1
+        payload = [
+            {'name': f'Mech {i}', 'email': f'mech{i}@example.com', 'phone': '111', 'salary': '1', 'password': f'pw{i}'}
+            for i in range(3)
+        ]
+        response = self.client.post('/mechanics/bulk', json=payload)
+        self.assertEqual(response.status_code, 201)
+        response = self.client.post('/mechanics/login', json={'email': 'mech2@example.com', 'password': 'pw2'})
+        self.assertEqual(response.status_code, 200)
+        with self.app.app_context():
+            mechanic = db.session.get(Mechanic, 3)
+            self.assertTrue(mechanic.password.startswith('scrypt$'))
+
+    # Negative Test - Pool Saturated Returns 503 ⚡ Tested!
+    def test_busy_pool(self):
+        self.app.config.update(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_QUEUE=0, PASSWORD_HASH_TIMEOUT=0.05)
+        _, slots = hasher._pool(1, 0)
+        slots.acquire()
+        try:
+            response = self.client.post('/customers/login', json={'email': 'legacy@example.com', 'password': '123456'})
+        finally:
+            slots.release()
+        self.assertEqual(response.status_code, 503)
+
+    # Negative Test - Slow Hash Returns Busy, Slot Held Until It Finishes ⚡ Tested!
+    def test_slow_hash(self):
+        # A fresh pool has to spawn its process first - far longer than 10 ms
+        self.app.config.update(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_QUEUE=0, PASSWORD_HASH_TIMEOUT=0.01)
+        with self.app.app_context():
+            with self.assertRaises(PasswordHasherBusy):
+                hash_password('s3cret')
+        # The slot comes back once the pool is done with the call
+        _, slots = hasher._pool(1, 0)
+        self.assertTrue(slots.acquire(timeout=30))
+        slots.release()
+
+    # Negative Test - Bulk Hashing Waits For Slots Too ⚡ Tested!
+    def test_busy_pool_bulk(self):
+        self.app.config.update(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_QUEUE=0, PASSWORD_HASH_TIMEOUT=0.05)
+        _, slots = hasher._pool(1, 0)
+        slots.acquire()
+        try:
+            payload = [{'name': 'Mech', 'email': 'mech@example.com', 'phone': '111', 'salary': '1', 'password': 'pw'}]
+            response = self.client.post('/mechanics/bulk', json=payload)
+        finally:
+            slots.release()
+        self.assertEqual(response.status_code, 503)
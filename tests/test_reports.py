@@ -0,0 +1,235 @@
+# /tests/test_reports.py
+
+import unittest
+from datetime import date, timedelta
+from sqlalchemy import select, func
+from app import create_app
+from app.models import db, Customer, Mechanic, Inventory, Service_Ticket, DailyRevenue, PartUsage, MechanicWorkload, Job
+from app.utils import rollups
+from app import jobs
+from app.utils.util import encode_token
+
+class TestReports(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('TestingConfig')
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.drop_all()
+            db.create_all()
+            customer = Customer(name='Report Customer', email='report@example.com', phone='123-456-7890', password='123456')
+            self.mechanic1 = Mechanic(name='Mechanic 1', email='mech1@example.com', phone='123-456-7890', salary='50000', password='123456')
+            self.mechanic2 = Mechanic(name='Mechanic 2', email='mech2@example.com', phone='111-222-3333', salary='40000', password='123456')
+            self.brakes = Inventory(part_name='Brake Pad', price=40.0)
+            self.filter = Inventory(part_name='Oil Filter', price=12.5)
+            db.session.add_all([customer, self.mechanic1, self.mechanic2, self.brakes, self.filter])
+            db.session.commit()
+            self.customer_id = customer.id
+            self.mechanic1_id = self.mechanic1.id
+            self.mechanic2_id = self.mechanic2.id
+            self.brakes_id = self.brakes.id
+            self.filter_id = self.filter.id
+            self.token = encode_token(self.mechanic1_id, user_type='mechanic')
+            self.mechanic2_token = encode_token(self.mechanic2_id, user_type='mechanic')
+            self.customer_token = encode_token(self.customer_id, user_type='customer')
+            self.headers = {'Authorization': f'Bearer {self.token}'}
+
+    def create_ticket(self, vin, service_date, mechanic_ids=()):
+        response = self.client.post('/service_tickets/', json={
+            'VIN': vin, 'service_date': service_date, 'service_desc': 'Brakes',
+            'customer_id': self.customer_id, 'mechanic_ids': list(mechanic_ids)
+        })
+        self.assertEqual(response.status_code, 201)
+        return response.json['id']
+
+    def add_part(self, ticket_id, part_id, quantity):
+        response = self.client.put(f'/service_tickets/{ticket_id}/add-part', json={'part_id': part_id, 'quantity': quantity})
+        self.assertEqual(response.status_code, 200)
+
+    def run_jobs(self):
+        with self.app.app_context():
+            return jobs.run_pending()
+
+    # Once the queued deltas are applied, every rollup equals the aggregate
+    # computed from the source tables
+    def assertRollupsMatch(self):
+        with self.app.app_context():
+            jobs.run_pending()
+            revenue = {day: (tickets, revenue) for day, tickets, revenue in db.session.execute(rollups.revenue_query())}
+            stored = {row.day: (row.tickets, row.revenue) for row in db.session.scalars(select(DailyRevenue).where(DailyRevenue.tickets > 0))}
+            self.assertEqual(stored.keys(), revenue.keys())
+            for day, (tickets, total) in revenue.items():
+                self.assertEqual(stored[day][0], tickets)
+                self.assertAlmostEqual(stored[day][1], total, places=2)
+
+            usage = {tuple(row) for row in db.session.execute(rollups.part_usage_query())}
+            stored = {(row.inventory_id, row.quantity, row.lines) for row in db.session.scalars(select(PartUsage).where(PartUsage.lines > 0))}
+            self.assertEqual(stored, usage)
+
+            workload = {tuple(row) for row in db.session.execute(rollups.workload_query())}
+            stored = {(row.mechanic_id, row.week, row.tickets) for row in db.session.scalars(select(MechanicWorkload).where(MechanicWorkload.tickets > 0))}
+            self.assertEqual(stored, workload)
+
+# Rollups Follow Every Write Path - ⚡ Tested!
+    def test_rollups_follow_writes(self):
+        # ORM: a ticket with its mechanics
+        first = self.create_ticket('RPTVIN1', '2025-03-03', [self.mechanic1_id, self.mechanic2_id])
+        self.create_ticket('RPTVIN2', '2025-03-03', [self.mechanic1_id])
+        self.assertRollupsMatch()
+
+        # Core: bulk creation
+        response = self.client.post('/service_tickets/bulk', json=[
+            {'VIN': 'RPTVIN3', 'service_date': '2025-03-09', 'service_desc': 'Tires', 'customer_id': self.customer_id,
+             'mechanic_ids': [self.mechanic2_id]},
+            {'VIN': 'RPTVIN4', 'service_date': '2025-03-10', 'service_desc': 'Tires', 'customer_id': self.customer_id},
+            {'VIN': 'RPTVIN5', 'service_date': '2025-03-10', 'service_desc': 'Tires', 'customer_id': 999},
+        ])
+        self.assertEqual(response.status_code, 207)
+        third = response.json['results'][0]['id']
+        self.assertRollupsMatch()
+
+        # New lines, a raised line, then a price change
+        self.add_part(first, self.brakes_id, 2)
+        self.add_part(first, self.brakes_id, 1)
+        self.add_part(first, self.filter_id, 1)
+        self.add_part(third, self.filter_id, 3)
+        self.assertRollupsMatch()
+        response = self.client.put(f'/inventory/{self.filter_id}', json={'price': 13.99}, headers=self.headers)
+        self.assertEqual(response.status_code, 201)
+        self.assertRollupsMatch()
+
+        # Mechanics changed with Core statements and through the ORM collection
+        response = self.client.put(f'/service_tickets/{third}', json={'add_ids': [self.mechanic1_id], 'remove_ids': [self.mechanic2_id]})
+        self.assertEqual(response.status_code, 200)
+        self.assertRollupsMatch()
+        response = self.client.post(f'/mechanics/{self.mechanic2_id}/add-ticket/{third}', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        response = self.client.delete(f'/mechanics/{self.mechanic1_id}/remove-ticket/{first}', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertRollupsMatch()
+
+        # Deleting a mechanic drops their assignments
+        response = self.client.delete('/mechanics/', headers={'Authorization': f'Bearer {self.mechanic2_token}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertRollupsMatch()
+
+# Rolled Back Writes Leave The Rollups Alone - ⚡ Tested!
+    def test_rollback_discards_deltas(self):
+        with self.app.app_context():
+            ticket = Service_Ticket(VIN='RBVIN1', service_date=date(2025, 3, 3), service_desc='Brakes', customer_id=self.customer_id)
+            ticket.mechanics = [db.session.get(Mechanic, self.mechanic1_id)]
+            db.session.add(ticket)
+            db.session.flush()
+            self.assertEqual(db.session.scalar(select(func.count()).select_from(Job)), 1)
+            db.session.rollback()
+            self.assertEqual(db.session.scalar(select(func.count()).select_from(Job)), 0)
+            self.assertEqual(jobs.run_pending(), 0)
+            self.assertIsNone(db.session.get(DailyRevenue, date(2025, 3, 3)))
+            self.assertEqual(db.session.scalars(select(MechanicWorkload)).all(), [])
+
+# A Requeued Job's Late Finish Isn't Applied Twice - ⚡ Tested!
+    def test_requeued_job_applies_once(self):
+        self.create_ticket('RPTVIN1', '2025-03-03')
+        with self.app.app_context():
+            job_id = jobs.claim('worker-a')
+            later = jobs.utcnow() + timedelta(seconds=jobs.JOB_TIMEOUT_SECONDS + 100)
+            self.assertEqual(jobs.maintain(later), (1, 0))   # worker-a looks dead
+            self.assertEqual(jobs.claim('worker-b', later), job_id)
+            self.assertTrue(jobs.run_job(job_id, 'worker-b'))
+            with self.assertLogs('app.jobs', 'WARNING'):
+                self.assertFalse(jobs.run_job(job_id, 'worker-a'))   # worker-a was only slow
+            self.assertEqual(db.session.get(DailyRevenue, date(2025, 3, 3)).tickets, 1)
+            job = db.session.get(Job, job_id)
+            self.assertEqual((job.status, job.locked_by), (jobs.DONE, 'worker-b'))
+
+# Rebuild Recomputes The Rollups - ⚡ Tested!
+    def test_rebuild(self):
+        first = self.create_ticket('RPTVIN1', '2025-03-03', [self.mechanic1_id])
+        self.add_part(first, self.brakes_id, 2)
+        with self.app.app_context():
+            db.session.execute(DailyRevenue.__table__.delete())
+            db.session.execute(PartUsage.__table__.update().values(quantity=99))
+            db.session.commit()
+            counts = rollups.rebuild()
+            db.session.commit()
+        self.assertEqual(counts, {'report_daily_revenue': 1, 'report_part_usage': 1, 'report_mechanic_workload': 1})
+        self.assertRollupsMatch()
+
+        result = self.app.test_cli_runner().invoke(args=['reports', 'rebuild'])
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn('report_daily_revenue: 1 rows', result.output)
+
+# SQL Week Start Matches Python - ⚡ Tested!
+    def test_week_start(self):
+        with self.app.app_context():
+            for offset in range(14):
+                day = date(2025, 3, 1) + timedelta(days=offset)   # Saturday to the next Friday week
+                week = db.session.execute(select(rollups.week_start(day))).scalar()
+                self.assertEqual(week, rollups.week_of(day))
+                self.assertEqual(week.weekday(), 0)
+
+# Revenue Report - ⚡ Tested!
+    def test_revenue_report(self):
+        first = self.create_ticket('RPTVIN1', '2025-03-03')
+        second = self.create_ticket('RPTVIN2', '2025-03-03')
+        self.create_ticket('RPTVIN3', '2025-03-05')
+        self.add_part(first, self.brakes_id, 2)
+        self.add_part(second, self.filter_id, 1)
+
+        self.run_jobs()
+        response = self.client.get('/reports/revenue', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['days'], [
+            {'day': '2025-03-03', 'tickets': 2, 'revenue': 92.5},
+            {'day': '2025-03-05', 'tickets': 1, 'revenue': 0.0},
+        ])
+        self.assertEqual(response.json['tickets'], 3)
+        self.assertEqual(response.json['revenue'], 92.5)
+
+        response = self.client.get('/reports/revenue?start=2025-03-04&end=2025-03-31', headers=self.headers)
+        self.assertEqual([day['day'] for day in response.json['days']], ['2025-03-05'])
+
+# Negative Test - Reports Need A Mechanic Token And Valid Dates - ⚡ Tested!
+    def test_report_errors(self):
+        self.assertEqual(self.client.get('/reports/revenue').status_code, 400)
+        response = self.client.get('/reports/parts', headers={'Authorization': f'Bearer {self.customer_token}'})
+        self.assertEqual(response.status_code, 403)
+        response = self.client.get('/reports/revenue?start=March', headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('start', response.json)
+
+# Parts Usage Report - ⚡ Tested!
+    def test_parts_report(self):
+        first = self.create_ticket('RPTVIN1', '2025-03-03')
+        second = self.create_ticket('RPTVIN2', '2025-03-04')
+        self.add_part(first, self.filter_id, 2)
+        self.add_part(second, self.filter_id, 2)
+        self.add_part(second, self.brakes_id, 1)
+
+        self.run_jobs()
+        response = self.client.get('/reports/parts', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, [
+            {'inventory_id': self.filter_id, 'part_name': 'Oil Filter', 'price': 12.5, 'quantity': 4, 'lines': 2, 'revenue': 50.0},
+            {'inventory_id': self.brakes_id, 'part_name': 'Brake Pad', 'price': 40.0, 'quantity': 1, 'lines': 1, 'revenue': 40.0},
+        ])
+
+        response = self.client.get('/reports/parts?page=2&per_page=1', headers=self.headers)
+        self.assertEqual([row['inventory_id'] for row in response.json], [self.brakes_id])
+
+# Mechanic Workload Report - ⚡ Tested!
+    def test_mechanics_report(self):
+        self.create_ticket('RPTVIN1', '2025-03-03', [self.mechanic1_id, self.mechanic2_id])   # Monday
+        self.create_ticket('RPTVIN2', '2025-03-09', [self.mechanic1_id])                      # Sunday, same week
+        self.create_ticket('RPTVIN3', '2025-03-10', [self.mechanic2_id])                      # next Monday
+
+        self.run_jobs()
+        response = self.client.get('/reports/mechanics', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, [
+            {'mechanic_id': self.mechanic1_id, 'name': 'Mechanic 1', 'week': '2025-03-03', 'tickets': 2},
+            {'mechanic_id': self.mechanic2_id, 'name': 'Mechanic 2', 'week': '2025-03-03', 'tickets': 1},
+            {'mechanic_id': self.mechanic2_id, 'name': 'Mechanic 2', 'week': '2025-03-10', 'tickets': 1},
+        ])
+
+        response = self.client.get(f'/reports/mechanics?mechanic_id={self.mechanic2_id}&start=2025-03-05', headers=self.headers)
+        self.assertEqual([row['week'] for row in response.json], ['2025-03-03', '2025-03-10'])
@@ -0,0 +1,113 @@
+# /tests/test_search.py
+
+import unittest 
+from app import create_app
+from app.models import db, Customer, Inventory
+from app.search import search, fts5_available
+
+# Runs against the default backend for the test database (fts5 on SQLite);
+# the subclasses below repeat every test for the other backends
+class TestSearch(unittest.TestCase):
+    backend = None
+    
+    def setUp(self):
+        self.app = create_app('TestingConfig')
+        if self.backend:
+            self.app.config['SEARCH_BACKEND'] = self.backend
+            search.init_app(self.app)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.drop_all()
+            db.create_all()
+            db.session.add_all([
+                Customer(name='Ann', email='ann@garage.com', phone='1', password='123456'),
+                Customer(name='Bob', email='bob@example.com', phone='1', password='123456'),
+                Customer(name='Example', email='example.com@example.org', phone='1', password='123456'),
+                Inventory(part_name='Brake Pad', price=10.0),
+                Inventory(part_name='Brake Rotor', price=40.0),
+                Inventory(part_name='Oil Filter', price=5.0),
+            ])
+            db.session.commit()
+            # Build the ngram index before the writes made by the tests
+            search.query(Customer, 'ann')
+            
+    # Search Customers by Email Substring Test - ⚡ Tested!
+    def test_search_by_email(self):
+        response = self.client.get('/customers/search?email=example')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({c['name'] for c in response.json}, {'Bob', 'Example'})
+        
+    # Search Customers Is Case-Insensitive Test - ⚡ Tested!
+    def test_search_by_email_case_insensitive(self):
+        response = self.client.get('/customers/search?email=GARAGE')
+        self.assertEqual([c['name'] for c in response.json], ['Ann'])
+        
+    # Search Short Terms Test - ⚡ Tested!
+    def test_search_short_term(self):
+        response = self.client.get('/customers/search?email=bo')
+        self.assertEqual([c['name'] for c in response.json], ['Bob'])
+        
+    # Search Returns Every Matching Part Test - ⚡ Tested!
+    def test_search_by_part_name_returns_all_matches(self):
+        response = self.client.get('/inventory/search?part_name=brake')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({p['part_name'] for p in response.json}, {'Brake Pad', 'Brake Rotor'})
+        
+    # Search Results Are Paginated Test - ⚡ Tested!
+    def test_search_pagination(self):
+        first = self.client.get('/inventory/search?part_name=brake&page=1&per_page=1').json
+        second = self.client.get('/inventory/search?part_name=brake&page=2&per_page=1').json
+        third = self.client.get('/inventory/search?part_name=brake&page=3&per_page=1').json
+        self.assertEqual(len(first), 1)
+        self.assertEqual(len(second), 1)
+        self.assertNotEqual(first[0]['id'], second[0]['id'])
+        self.assertEqual(third, [])
+        
+    # Search Sees Created, Updated and Deleted Rows Test - ⚡ Tested!
+    def test_search_stays_in_sync(self):
+        with self.app.app_context():
+            part = db.session.get(Inventory, 3)
+            part.part_name = 'Air Filter'
+            db.session.add(Inventory(part_name='Cabin Filter', price=8.0))
+            db.session.delete(db.session.get(Inventory, 1))
+            db.session.commit()
+            
+        names = {p['part_name'] for p in self.client.get('/inventory/search?part_name=filter').json}
+        self.assertEqual(names, {'Air Filter', 'Cabin Filter'})
+        self.assertEqual(self.client.get('/inventory/search?part_name=oil').json, [])
+        self.assertEqual([p['part_name'] for p in self.client.get('/inventory/search?part_name=brake').json], ['Brake Rotor'])
+        
+    # Negative Test - Missing Search Term ⚡ Tested!
+    def test_search_without_term(self):
+        response = self.client.get('/customers/search')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, [])
+        
+    # Negative Test - LIKE Wildcards Are Matched Literally ⚡ Tested!
+    def test_search_wildcards_are_literal(self):
+        self.assertEqual(self.client.get('/customers/search?email=%25').json, [])
+        self.assertEqual(self.client.get('/customers/search?email=a_n').json, [])
+
+
+@unittest.skipUnless(fts5_available(), 'SQLite was built without FTS5')
+class TestFTS5Search(TestSearch):
+    backend = 'fts5'
+    
+    # Search Rows Are Written to the FTS Table Test - ⚡ Tested!
+    def test_search_uses_fts_table(self):
+        with self.app.app_context():
+            rows = db.session.execute(db.text("SELECT rowid FROM customers_search WHERE customers_search MATCH '\"garage\"'")).all()
+        self.assertEqual(len(rows), 1)
+
+
+class TestNgramSearch(TestSearch):
+    backend = 'ngram'
+    
+    # Exact Match, Then Earliest Match Ranks First Test - ⚡ Tested!
+    def test_search_ranking(self):
+        response = self.client.get('/customers/search?email=example.com')
+        self.assertEqual([c['name'] for c in response.json], ['Example', 'Bob'])
+
+
+class TestLikeSearch(TestSearch):
+    backend = 'like'
@@ -1,10 +1,13 @@
 # /tests/test_service_tickets.py
 
 import unittest 
+import threading
 from app import create_app
-from app.models import db, Inventory, Mechanic, Service_Ticket, Customer
+from app.models import db, Inventory, Mechanic, Service_Ticket, Customer, ServiceTicketInventory
+from sqlalchemy import select
 from app.utils.util import encode_token
 from marshmallow import ValidationError
+from query_counter import count_queries
 from datetime import date
 
 class TestService_Ticket(unittest.TestCase):
@@ -194,4 +197,305 @@ class TestService_Ticket(unittest.TestCase):
         response = self.client.put(f'/service_tickets/{self.ticket_id}/add-part', json=invalid_payload)
         self.assertEqual(response.status_code, 400)
         self.assertIn('part_id', response.json)
-    
\ No newline at end of file
+        
+    # Get All Service Tickets Statement Count Doesn't Grow With Rows - ⚡ Tested!
+    def test_get_tickets_query_count(self):
+        def add_tickets(start, count):
+            with self.app.app_context():
+                for i in range(start, start + count):
+                    db.session.add(Service_Ticket(VIN=f'VIN{i}', service_date=date(2025, 1, 2), service_desc='Brakes', customer_id=self.customer_id))
+                db.session.commit()
+        
+        add_tickets(0, 3)
+        with count_queries(self.app) as small:
+            self.client.get('/service_tickets/?page=1&per_page=100')
+        add_tickets(3, 30)
+        with count_queries(self.app) as large:
+            response = self.client.get('/service_tickets/?page=1&per_page=100')
+        self.assertEqual(len(response.json), 34)
+        self.assertEqual(small.count, large.count)
+        
+    # Get All Service Tickets With a Cursor Test - ⚡ Tested!
+    def test_get_tickets_with_cursor(self):
+        with self.app.app_context():
+            db.session.add_all([
+                Service_Ticket(VIN='VIN-EARLY', service_date=date(2024, 6, 1), service_desc='Brakes', customer_id=self.customer_id),
+                Service_Ticket(VIN='VIN-LATE', service_date=date(2025, 6, 1), service_desc='Brakes', customer_id=self.customer_id),
+            ])
+            db.session.commit()
+        
+        response = self.client.get('/service_tickets/?cursor=&per_page=2')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([t['VIN'] for t in response.json['items']], ['VIN-EARLY', 'TESTVIN123'])
+        self.assertIsNotNone(response.json['next_cursor'])
+        
+        response = self.client.get(f"/service_tickets/?cursor={response.json['next_cursor']}&per_page=2")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([t['VIN'] for t in response.json['items']], ['VIN-LATE'])
+        self.assertIsNone(response.json['next_cursor'])
+        
+    # Negative Test - Tampered Cursor -⚡ Tested!
+    def test_invalid_get_tickets_with_cursor(self):
+        response = self.client.get('/service_tickets/?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('error', response.json)
+        
+    # Unpaginated Service Tickets Are Capped at One Page Test - ⚡ Tested!
+    def test_get_tickets_page_cap(self):
+        with self.app.app_context():
+            for i in range(15):
+                db.session.add(Service_Ticket(VIN=f'VIN{i}', service_date=date(2025, 1, 2), service_desc='Brakes', customer_id=self.customer_id))
+            db.session.commit()
+        self.app.config['MAX_PER_PAGE'] = 12
+        
+        response = self.client.get('/service_tickets/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json), 10)
+        response = self.client.get('/service_tickets/?page=1&per_page=1000')
+        self.assertEqual(len(response.json), 12)
+        response = self.client.get('/service_tickets/?page=99&per_page=10')
+        self.assertEqual(response.json, [])
+        
+    # Stream All Service Tickets Test - ⚡ Tested!
+    def test_stream_tickets(self):
+        with self.app.app_context():
+            for i in range(15):
+                db.session.add(Service_Ticket(VIN=f'VIN{i}', service_date=date(2025, 1, 2), service_desc='Brakes', customer_id=self.customer_id))
+            db.session.commit()
+        self.app.config['STREAM_CHUNK_SIZE'] = 4
+        
+        response = self.client.get('/service_tickets/?stream=true')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/json')
+        self.assertEqual(len(response.json), 16)
+        self.assertEqual(response.json[0]['VIN'], 'TESTVIN123')
+        self.assertEqual(response.json[-1]['VIN'], 'VIN14')
+        
+    # Negative Test - Streaming an Empty Table -⚡ Tested!
+    def test_stream_tickets_empty(self):
+        with self.app.app_context():
+            db.session.query(Service_Ticket).delete()
+            db.session.commit()
+        response = self.client.get('/service_tickets/?stream=true')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, [])
+
+
+    # Bulk Create Service Tickets Test - ⚡ Tested!
+    def test_bulk_create_service_tickets(self):
+        payload = [
+            {'VIN': 'BULKVIN1', 'service_date': '2025-02-01', 'service_desc': 'Brakes',
+             'customer_id': self.customer_id, 'mechanic_ids': [self.mechanic1_id, self.mechanic2_id]},
+            {'VIN': 'BULKVIN2', 'service_date': '2025-02-02', 'service_desc': 'Tires', 'customer_id': self.customer_id},
+            {'VIN': 'BULKVIN3', 'service_date': '2025-02-03', 'service_desc': 'Tires', 'customer_id': 999},
+            {'VIN': 'BULKVIN4', 'service_date': '2025-02-04', 'service_desc': 'Tires',
+             'customer_id': self.customer_id, 'mechanic_ids': [999]},
+            {'VIN': 'TESTVIN123', 'service_date': '2025-02-05', 'service_desc': 'Tires', 'customer_id': self.customer_id},
+        ]
+        response = self.client.post('/service_tickets/bulk', json=payload)
+        self.assertEqual(response.status_code, 207)
+        results = response.json['results']
+        self.assertEqual([r['status'] for r in results], ['created', 'created', 'error', 'error', 'error'])
+        self.assertIn('customer_id', results[2]['errors'])
+        self.assertIn('mechanic_ids', results[3]['errors'])
+        self.assertIn('VIN', results[4]['errors'])
+
+        with self.app.app_context():
+            ticket = db.session.get(Service_Ticket, results[0]['id'])
+            self.assertEqual(sorted(m.id for m in ticket.mechanics), sorted([self.mechanic1_id, self.mechanic2_id]))
+
+    # Negative Test - Unknown Mechanic IDs Change Nothing ⚡ Tested!
+    def test_update_mechanics_unknown_ids(self):
+        self.client.put(f'/service_tickets/{self.ticket_id}', json={'add_ids': [self.mechanic2_id], 'remove_ids': []})
+        response = self.client.put(f'/service_tickets/{self.ticket_id}', json={
+            'add_ids': [self.mechanic1_id, 998],
+            'remove_ids': [self.mechanic2_id, 999]
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json['invalid_mechanic_ids'], [998, 999])
+        with self.app.app_context():
+            ticket = db.session.get(Service_Ticket, self.ticket_id)
+            self.assertEqual([m.id for m in ticket.mechanics], [self.mechanic2_id])
+
+    # Update Mechanics Query Count Test - ⚡ Tested!
+    # Same number of queries whether 2 or 50 mechanics change
+    def test_update_mechanics_query_count(self):
+        with self.app.app_context():
+            mechanics = [
+                Mechanic(name=f'Extra {i}', email=f'extra{i}@example.com', phone='1', salary='1', password='123456')
+                for i in range(50)
+            ]
+            db.session.add_all(mechanics)
+            db.session.commit()
+            extra_ids = [m.id for m in mechanics]
+
+        url = f'/service_tickets/{self.ticket_id}'
+        self.client.put(url, json={'add_ids': [self.mechanic3_id], 'remove_ids': []})
+        with count_queries(self.app) as small:
+            self.client.put(url, json={'add_ids': [self.mechanic1_id, self.mechanic2_id], 'remove_ids': [self.mechanic3_id]})
+        with count_queries(self.app) as large:
+            response = self.client.put(url, json={
+                'add_ids': extra_ids + [self.mechanic1_id],
+                'remove_ids': [self.mechanic2_id]
+            })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(small.count, large.count)
+        with self.app.app_context():
+            ticket = db.session.get(Service_Ticket, self.ticket_id)
+            self.assertEqual({m.id for m in ticket.mechanics}, set(extra_ids) | {self.mechanic1_id})
+
+    # Invoice Test - ⚡ Tested!
+    def test_invoice(self):
+        with self.app.app_context():
+            wheel = Inventory(part_name='Wheel', price=100.0)
+            db.session.add(wheel)
+            db.session.commit()
+            wheel_id = wheel.id
+        self.client.put(f'/service_tickets/{self.ticket_id}/add-part', json={'part_id': self.part_id})
+        self.client.put(f'/service_tickets/{self.ticket_id}/add-part', json={'part_id': wheel_id})
+
+        with count_queries(self.app) as queries:
+            response = self.client.get(f'/service_tickets/{self.ticket_id}/invoice')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(queries.count, 2)  # the ticket and one join for every line
+        self.assertEqual(response.json['parts_total'], 129.99)
+        self.assertEqual(
+            [(line['part_name'], line['quantity'], line['line_total']) for line in response.json['lines']],
+            [('Test Part', 1, 29.99), ('Wheel', 1, 100.0)]
+        )
+
+    # Negative Test - Invoice for an Unknown Ticket ⚡ Tested!
+    def test_invalid_invoice(self):
+        response = self.client.get('/service_tickets/999/invoice')
+        self.assertEqual(response.status_code, 404)
+
+    # Get All Service Tickets With Totals Test - ⚡ Tested!
+    # Both sources agree, and neither adds a query per ticket
+    def test_get_tickets_include_totals(self):
+        with self.app.app_context():
+            db.session.add_all([
+                Service_Ticket(VIN=f'VIN{i}', service_date=date(2025, 1, 2), service_desc='Brakes', customer_id=self.customer_id)
+                for i in range(20)
+            ])
+            db.session.commit()
+        self.client.put(f'/service_tickets/{self.ticket_id}/add-part', json={'part_id': self.part_id})
+
+        for materialized in (True, False):
+            self.app.config['MATERIALIZED_TICKET_TOTALS'] = materialized
+            with count_queries(self.app) as plain:
+                self.client.get('/service_tickets/?per_page=100')
+            with count_queries(self.app) as with_totals:
+                response = self.client.get('/service_tickets/?per_page=100&include=totals')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(with_totals.count, plain.count + (0 if materialized else 1))
+            totals = {item['id']: item['parts_total'] for item in response.json}
+            self.assertEqual(totals[self.ticket_id], 29.99)
+            self.assertEqual(sum(totals.values()), 29.99)
+
+        # Not part of the default representation
+        response = self.client.get('/service_tickets/')
+        self.assertNotIn('parts_total', response.json[0])
+
+    # Materialized Total Follows Price Changes Test - ⚡ Tested!
+    def test_parts_total_follows_price_change(self):
+        from app.utils.totals import ticket_totals, recompute_parts_totals
+        self.client.put(f'/service_tickets/{self.ticket_id}/add-part', json={'part_id': self.part_id})
+        response = self.client.put(
+            f'/inventory/{self.part_id}',
+            json={'price': 35.5},
+            headers={'Authorization': f'Bearer {self.token}'}
+        )
+        self.assertEqual(response.status_code, 201)
+        with self.app.app_context():
+            self.assertEqual(db.session.get(Service_Ticket, self.ticket_id).parts_total, 35.5)
+            self.assertEqual(ticket_totals([self.ticket_id]), {self.ticket_id: 35.5})
+
+            # A full rebuild gives the same answer
+            recompute_parts_totals()
+            db.session.commit()
+            self.assertEqual(db.session.get(Service_Ticket, self.ticket_id).parts_total, 35.5)
+
+    # Add a Quantity of a Part Test - ⚡ Tested!
+    # A second add of the same part raises the line's quantity
+    def test_add_part_quantity(self):
+        with self.app.app_context():
+            db.session.get(Inventory, self.part_id).stock = 10
+            db.session.commit()
+        url = f'/service_tickets/{self.ticket_id}/add-part'
+        self.assertEqual(self.client.put(url, json={'part_id': self.part_id, 'quantity': 3}).status_code, 200)
+        self.assertEqual(self.client.put(url, json={'part_id': self.part_id}).status_code, 200)
+
+        with self.app.app_context():
+            self.assertEqual(db.session.get(Inventory, self.part_id).stock, 6)
+            lines = db.session.scalars(select(ServiceTicketInventory)).all()
+            self.assertEqual([line.quantity for line in lines], [4])
+            self.assertEqual(db.session.get(Service_Ticket, self.ticket_id).parts_total, 119.96)
+
+    # Negative Test - Not Enough Stock ⚡ Tested!
+    def test_add_part_insufficient_stock(self):
+        with self.app.app_context():
+            db.session.get(Inventory, self.part_id).stock = 2
+            db.session.commit()
+        url = f'/service_tickets/{self.ticket_id}/add-part'
+        response = self.client.put(url, json={'part_id': self.part_id, 'quantity': 3})
+        self.assertEqual(response.status_code, 409)
+        response = self.client.put(url, json={'part_id': self.part_id, 'quantity': 0})
+        self.assertEqual(response.status_code, 400)
+        with self.app.app_context():
+            self.assertEqual(db.session.get(Inventory, self.part_id).stock, 2)
+            self.assertEqual(db.session.scalars(select(ServiceTicketInventory)).all(), [])
+            self.assertEqual(db.session.get(Service_Ticket, self.ticket_id).parts_total, 0)
+
+    # Concurrent Add-Part Never Oversells Test - ⚡ Tested!
+    # 32 threads race for one part with 20 units in stock
+    def test_add_part_concurrent_stock(self):
+        stock, threads = 20, 32
+        with self.app.app_context():
+            db.session.get(Inventory, self.part_id).stock = stock
+            db.session.commit()
+
+        barrier = threading.Barrier(threads)
+        statuses = []
+
+        def add_one():
+            client = self.app.test_client()
+            barrier.wait()
+            response = client.put(f'/service_tickets/{self.ticket_id}/add-part', json={'part_id': self.part_id})
+            statuses.append(response.status_code)
+
+        workers = [threading.Thread(target=add_one) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(statuses.count(200), stock)
+        self.assertEqual(statuses.count(409), threads - stock)
+        with self.app.app_context():
+            self.assertEqual(db.session.get(Inventory, self.part_id).stock, 0)
+            lines = db.session.scalars(select(ServiceTicketInventory)).all()
+            self.assertEqual([line.quantity for line in lines], [stock])
+            self.assertEqual(db.session.get(Service_Ticket, self.ticket_id).parts_total, round(29.99 * stock, 2))
+
+    # Sparse Fieldset Test - ⚡ Tested!
+    # Works with the cursor, stream and totals modes
+    def test_get_tickets_fields(self):
+        response = self.client.get('/service_tickets/?fields=id,VIN')
+        self.assertEqual(response.json, [{'id': self.ticket_id, 'VIN': 'TESTVIN123'}])
+        response = self.client.get('/service_tickets/?cursor=&fields=VIN')
+        self.assertEqual(response.json['items'], [{'VIN': 'TESTVIN123'}])
+        response = self.client.get('/service_tickets/?stream=true&fields=id')
+        self.assertEqual(response.json, [{'id': self.ticket_id}])
+        
+        self.client.put(f'/service_tickets/{self.ticket_id}/add-part', json={'part_id': self.part_id})
+        with count_queries(self.app) as queries:
+            response = self.client.get('/service_tickets/?fields=id&include=totals')
+        self.assertEqual(response.json, [{'id': self.ticket_id, 'parts_total': 29.99}])
+        self.assertEqual(queries.count, 2)  # page + COUNT, parts_total loaded with the page
+        
+        response = self.client.get(f'/service_tickets/{self.ticket_id}?fields=service_date')
+        self.assertEqual(response.json, {'service_date': '2025-01-01'})
+        response = self.client.get('/service_tickets/my-tickets?fields=id', headers={'Authorization': f'Bearer {self.customer_token}'})
+        self.assertEqual(response.json, [{'id': self.ticket_id}])
+        response = self.client.get('/service_tickets/?fields=parts_total')
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,63 @@
+# /tests/test_slow_queries.py
+
+import unittest
+from app import create_app
+from app.models import db, Customer
+from app.utils.slow_queries import slow_queries, fingerprint, parameter_shape
+
+class TestSlowQueries(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('TestingConfig')
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.drop_all()
+            db.create_all()
+            db.session.add_all([
+                Customer(name='Ann', email='ann@garage.com', phone='1', password='123456'),
+                Customer(name='Bob', email='bob@example.com', phone='1', password='123456'),
+            ])
+            db.session.commit()
+        # Turned on after the fixture rows, so their DDL and INSERTs aren't logged
+        self.app.config['SLOW_QUERY_MS'] = 0   # every statement counts as slow
+        slow_queries.init_app(self.app)
+
+    def search_query(self):
+        queries = self.client.get('/slow-queries').json['queries']
+        return next(query for query in queries if 'customers_bp.search_by_email' in query['endpoints'])
+
+    # Slow Query Recorded With Endpoint, Shape And Plan Test - ⚡ Tested!
+    def test_slow_query_recorded(self):
+        # Two-character terms are answered by a LIKE scan
+        with self.assertLogs('app.utils.slow_queries', 'WARNING') as logs:
+            self.client.get('/customers/search?email=bo')
+            self.client.get('/customers/search?email=an')
+        query = self.search_query()
+        self.assertEqual(query['count'], 2)
+        self.assertEqual(query['endpoints'], {'customers_bp.search_by_email': 2})
+        self.assertIn('SCAN customers', query['plan'])
+        self.assertRegex(query['parameter_shape'], r'^\((str|int)( x\d+)?(, (str|int)( x\d+)?)*\)$')
+        self.assertNotIn('bo', query['parameter_shape'])
+        # Logged once, with the plan
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn('SCAN customers', logs.output[0])
+        self.assertIn('customers_bp.search_by_email', logs.output[0])
+
+    # Fingerprints Normalize Literals And IN Lists Test - ⚡ Tested!
+    def test_fingerprint(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM t1 WHERE id IN (?, ?, ?) AND name = 'x'\n  LIMIT 10"),
+            fingerprint("SELECT * FROM t1 WHERE id IN (?) AND name = 'y' LIMIT 20")
+        )
+        self.assertEqual(fingerprint('SELECT * FROM t WHERE id IN (%(id_1)s, %(id_2)s)'), 'SELECT * FROM t WHERE id IN (...)')
+        self.assertEqual(parameter_shape({'email': 'a@b.c', 'id': 1}), '{email: str, id: int}')
+        self.assertEqual(parameter_shape([(1, 'a'), (2, 'b')], executemany=True), '2 rows of (int, str)')
+
+    # Negative Test - Below Threshold / Disabled ⚡ Tested!
+    def test_threshold_and_disabled(self):
+        self.app.extensions['slow_queries'].threshold = 60
+        self.client.get('/customers/search?email=bo')
+        self.assertEqual(self.client.get('/slow-queries').json['queries'], [])
+        
+        app = create_app('TestingConfig')
+        self.assertNotIn('slow_queries', app.extensions)
+        self.assertEqual(app.test_client().get('/slow-queries').status_code, 404)
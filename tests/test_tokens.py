@@ -0,0 +1,106 @@
+# /tests/test_tokens.py
+
+import base64
+import json
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from jose import jwt
+from jose.exceptions import ExpiredSignatureError, JWTError
+from app import create_app
+from app.models import db, Mechanic
+from app.utils.util import encode_token, decode_token
+
+class TestTokens(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('TestingConfig')
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.drop_all()
+            db.create_all()
+            self.mechanic = Mechanic(
+                name='Test Mechanic',
+                email='testmech@email.com',
+                phone='123-456-7890',
+                salary="50000",
+                password='123456'
+            )
+            db.session.add(self.mechanic)
+            db.session.commit()
+            self.token = encode_token(self.mechanic.id, user_type='mechanic')
+
+    def _cache(self):
+        return self.app.extensions['tokens'].verified
+
+    # Verified Token Is Cached Test - ⚡ Tested!
+    def test_decode_caches_token(self):
+        with self.app.app_context():
+            claims = decode_token(self.token)
+            self.assertEqual(claims['sub'], str(self.mechanic.id))
+            self.assertEqual(claims['type'], 'mechanic')
+            self.assertEqual(len(self._cache()), 1)
+            self.assertIs(decode_token(self.token), claims)
+
+    # Cached Token Through a Route Test - ⚡ Tested!
+    def test_route_reuses_cached_token(self):
+        with self.app.app_context():
+            token = encode_token(1, user_type='customer')
+        headers = {'Authorization': f'Bearer {token}'}
+        for _ in range(3):
+            response = self.client.get('/service_tickets/my-tickets', headers=headers)
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self._cache()), 1)
+
+    # Negative Test - Tampered Payload With a Cached Signature ⚡ Tested!
+    def test_tampered_payload_rejected(self):
+        with self.app.app_context():
+            decode_token(self.token)
+            header, payload, signature = self.token.split('.')
+            claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+            claims['type'] = 'customer'
+            forged_payload = base64.urlsafe_b64encode(json.dumps(claims).encode()).rstrip(b'=').decode()
+            with self.assertRaises(JWTError):
+                decode_token(f'{header}.{forged_payload}.{signature}')
+
+    # Negative Test - Cached Token Evicted on Expiry ⚡ Tested!
+    def test_expired_token_evicted(self):
+        with self.app.app_context():
+            decode_token(self.token)
+            signature = self.token.rsplit('.', 1)[1]
+            signing_input, claims = self._cache()[signature]
+            self._cache()[signature] = (signing_input, {**claims, 'exp': int(time.time()) - 1})
+            with self.assertRaises(ExpiredSignatureError):
+                decode_token(self.token)
+            self.assertNotIn(signature, self._cache())
+
+    # Negative Test - Expired Token Returns 400 ⚡ Tested!
+    def test_expired_token(self):
+        now = datetime.now(timezone.utc)
+        token = jwt.encode(
+            {'exp': now - timedelta(minutes=1), 'iat': now - timedelta(hours=1), 'sub': '1', 'type': 'customer'},
+            self.app.config['SECRET_KEY'], algorithm='HS256'
+        )
+        response = self.client.get('/service_tickets/my-tickets', headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json['message'], 'Token expired')
+
+    # Negative Test - Invalid Token Returns 400 ⚡ Tested!
+    def test_invalid_token(self):
+        response = self.client.get('/service_tickets/my-tickets', headers={'Authorization': 'Bearer not.a.token'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json['message'], 'Invalid token')
+
+    # Negative Test - Bearer Without a Token ⚡ Tested!
+    def test_missing_token(self):
+        response = self.client.get('/service_tickets/my-tickets', headers={'Authorization': 'Bearer'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json['message'], 'Missing token')
+
+    # Negative Test - Bounded Cache ⚡ Tested!
+    def test_cache_is_bounded(self):
+        self.app.config['TOKEN_CACHE_SIZE'] = 2
+        self.app.extensions.pop('tokens', None)
+        with self.app.app_context():
+            for user_id in range(5):
+                decode_token(encode_token(user_id, user_type='mechanic'))
+            self.assertEqual(len(self._cache()), 2)